@@ -13,4 +13,9 @@
 # limitations under the License.
 
 from .explainable_collection import ExplainableCollection, ExplainCollection
-
+from .async_explainable_collection import AsyncExplainableCollection, \
+    AsyncExplainCollection
+from .cache import ExplainCache
+from .result import ExplainDocument, ExplainResult
+from .stats import ExplainStats
+from .throttle import CircuitBreaker, ExplainThrottled, RateLimiter
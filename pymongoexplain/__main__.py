@@ -18,10 +18,27 @@ commands in a script. Find more documentation at
 https://github.com/mongodb-labs/pymongoexplain/"
 """
 
+from pymongo import MongoClient, read_preferences
 from pymongo.collection import Collection
+from pymongo.errors import ConfigurationError
+from .capture import CommandCapture, capture_collection
 from .explainable_collection import ExplainCollection
+from .profiler import explain_profile
+from .report import RunReport, format_summary
+from .replay import explain_queries, iter_slow_queries, open_log, \
+    unique_shapes
+from .sampling import Sampler
+from .shape import shape_hash
+from .sinks import LoggingSink, JSONLSink, BSONSink, NullSink
+from .throttle import CircuitBreaker, ExplainThrottled, RateLimiter
+from .worker import ExplainWorker, BLOCK, DROP_OLDEST
 
+import copy
+import datetime
+import functools
 import sys
+import threading
+import time
 import logging
 import argparse
 
@@ -38,21 +55,487 @@ old_function_names = ["update_one", "replace_one", "update_many", "delete_one",
                       "find_one_and_update", "count_documents",
                       "estimated_document_count", "distinct"]
 old_functions = [getattr(Collection, i) for i in old_function_names]
+# find returns its cursor before the query is sent, so timing the call
+# would only time building the cursor. Its latency is not recorded.
+lazy_function_names = frozenset(["find"])
 
 
-def make_func(old_func, old_func_name):
+def write_explain(sink, namespace, method, command, result):
+    """Write the explain record of `command` to `sink`.
+
+    `result` is the explain response, or the exception raised explaining
+    `command`, which is logged instead. Returns False in that case.
+    """
+    if isinstance(result, Exception):
+        logging.warning("failed to explain %s on %s: %s", method, namespace,
+                        result)
+        return False
+    sink.write({
+        "ts": datetime.datetime.now(datetime.timezone.utc),
+        "namespace": namespace,
+        "method": method,
+        "command": command,
+        "explain": result})
+    return True
+
+
+class ExplainSettings():
+    """Configures what the patched ``Collection`` methods do."""
+
+    def __init__(self, sampler=None, worker=None, sink=None,
+                 max_time_ms=None, verbosity=None, report=None,
+                 explain_client=None, read_preference=None,
+                 write_read_preference=None, rate_limiter=None,
+                 circuit_breaker=None):
+        self.sampler = sampler
+        self.worker = worker
+        self.sink = sink if sink is not None else LoggingSink()
+        self.max_time_ms = max_time_ms
+        self.verbosity = verbosity
+        self.report = report
+        self.explain_client = explain_client
+        self.read_preference = read_preference
+        self.write_read_preference = write_read_preference
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def write_explain(self, namespace, method, command, result):
+        """Write an explain record with :func:`write_explain`.
+
+        Explains that raised instead of the operation are counted.
+        """
+        if not write_explain(self.sink, namespace, method, command, result):
+            with self._lock:
+                self.failed += 1
+
+    def explain_collection(self, collection):
+        """Return an :class:`ExplainCollection` for `collection`.
+
+        With a dedicated explain client, the explains are sent through it
+        instead of the application's client, and read explains default to
+        its read preference.
+        """
+        read_preference = self.read_preference
+        client = self.explain_client
+        if client is not None:
+            collection = client[collection.database.name].get_collection(
+                collection.name, codec_options=collection.codec_options)
+            if read_preference is None:
+                read_preference = client.read_preference
+        return ExplainCollection(
+            collection, verbosity=self.verbosity,
+            max_time_ms=self.max_time_ms, read_preference=read_preference,
+            write_read_preference=self.write_read_preference,
+            rate_limiter=self.rate_limiter,
+            circuit_breaker=self.circuit_breaker)
+
+
+def should_explain(settings, command):
+    """Return whether to explain `command`, and its shape hash.
+
+    The shape hash is only computed if there is a report.
+    """
+    key = shape_hash(command) if settings.report is not None else None
+    sampler = settings.sampler
+    return sampler is None or sampler.should_explain(command, key), key
+
+
+def explain_command(explain, method, command, settings, key=None):
+    """Explain `command` and add it to the report.
+
+    Explains that are throttled or fail, e.g. because no member matches the
+    explain read preference or the explain client timed out, are counted
+    and never raise into the application.
+    """
+    res = None
+    try:
+        res = explain._explain_command(command)
+    except ExplainThrottled:
+        pass
+    except Exception as exc:
+        settings.write_explain(explain.collection.full_name, method, None,
+                               exc)
+    else:
+        settings.write_explain(explain.collection.full_name, method,
+                               explain.last_cmd_payload, res)
+    if settings.report is not None:
+        settings.report.add(explain.collection.full_name, command, res, key)
+
+
+def explain_sampled(explain, method, command, settings):
+    """Explain `command` if it is sampled, and add it to the report.
+
+    The sampling decision is made on the calling thread, so the commands
+    that are not sampled are neither copied nor queued for the background
+    workers. Returns the shape hash of `command` if there is a report.
+    """
+    sampled, key = should_explain(settings, command)
+    if not sampled:
+        if settings.report is not None:
+            settings.report.add(explain.collection.full_name, command, None,
+                                key)
+    elif settings.worker is not None:
+        # The command holds references to the application's documents.
+        settings.worker.submit(explain_command, explain, method,
+                               copy.deepcopy(command), settings, key)
+    else:
+        explain_command(explain, method, command, settings, key)
+    return key
+
+
+def make_func(old_func, old_func_name, settings):
     def new_func(self: Collection, *args, **kwargs):
-        res = getattr(ExplainCollection(self),old_func_name)(*args, **kwargs)
-        logging.info("%s explain response: %s", old_func_name, res)
-        return old_func(self, *args, **kwargs)
+        explain = settings.explain_collection(self)
+        try:
+            command = explain._build_command(old_func_name, args, kwargs)
+        except Exception as exc:
+            settings.write_explain(self.full_name, old_func_name, None, exc)
+            return old_func(self, *args, **kwargs)
+        key = explain_sampled(explain, old_func_name, command, settings)
+        report = settings.report
+        if report is None or old_func_name in lazy_function_names:
+            return old_func(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return old_func(self, *args, **kwargs)
+        finally:
+            report.record_latency(self.full_name, command,
+                                  time.perf_counter() - start, key)
     return new_func
 
 
-for old_func, old_func_name in zip(old_functions, old_function_names):
-    setattr(Collection, old_func_name, make_func(old_func, old_func_name))
+def patch_collection(settings):
+    for old_func, old_func_name in zip(old_functions, old_function_names):
+        setattr(Collection, old_func_name,
+                make_func(old_func, old_func_name, settings))
 
-if __name__ == '__main__':
-    parser = argparse.ArgumentParser(description=__doc__)
+
+old_client_init = MongoClient.__init__
+
+
+def capture_command(settings, client, database_name, command):
+    explain = settings.explain_collection(
+        capture_collection(client[database_name], command))
+    explain_sampled(explain, command.command_name, command, settings)
+
+
+def record_captured_latency(settings, client, database_name, command,
+                            seconds):
+    collection = capture_collection(client[database_name], command)
+    settings.report.record_latency(collection.full_name, command, seconds)
+
+
+def patch_client(settings):
+    """Capture the commands of every client with a command listener.
+
+    Without a dedicated explain client, the explains of the commands of each
+    client are sent through a copy of it, created with the same arguments,
+    so they never wait on the application's connections. Returns the list
+    of these copies, to be closed when the script exits.
+    """
+    duration_callback = None
+    if settings.report is not None:
+        duration_callback = functools.partial(record_captured_latency,
+                                              settings)
+    explain_clients = []
+
+    def new_init(self, *args, **kwargs):
+        listener = CommandCapture(functools.partial(capture_command,
+                                                    settings),
+                                  duration_callback)
+        old_client_init(self, *args, **dict(
+            kwargs, event_listeners=list(
+                kwargs.get("event_listeners") or ()) + [listener]))
+        client = self
+        if settings.explain_client is None:
+            client = MongoClient.__new__(MongoClient)
+            old_client_init(client, *args, **dict(
+                {key: value for key, value in kwargs.items()
+                 if key != "event_listeners"}, appname="pymongoexplain"))
+            explain_clients.append(client)
+        listener.bind(client)
+    MongoClient.__init__ = new_init
+    return explain_clients
+
+
+_SINKS = {"jsonl": JSONLSink, "bson": BSONSink}
+
+
+def write_report(report, path):
+    """Log the summaries of `report`, or save them to `path`."""
+    if path is not None:
+        report.save(path)
+        return
+    summaries = report.summaries()
+    logging.info("run summary: %d query shapes", len(summaries))
+    for summary in summaries:
+        logging.info("%s", format_summary(summary))
+    if report.untracked:
+        logging.warning("%d calls of shapes past the first %d were not "
+                        "summarized", report.untracked, report.max_shapes)
+
+
+def add_max_time_ms_argument(parser):
+    parser.add_argument(
+        "--max-time-ms", type=int, default=None, metavar="MS",
+        help="the time limit of each explain command; explains that run "
+             "out of time are reported as timed out")
+
+
+def add_explain_client_arguments(parser):
+    parser.add_argument(
+        "--explain-uri", metavar="URI",
+        help="send the explains through a dedicated MongoClient connected "
+             "to URI, so they don't use the application's connections")
+    parser.add_argument(
+        "--explain-max-pool-size", type=int, default=None, metavar="N",
+        help="the maximum number of connections of the explain client (4 "
+             "by default)")
+    parser.add_argument(
+        "--explain-timeout-ms", type=int, default=None, metavar="MS",
+        help="the timeoutMS of the explain client, which bounds each "
+             "explain including server selection and waiting for a "
+             "connection")
+
+
+def make_explain_client(parser, args):
+    if args.explain_uri is None:
+        if args.explain_max_pool_size is not None:
+            parser.error("--explain-max-pool-size requires --explain-uri")
+        if args.explain_timeout_ms is not None:
+            parser.error("--explain-timeout-ms requires --explain-uri")
+        return None
+    kwargs = {"maxPoolSize": 4 if args.explain_max_pool_size is None
+              else args.explain_max_pool_size,
+              "appname": "pymongoexplain"}
+    if args.explain_timeout_ms is not None:
+        kwargs["timeoutMS"] = args.explain_timeout_ms
+    return MongoClient(args.explain_uri, **kwargs)
+
+
+_READ_PREFERENCE_MODES = ["primary", "primaryPreferred", "secondary",
+                          "secondaryPreferred", "nearest"]
+
+
+def add_routing_arguments(parser):
+    parser.add_argument(
+        "--explain-read-preference", default=None,
+        choices=_READ_PREFERENCE_MODES,
+        help="the read preference of the explains of find, aggregate, "
+             "count and distinct commands, e.g. secondary to keep them off "
+             "the primary")
+    parser.add_argument(
+        "--explain-read-preference-tags", action="append", default=None,
+        metavar="TAGS",
+        help="a tag set such as nodeType:ANALYTICS,region:east restricting "
+             "the members read explains are sent to; repeat for fallback "
+             "tag sets, and end with an empty TAGS to allow any member")
+    parser.add_argument(
+        "--explain-write-read-preference", default=None,
+        choices=_READ_PREFERENCE_MODES,
+        help="the read preference of the explains of update, delete, "
+             "findAndModify and writing aggregate commands (primary by "
+             "default)")
+
+
+def _parse_tag_set(tags):
+    tag_set = {}
+    for tag in filter(None, tags.split(",")):
+        name, _, value = tag.partition(":")
+        tag_set[name.strip()] = value.strip()
+    return tag_set
+
+
+def make_routing(parser, args):
+    """Return the read preferences of read and write explains."""
+    tag_sets = None
+    if args.explain_read_preference_tags is not None:
+        tag_sets = [_parse_tag_set(tags)
+                    for tags in args.explain_read_preference_tags]
+    read_preference = write_read_preference = None
+    try:
+        if args.explain_read_preference is not None:
+            read_preference = read_preferences.make_read_preference(
+                read_preferences.read_pref_mode_from_name(
+                    args.explain_read_preference), tag_sets)
+        elif tag_sets is not None:
+            parser.error("--explain-read-preference-tags requires "
+                         "--explain-read-preference")
+        if args.explain_write_read_preference is not None:
+            write_read_preference = read_preferences.make_read_preference(
+                read_preferences.read_pref_mode_from_name(
+                    args.explain_write_read_preference), None)
+    except ConfigurationError as exc:
+        parser.error(str(exc))
+    return read_preference, write_read_preference
+
+
+def add_throttle_arguments(parser):
+    parser.add_argument(
+        "--explain-rate", type=float, default=None, metavar="N",
+        help="send at most N explains per second, skipping the others")
+    parser.add_argument(
+        "--explain-burst", type=int, default=None, metavar="N",
+        help="the number of explains that may be sent at once under "
+             "--explain-rate (defaults to the rate)")
+    parser.add_argument(
+        "--breaker-latency-ms", type=float, default=None, metavar="MS",
+        help="stop explaining while the mean latency of the recent "
+             "explains is above MS milliseconds")
+    parser.add_argument(
+        "--breaker-error-rate", type=float, default=None, metavar="FRACTION",
+        help="stop explaining while more than FRACTION of the recent "
+             "explains fail or time out (0.5 when only "
+             "--breaker-latency-ms is given)")
+    parser.add_argument(
+        "--breaker-cooldown", type=float, default=30.0, metavar="SECONDS",
+        help="how long explains stay off before a trial explain is sent")
+
+
+def make_throttle(parser, args):
+    """Return the rate limiter and circuit breaker shared by all explains."""
+    rate_limiter = circuit_breaker = None
+    if args.explain_rate is not None:
+        if args.explain_rate <= 0:
+            parser.error("--explain-rate must be positive")
+        if args.explain_burst is not None and args.explain_burst < 1:
+            parser.error("--explain-burst must be at least 1")
+        rate_limiter = RateLimiter(args.explain_rate, args.explain_burst)
+    elif args.explain_burst is not None:
+        parser.error("--explain-burst requires --explain-rate")
+    if args.breaker_latency_ms is not None or \
+            args.breaker_error_rate is not None:
+        circuit_breaker = CircuitBreaker(
+            max_latency=None if args.breaker_latency_ms is None
+            else args.breaker_latency_ms / 1000.0,
+            max_error_rate=0.5 if args.breaker_error_rate is None
+            else args.breaker_error_rate,
+            cooldown=args.breaker_cooldown)
+    return rate_limiter, circuit_breaker
+
+
+def add_output_arguments(parser):
+    parser.add_argument(
+        "--output-format", choices=["log", "jsonl", "bson", "none"],
+        default="log",
+        help="log each explain response, write explain records as "
+             "Extended JSON lines or BSON documents to --output, or discard "
+             "them")
+    parser.add_argument(
+        "--output", metavar="PATH",
+        help="the file to write explain records to")
+    parser.add_argument(
+        "--output-buffer", type=int, default=100, metavar="N",
+        help="the number of explain records written to --output at once")
+    parser.add_argument(
+        "--output-max-bytes", type=int, default=None, metavar="BYTES",
+        help="rotate --output when it reaches BYTES bytes")
+
+
+def make_sink(parser, args):
+    if args.output_format == "log":
+        return None
+    if args.output_format == "none":
+        return NullSink()
+    if args.output is None:
+        parser.error("--output is required with --output-format %s" %
+                     (args.output_format,))
+    return _SINKS[args.output_format](
+        args.output, buffer_size=args.output_buffer,
+        max_bytes=args.output_max_bytes)
+
+
+def replay_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="pymongoexplain replay",
+        description="Explain the slow queries of a mongod structured JSON "
+                    "log, once per query shape.")
+    parser.add_argument(
+        "log", help="the mongod log file, optionally compressed with gzip")
+    parser.add_argument(
+        "--uri", default="mongodb://localhost:27017",
+        help="the connection string of the deployment to explain on")
+    parser.add_argument(
+        "--max-workers", type=int, default=8, metavar="N",
+        help="the maximum number of explain commands in flight at once")
+    parser.add_argument(
+        "--verbosity", default=None,
+        help="the verbosity of the explain commands")
+    add_routing_arguments(parser)
+    add_max_time_ms_argument(parser)
+    add_output_arguments(parser)
+    args = parser.parse_args(argv)
+    read_preference, write_read_preference = make_routing(parser, args)
+    sink = make_sink(parser, args) or LoggingSink()
+    client = MongoClient(args.uri)
+    try:
+        with open_log(args.log) as lines:
+            queries = unique_shapes(iter_slow_queries(lines))
+            for query, res in explain_queries(
+                    client, queries, args.max_workers, args.verbosity,
+                    args.max_time_ms, read_preference,
+                    write_read_preference):
+                write_explain(sink, query.namespace,
+                              query.command.command_name,
+                              query.command.get_SON(), res)
+    finally:
+        client.close()
+        sink.close()
+
+
+def profile_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="pymongoexplain profile",
+        description="Explain the slowest operation of each query shape "
+                    "recorded in the system.profile collection of a "
+                    "database, and rank the shapes by total time.")
+    parser.add_argument(
+        "database", help="the database whose profiler output is read")
+    parser.add_argument(
+        "--uri", default="mongodb://localhost:27017",
+        help="the connection string of the deployment to explain on")
+    parser.add_argument(
+        "--max-workers", type=int, default=8, metavar="N",
+        help="the maximum number of explain commands in flight at once")
+    add_routing_arguments(parser)
+    add_max_time_ms_argument(parser)
+    add_output_arguments(parser)
+    args = parser.parse_args(argv)
+    read_preference, write_read_preference = make_routing(parser, args)
+    sink = make_sink(parser, args) or LoggingSink()
+    client = MongoClient(args.uri)
+    try:
+        shapes = explain_profile(client[args.database],
+                                 max_workers=args.max_workers,
+                                 max_time_ms=args.max_time_ms,
+                                 read_preference=read_preference,
+                                 write_read_preference=write_read_preference)
+        for rank, shape in enumerate(shapes, 1):
+            logging.info("#%d %s %s: %d operations, %d ms total, %d ms max",
+                         rank, shape.namespace, shape.command.command_name,
+                         shape.count, shape.total_millis, shape.max_millis)
+            write_explain(sink, shape.namespace, shape.command.command_name,
+                          shape.command.get_SON(), shape.result)
+    finally:
+        client.close()
+        sink.close()
+
+
+_SUBCOMMANDS = {"replay": replay_main, "profile": profile_main}
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] and argv[0] in _SUBCOMMANDS:
+        return _SUBCOMMANDS[argv[0]](argv[1:])
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        epilog="Run 'pymongoexplain replay -h' or 'pymongoexplain profile "
+               "-h' to explain the slow queries of a mongod log or of the "
+               "database profiler instead.")
     parser.add_argument(
         "input_script", nargs=1,help="The script that you "
                                      "wish to run explain on.")
@@ -60,10 +543,120 @@ if __name__ == '__main__':
         "arguments", metavar="script_arguments", help="add arguments to "
                                                        "explained script",
                                                         nargs="?")
+    parser.add_argument(
+        "--capture", choices=["methods", "commands"], default="methods",
+        help="rebuild the commands from the arguments of the Collection "
+             "methods, or explain the exact commands PyMongo sends using "
+             "command monitoring, which also covers cursors, bulk writes "
+             "and database aggregations")
+    parser.add_argument(
+        "--sample-rate", type=int, default=1, metavar="N",
+        help="explain only one in every N operations")
+    parser.add_argument(
+        "--sample-per-shape", type=int, default=None, metavar="K",
+        help="explain only the first K operations of each query shape")
+    parser.add_argument(
+        "--sample-seconds", type=float, default=None, metavar="SECONDS",
+        help="stop explaining operations SECONDS seconds after the script "
+             "starts")
+    parser.add_argument(
+        "--background-workers", type=int, default=0, metavar="N",
+        help="run explains on N background threads instead of before each "
+             "operation")
+    parser.add_argument(
+        "--queue-size", type=int, default=1000,
+        help="the maximum number of operations waiting to be explained by "
+             "the background workers")
+    parser.add_argument(
+        "--queue-full", choices=[BLOCK, DROP_OLDEST], default=BLOCK,
+        help="whether to block the script or drop the oldest waiting "
+             "operation when the queue is full")
+    parser.add_argument(
+        "--verbosity", default=None,
+        help="the verbosity of the explain commands")
+    parser.add_argument(
+        "--report", action="store_true",
+        help="log a summary of the operations by namespace and query shape, "
+             "with latency percentiles of the operations, when the script "
+             "exits")
+    parser.add_argument(
+        "--report-output", metavar="PATH",
+        help="write the summary as Extended JSON lines to PATH instead of "
+             "logging it; implies --report")
+    parser.add_argument(
+        "--report-max-shapes", type=int, default=10000, metavar="N",
+        help="the maximum number of query shapes in the summary")
+    add_explain_client_arguments(parser)
+    add_routing_arguments(parser)
+    add_throttle_arguments(parser)
+    add_max_time_ms_argument(parser)
+    add_output_arguments(parser)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    sink = make_sink(parser, args)
+    # Created before the clients are patched, so its own commands are not
+    # captured.
+    explain_client = make_explain_client(parser, args)
+    read_preference, write_read_preference = make_routing(parser, args)
+    rate_limiter, circuit_breaker = make_throttle(parser, args)
+    report = None
+    if args.report or args.report_output is not None:
+        report = RunReport(max_shapes=args.report_max_shapes)
+    worker = None
+    # Captured commands are never explained by the command listener, which
+    # runs on the application's thread.
+    if args.background_workers or args.capture == "commands":
+        worker = ExplainWorker(num_threads=max(args.background_workers, 1),
+                               queue_size=args.queue_size,
+                               policy=args.queue_full)
+    settings = ExplainSettings(
+        sampler=Sampler(rate=args.sample_rate,
+                        per_shape=args.sample_per_shape,
+                        seconds=args.sample_seconds),
+        worker=worker, sink=sink, max_time_ms=args.max_time_ms,
+        verbosity=args.verbosity, report=report,
+        explain_client=explain_client, read_preference=read_preference,
+        write_read_preference=write_read_preference,
+        rate_limiter=rate_limiter, circuit_breaker=circuit_breaker)
+    capture_clients = []
+    if args.capture == "commands":
+        capture_clients = patch_client(settings)
+    else:
+        patch_collection(settings)
     file = args.input_script[0]
-    with open(file) as f:
-        sys.argv = [file]+args.arguments if args.arguments is not None else\
-                    [file]
-        exec(f.read())
+    try:
+        with open(file) as f:
+            source = f.read()
+        sys.argv = [file, args.arguments] if args.arguments is not None \
+            else [file]
+        # Run the script as the __main__ module, in a namespace of its own.
+        exec(compile(source, file, "exec"),
+             {"__name__": "__main__", "__file__": file,
+              "__builtins__": __builtins__})
+    finally:
+        if worker is not None:
+            worker.close()
+            if worker.dropped:
+                logging.warning("dropped %d operations without explaining "
+                                "them", worker.dropped)
+        for client in capture_clients:
+            client.close()
+        if settings.failed:
+            logging.warning("failed to explain %d operations",
+                            settings.failed)
+        if rate_limiter is not None and rate_limiter.rejected:
+            logging.warning("skipped %d explains over the rate limit",
+                            rate_limiter.rejected)
+        if circuit_breaker is not None and circuit_breaker.rejected:
+            logging.warning("skipped %d explains while the circuit breaker "
+                            "was open (opened %d times)",
+                            circuit_breaker.rejected, circuit_breaker.opened)
+        settings.sink.close()
+        if explain_client is not None:
+            explain_client.close()
+        if report is not None:
+            write_report(report, args.report_output)
+
+
+if __name__ == '__main__':
+    main()
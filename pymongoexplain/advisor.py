@@ -0,0 +1,270 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Index suggestions for a workload of explained commands."""
+
+import re
+from collections import abc
+from typing import NamedTuple, Tuple
+
+from bson.regex import Regex
+
+from .result import ExplainResult, iter_stages
+from .shape import shape_hash
+
+_RANGE_OPERATORS = frozenset(["$gt", "$gte", "$lt", "$lte", "$ne", "$nin",
+                              "$regex", "$exists", "$not", "$type", "$mod",
+                              "$size", "$all"])
+_EQUALITY_OPERATORS = frozenset(["$eq", "$elemMatch"])
+_FILTER_FIELDS = ("filter", "query", "q")
+
+
+class IndexSuggestion(NamedTuple):
+    """A suggested index.
+
+    `keys` is a tuple of ``(field, direction)`` pairs, `shapes` is the number
+    of distinct query shapes the index serves and `operations` the number of
+    commands with those shapes.
+    """
+
+    namespace: str
+    keys: Tuple[Tuple[str, int], ...]
+    shapes: int
+    operations: int
+
+
+def _classify_filter(filter, has_sort, equality, ranges):
+    if not isinstance(filter, abc.Mapping):
+        return
+    for field, value in filter.items():
+        if field == "$and":
+            for clause in value:
+                _classify_filter(clause, has_sort, equality, ranges)
+            continue
+        if field.startswith("$"):
+            # $or, $expr, $text and friends can't use a single compound index
+            # prefix, so they don't contribute keys.
+            continue
+        if isinstance(value, (re.Pattern, Regex)):
+            # A regular expression literal matches like $regex.
+            ranges.append(field)
+            continue
+        operators = set()
+        if isinstance(value, abc.Mapping):
+            operators = {key for key in value if key.startswith("$")}
+        if not operators or operators <= _EQUALITY_OPERATORS:
+            equality.append(field)
+        elif operators == {"$in"}:
+            # $in is an equality match unless the results are sorted, in
+            # which case the index can't return them in order.
+            (ranges if has_sort else equality).append(field)
+        elif operators & (_RANGE_OPERATORS | {"$in"}):
+            ranges.append(field)
+
+
+def _statements(command):
+    """Yield the (filter, sort) pairs of a command document."""
+    for field in _FILTER_FIELDS:
+        if field in command:
+            yield command[field], command.get("sort")
+            return
+    if "sort" in command:
+        # A find without a filter.
+        yield {}, command["sort"]
+        return
+    pipeline = command.get("pipeline")
+    if pipeline:
+        first = pipeline[0]
+        if "$match" in first:
+            sort = None
+            if len(pipeline) > 1 and "$sort" in pipeline[1]:
+                sort = pipeline[1]["$sort"]
+            yield first["$match"], sort
+        elif "$sort" in first:
+            yield {}, first["$sort"]
+        return
+    for statements in ("updates", "deletes"):
+        for statement in command.get(statements) or ():
+            yield statement.get("q"), None
+
+
+def index_keys(command):
+    """Return the index keys suggested for a command document.
+
+    The keys follow the Equality, Sort, Range rule: fields matched for
+    equality first (in alphabetical order), then the sort fields, then
+    fields matched with range operators. Returns a list of key tuples, one
+    per statement of the command.
+    """
+    if hasattr(command, "get_SON"):
+        command = command.get_SON()
+    suggestions = []
+    for filter, sort in _statements(command):
+        equality, ranges = [], []
+        sort = list(sort.items()) if isinstance(sort, abc.Mapping) else []
+        sort = [(field, direction) for field, direction in sort
+                if isinstance(direction, int)]
+        _classify_filter(filter, bool(sort), equality, ranges)
+        keys = []
+        seen = set()
+        for field in sorted(set(equality)):
+            keys.append((field, 1))
+            seen.add(field)
+        for field, direction in sort:
+            if field not in seen:
+                keys.append((field, direction))
+                seen.add(field)
+        for field in ranges:
+            if field not in seen:
+                keys.append((field, 1))
+                seen.add(field)
+        if keys and keys != [("_id", 1)]:
+            suggestions.append(tuple(keys))
+    return suggestions
+
+
+def _invert(keys):
+    return tuple((field, -direction if isinstance(direction, int)
+                  else direction) for field, direction in keys)
+
+
+def _prefixes(keys):
+    for i in range(1, len(keys) + 1):
+        yield keys[:i]
+        # An index can also be walked backwards.
+        yield _invert(keys[:i])
+
+
+def _existing_keys(index):
+    # Special components, such as "text" or "2dsphere", are kept so that
+    # they are matched too, and only the prefix before them serves ascending
+    # or descending keys.
+    return tuple((field, int(direction)
+                  if isinstance(direction, (int, float)) else direction)
+                 for field, direction in index["key"].items())
+
+
+def _is_text_index(keys):
+    return any(direction == "text" for _, direction in keys)
+
+
+class IndexAdvisor():
+    """Aggregates explained commands into compound index suggestions.
+
+    Commands are deduplicated by query shape as they are added, so only the
+    first command of each shape is analyzed.
+    """
+
+    def __init__(self):
+        self._shapes = {}
+        self._used_indexes = {}
+
+    def add(self, namespace, command, result=None):
+        """Add a command to the workload.
+
+        :Parameters:
+          - `namespace`: the namespace of the command, e.g. ``"db.products"``.
+          - `command`: a command object from :mod:`pymongoexplain.commands`
+            or a command document, such as ``last_cmd_payload``.
+          - `result` (optional): the explain response of the command, used to
+            find the indexes the workload uses.
+        """
+        if hasattr(command, "get_SON"):
+            command = command.get_SON()
+        key = (namespace, shape_hash(command))
+        entry = self._shapes.get(key)
+        if entry is None:
+            self._shapes[key] = [index_keys(command), 1]
+        else:
+            entry[1] += 1
+        if result is not None:
+            self.add_result(namespace, result)
+
+    def add_result(self, namespace, result):
+        """Record the indexes used by the winning plan of `result`."""
+        if not isinstance(result, ExplainResult):
+            result = ExplainResult.from_document(result)
+        used = self._used_indexes.setdefault(namespace, set())
+        for stage in iter_stages(result.winning_plan):
+            name = stage.get("indexName")
+            if name is not None:
+                used.add(name)
+
+    def suggestions(self, existing_indexes=None):
+        """Return the list of :class:`IndexSuggestion`, most used first.
+
+        Suggestions that are a prefix of another suggestion are folded into
+        it.
+
+        :Parameters:
+          - `existing_indexes` (optional): a mapping of namespace to the list
+            of its index documents, as returned by
+            ``Collection.list_indexes()``. Suggestions served by an existing
+            index are left out.
+        """
+        candidates = {}
+        for (namespace, _), (keys_list, count) in self._shapes.items():
+            for keys in keys_list:
+                entry = candidates.setdefault((namespace, keys), [0, 0])
+                entry[0] += 1
+                entry[1] += count
+        served = set()
+        for namespace, indexes in (existing_indexes or {}).items():
+            for index in indexes:
+                keys = _existing_keys(index)
+                # A text index is only used by $text queries, even for the
+                # fields before its text component.
+                if not _is_text_index(keys):
+                    served.update((namespace, prefix)
+                                  for prefix in _prefixes(keys))
+        accepted = {}
+        folded = {}
+        for namespace, keys in sorted(candidates, key=lambda c: -len(c[1])):
+            shapes, operations = candidates[(namespace, keys)]
+            if (namespace, keys) in served:
+                continue
+            target = folded.get((namespace, keys))
+            if target is None:
+                target = (namespace, keys)
+                accepted[target] = [0, 0]
+                folded.update(((namespace, prefix), target)
+                              for prefix in _prefixes(keys))
+            accepted[target][0] += shapes
+            accepted[target][1] += operations
+        suggestions = [IndexSuggestion(namespace, keys, shapes, operations)
+                       for (namespace, keys), (shapes, operations)
+                       in accepted.items()]
+        suggestions.sort(key=lambda s: (-s.operations, s.namespace, s.keys))
+        return suggestions
+
+    def unused_indexes(self, existing_indexes):
+        """Return the existing indexes that no explained plan used.
+
+        :Parameters:
+          - `existing_indexes`: a mapping of namespace to the list of its
+            index documents, as returned by ``Collection.list_indexes()``.
+
+        Returns a mapping of namespace to the sorted list of unused index
+        names. The ``_id_`` index is never reported.
+        """
+        unused = {}
+        for namespace, indexes in existing_indexes.items():
+            used = self._used_indexes.get(namespace, set())
+            names = sorted(index["name"] for index in indexes
+                           if index["name"] != "_id_" and
+                           index["name"] not in used)
+            if names:
+                unused[namespace] = names
+        return unused
@@ -0,0 +1,130 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Analysis of explain responses for common query plan problems."""
+
+from typing import NamedTuple, Optional
+
+from .result import ExplainResult, iter_stages
+
+HIGH = "high"
+MEDIUM = "medium"
+LOW = "low"
+
+COLLSCAN = "COLLSCAN"
+BLOCKING_SORT = "BLOCKING_SORT"
+FETCH_RATIO = "FETCH_RATIO"
+OR_FANOUT = "OR_FANOUT"
+UNBOUNDED_IXSCAN = "UNBOUNDED_IXSCAN"
+LOOKUP_NO_INDEX = "LOOKUP_NO_INDEX"
+
+_UNBOUNDED = "[MinKey, MaxKey]"
+_UNINDEXED_JOINS = frozenset(["HashJoin", "NestedLoopJoin"])
+
+
+class Finding(NamedTuple):
+    """A problem found in a query plan.
+
+    `code` is a machine readable code such as ``"COLLSCAN"``, `severity` is
+    one of ``"high"``, ``"medium"`` or ``"low"`` and `stage` is the name of
+    the stage the problem was found in.
+    """
+
+    code: str
+    severity: str
+    message: str
+    stage: Optional[str]
+
+
+def _winning_plan_findings(plan, max_or_branches):
+    for stage in iter_stages(plan):
+        name = stage.get("stage")
+        if name == "COLLSCAN":
+            yield Finding(COLLSCAN, HIGH, "the plan scans the whole "
+                          "collection", name)
+        elif name == "SORT":
+            yield Finding(BLOCKING_SORT, MEDIUM, "the plan sorts the "
+                          "results in memory instead of using an index", name)
+        elif name in ("OR", "SORT_MERGE"):
+            branches = len(stage.get("inputStages") or ())
+            if branches >= max_or_branches:
+                yield Finding(OR_FANOUT, LOW, "%s stage merges %d index "
+                              "scans" % (name, branches), name)
+        elif name == "IXSCAN":
+            bounds = stage.get("indexBounds")
+            if bounds and all(list(field_bounds) == [_UNBOUNDED]
+                              for field_bounds in bounds.values()):
+                yield Finding(UNBOUNDED_IXSCAN, MEDIUM, "the plan scans every "
+                              "key of index %s" % (stage.get("indexName"),),
+                              name)
+        elif name == "EQ_LOOKUP" and stage.get("strategy") in \
+                _UNINDEXED_JOINS:
+            yield Finding(LOOKUP_NO_INDEX, HIGH, "$lookup from %s uses %s "
+                          "because the foreign field is not indexed" % (
+                              stage.get("foreignCollection"),
+                              stage.get("strategy")), name)
+
+
+def _execution_findings(execution_stats, max_docs_per_result):
+    for stage in iter_stages(execution_stats):
+        if stage.get("stage") != "FETCH":
+            continue
+        examined = stage.get("docsExamined", 0)
+        returned = stage.get("nReturned", 0)
+        if examined > max_docs_per_result * max(returned, 1):
+            yield Finding(FETCH_RATIO, MEDIUM, "FETCH examined %d documents "
+                          "to return %d" % (examined, returned), "FETCH")
+
+
+def _pipeline_findings(result):
+    stages = result.get("stages") or ()
+    # A $sort after the $cursor stage was not pushed down to the query layer.
+    for stage in stages[1:]:
+        if "$sort" in stage:
+            yield Finding(BLOCKING_SORT, MEDIUM, "the pipeline sorts the "
+                          "results in memory instead of using an index",
+                          "$sort")
+    for stage in stages:
+        if "$lookup" not in stage:
+            continue
+        if stage.get("collectionScans", 0) > 0 or \
+                stage.get("indexesUsed", None) == []:
+            yield Finding(LOOKUP_NO_INDEX, HIGH, "$lookup from %s scans the "
+                          "foreign collection" % (
+                              stage["$lookup"].get("from"),), "$lookup")
+
+
+def analyze(result, max_docs_per_result=10, max_or_branches=4):
+    """Return the list of :class:`Finding` for an explain response.
+
+    :Parameters:
+      - `result`: an :class:`~pymongoexplain.result.ExplainResult` or any
+        explain response document.
+      - `max_docs_per_result`: report ``FETCH`` stages that examine more
+        than this many documents per returned document. Requires the
+        ``executionStats`` or ``allPlansExecution`` verbosity.
+      - `max_or_branches`: report ``OR`` and ``SORT_MERGE`` stages with at
+        least this many input stages.
+    """
+    if not isinstance(result, ExplainResult):
+        result = ExplainResult.from_document(result)
+    findings = list(_winning_plan_findings(result.winning_plan,
+                                           max_or_branches))
+    execution_stats = result.execution_stats
+    if execution_stats is not None:
+        findings.extend(_execution_findings(execution_stats,
+                                            max_docs_per_result))
+    findings.extend(_pipeline_findings(result))
+    return findings
@@ -0,0 +1,109 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Explainable CRUD API for PyMongo's asyncio ``AsyncCollection``."""
+
+import asyncio
+import time
+
+from .bulk import BulkPlan, group_requests
+from .cursor import AsyncExplainCursor
+from .explainable_collection import ExplainableCollection
+
+
+class AsyncExplainableCollection(ExplainableCollection):
+    """Wraps a :class:`~pymongo.asynchronous.collection.AsyncCollection`.
+
+    Provides the same CRUD methods as :class:`ExplainableCollection`, but
+    each method returns a coroutine that must be awaited::
+
+        explain = AsyncExplainableCollection(client.db.products)
+        result = await explain.find({"quantity": 1057})
+    """
+
+    _cursor_class = AsyncExplainCursor
+
+    async def _check_index_catalog(self, read_preference):
+        if not self._index_check_admitted():
+            return
+        sent = time.perf_counter()
+        try:
+            response = await self.collection.database.command(
+                "listIndexes", self.collection.name,
+                read_preference=read_preference)
+        except Exception as exc:
+            self._index_check_done(None, exc, sent)
+        else:
+            self._index_check_done(response, None, sent)
+
+    async def _explain_command(self, command):
+        request = self._start_explain(command)
+        if request.key is not None:
+            await self._check_index_catalog(request.read_preference)
+        result = self._before_send(request)
+        if result is not None:
+            return result
+        try:
+            raw = await self.collection.database.command(
+                request.explain_command,
+                read_preference=request.read_preference,
+                codec_options=request.codec_options)
+        except Exception as exc:
+            return self._send_failed(request, exc)
+        return self._send_succeeded(request, raw)
+
+    async def explain_many(self, ops, max_workers=8):
+        """Explain many operations concurrently.
+
+        Same as :meth:`ExplainableCollection.explain_many`, except that the
+        explain commands run as coroutines on the event loop, with at most
+        `max_workers` of them in flight at once.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def explain_one(method_name, args, kwargs):
+            command = self._build_command(method_name, args, kwargs)
+            async with semaphore:
+                return await self._explain_command(command)
+
+        return await asyncio.gather(
+            *[explain_one(*op) for op in ops], return_exceptions=True)
+
+    async def bulk_write(self, requests, ordered=True,
+                         bypass_document_validation=None, session=None,
+                         comment=None, let=None, max_workers=8):
+        """Explain the update and delete requests of a bulk write.
+
+        Same as :meth:`ExplainableCollection.bulk_write`, except that the
+        explain commands run as coroutines on the event loop.
+        """
+        groups = group_requests(self.collection, requests,
+                                bypass_document_validation, comment, let)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def explain_one(command):
+            async with semaphore:
+                return await self._explain_command(command)
+
+        results = await asyncio.gather(
+            *[explain_one(command) for _, command, _ in groups],
+            return_exceptions=True)
+        return [BulkPlan(key, command, positions, result)
+                for (key, command, positions), result
+                in zip(groups, results)]
+
+
+# Alias
+AsyncExplainCollection = AsyncExplainableCollection
@@ -0,0 +1,196 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Baselines of winning plans and detection of plan regressions."""
+
+import hashlib
+from typing import NamedTuple, Optional, Tuple
+
+from bson import json_util
+
+from .result import ExplainResult, iter_stages, stage_children
+
+STAGES_CHANGED = "STAGES_CHANGED"
+INDEX_CHANGED = "INDEX_CHANGED"
+PLAN_CHANGED = "PLAN_CHANGED"
+KEYS_EXAMINED = "KEYS_EXAMINED"
+DOCS_EXAMINED = "DOCS_EXAMINED"
+
+
+class PlanSummary(NamedTuple):
+    """The parts of a winning plan that are compared against a baseline.
+
+    `signature` is a structural hash of the plan tree: its stages, their
+    order and nesting, and the index and key pattern each stage uses.
+    `keys_examined` and `docs_examined` are ``None`` unless the plan was
+    explained with the ``executionStats`` or ``allPlansExecution``
+    verbosity.
+    """
+
+    signature: str
+    stages: Tuple[str, ...]
+    indexes: Tuple[str, ...]
+    keys_examined: Optional[int]
+    docs_examined: Optional[int]
+
+
+class Regression(NamedTuple):
+    """A plan that regressed from its baseline.
+
+    `reason` is one of ``"STAGES_CHANGED"``, ``"INDEX_CHANGED"``,
+    ``"PLAN_CHANGED"``, ``"KEYS_EXAMINED"`` or ``"DOCS_EXAMINED"``.
+    """
+
+    name: str
+    reason: str
+    baseline: PlanSummary
+    current: PlanSummary
+
+
+def summarize_plan(result):
+    """Return the :class:`PlanSummary` of an explain response."""
+    if not isinstance(result, ExplainResult):
+        result = ExplainResult.from_document(result)
+    stages, indexes, nodes = [], [], []
+    for stage in iter_stages(result.winning_plan):
+        name = stage.get("stage")
+        index_name = stage.get("indexName")
+        stages.append(name)
+        if index_name is not None:
+            indexes.append(index_name)
+        # The number of children of every node in pre-order fixes the shape
+        # of the tree.
+        nodes.append("%s|%s|%s|%s|%d" % (
+            name, index_name, json_util.dumps(stage.get("keyPattern")),
+            stage.get("direction"), len(stage_children(stage))))
+    signature = hashlib.blake2b("\n".join(nodes).encode("utf-8"),
+                                digest_size=8).hexdigest()
+    execution_stats = result.execution_stats or {}
+    return PlanSummary(signature, tuple(stages), tuple(indexes),
+                       execution_stats.get("totalKeysExamined"),
+                       execution_stats.get("totalDocsExamined"))
+
+
+def _exceeds(baseline, current, threshold):
+    if baseline is None or current is None:
+        return False
+    return current > max(baseline, 1) * threshold
+
+
+def compare_plans(name, baseline, current, threshold=1.5):
+    """Return the list of :class:`Regression` between two plan summaries.
+
+    :Parameters:
+      - `name`: the name of the operation the plans belong to.
+      - `baseline`, `current`: the :class:`PlanSummary` to compare.
+      - `threshold`: report ``totalKeysExamined`` and ``totalDocsExamined``
+        that grew by more than this factor.
+    """
+    regressions = []
+    if baseline.signature != current.signature:
+        if baseline.stages != current.stages:
+            reason = STAGES_CHANGED
+        elif baseline.indexes != current.indexes:
+            reason = INDEX_CHANGED
+        else:
+            reason = PLAN_CHANGED
+        regressions.append(Regression(name, reason, baseline, current))
+    if _exceeds(baseline.keys_examined, current.keys_examined, threshold):
+        regressions.append(Regression(name, KEYS_EXAMINED, baseline,
+                                      current))
+    if _exceeds(baseline.docs_examined, current.docs_examined, threshold):
+        regressions.append(Regression(name, DOCS_EXAMINED, baseline,
+                                      current))
+    return regressions
+
+
+class PlanBaseline():
+    """The winning plans of a named set of operations.
+
+    Each operation is a ``(method_name, args, kwargs)`` tuple, as accepted by
+    :meth:`~pymongoexplain.ExplainableCollection.explain_many`.
+    """
+
+    def __init__(self, operations=None, plans=None):
+        self.operations = dict(operations or {})
+        self.plans = dict(plans or {})
+
+    @classmethod
+    def record(cls, explain, operations, max_workers=8):
+        """Explain `operations` and record their winning plans.
+
+        :Parameters:
+          - `explain`: the :class:`~pymongoexplain.ExplainableCollection`
+            to explain the operations with.
+          - `operations`: a mapping of operation name to
+            ``(method_name, args, kwargs)``.
+          - `max_workers`: the maximum number of concurrent explains.
+
+        Raises the first error of an operation that failed to explain.
+        """
+        baseline = cls(operations)
+        baseline.plans = baseline._explain(explain, max_workers)
+        return baseline
+
+    def _explain(self, explain, max_workers):
+        names = list(self.operations)
+        results = explain.explain_many(
+            [self.operations[name] for name in names], max_workers)
+        plans = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                raise result
+            plans[name] = summarize_plan(result)
+        return plans
+
+    def compare(self, explain, threshold=1.5, max_workers=8):
+        """Re-explain the operations and return the list of regressions.
+
+        Takes the same `explain` and `max_workers` arguments as
+        :meth:`record`, and the same `threshold` as :func:`compare_plans`.
+        """
+        current = self._explain(explain, max_workers)
+        regressions = []
+        for name, plan in current.items():
+            regressions.extend(compare_plans(name, self.plans[name], plan,
+                                             threshold))
+        return regressions
+
+    def save(self, path):
+        """Write the baseline to `path` as canonical Extended JSON."""
+        document = {name: {"operation": list(self.operations[name]),
+                           "plan": self.plans[name]._asdict()}
+                    for name in self.operations}
+        with open(path, "w") as f:
+            f.write(json_util.dumps(
+                document, json_options=json_util.CANONICAL_JSON_OPTIONS,
+                indent=1))
+
+    @classmethod
+    def load(cls, path):
+        """Read a baseline written by :meth:`save`."""
+        with open(path) as f:
+            document = json_util.loads(
+                f.read(), json_options=json_util.CANONICAL_JSON_OPTIONS)
+        operations, plans = {}, {}
+        for name, entry in document.items():
+            method_name, args, kwargs = entry["operation"]
+            operations[name] = (method_name, tuple(args), kwargs)
+            plan = entry["plan"]
+            plans[name] = PlanSummary(
+                plan["signature"], tuple(plan["stages"]),
+                tuple(plan["indexes"]), plan["keys_examined"],
+                plan["docs_examined"])
+        return cls(operations, plans)
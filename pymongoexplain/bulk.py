@@ -0,0 +1,121 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Grouping of bulk write requests by query shape."""
+
+from typing import Any, NamedTuple, Tuple
+
+from .commands import DeleteCommand, UpdateCommand, _index_list
+from .shape import shape_hash
+
+
+class BulkPlan(NamedTuple):
+    """The plan of a group of bulk write requests with the same shape.
+
+    `command` is the command of the first request of the group, which is
+    the one explained, `requests` the positions of the requests of the group
+    in the bulk write, and `result` the explain response of `command`, or
+    the exception raised explaining it.
+    """
+
+    shape_hash: str
+    command: Any
+    requests: Tuple[int, ...]
+    result: Any
+
+    @property
+    def operations(self):
+        """The number of requests the plan covers."""
+        return len(self.requests)
+
+
+class _BulkCommands():
+    """Turns bulk write requests into command objects.
+
+    Takes the place of PyMongo's bulk object in ``request._add_to_bulk``,
+    which is how PyMongo itself reads the requests.
+    """
+
+    def __init__(self, collection, bypass_document_validation=None,
+                 comment=None, let=None):
+        self.collection = collection
+        self.bypass_document_validation = bypass_document_validation
+        self.comment = comment
+        self.let = let
+        self.commands = []
+
+    def add_insert(self, document):
+        # Inserts have no query plan.
+        self.commands.append(None)
+
+    def add_update(self, selector, update, multi, upsert=None,
+                   collation=None, array_filters=None, hint=None, sort=None):
+        self.commands.append(UpdateCommand(
+            self.collection, selector, update, upsert=upsert, multi=multi,
+            collation=collation, array_filters=array_filters,
+            hint=_index_list(hint), sort=sort,
+            bypass_document_validation=self.bypass_document_validation,
+            comment=self.comment, let=self.let))
+
+    def add_replace(self, selector, replacement, upsert=None,
+                    collation=None, hint=None, sort=None):
+        self.add_update(selector, replacement, False, upsert,
+                        collation=collation, hint=hint, sort=sort)
+
+    def add_delete(self, selector, limit, collation=None, hint=None):
+        kwargs = {"collation": collation, "comment": self.comment,
+                  "let": self.let}
+        if hint is not None:
+            kwargs["hint"] = _index_list(hint)
+        self.commands.append(DeleteCommand(self.collection, selector, limit,
+                                           None, kwargs))
+
+
+def group_requests(collection, requests, bypass_document_validation=None,
+                   comment=None, let=None):
+    """Build the commands of bulk write requests and group them by shape.
+
+    :Parameters:
+      - `collection`: the ``Collection`` the requests are written to.
+      - `requests`: a list of ``UpdateOne``, ``UpdateMany``, ``ReplaceOne``,
+        ``DeleteOne``, ``DeleteMany`` or ``InsertOne`` requests. Inserts
+        have no plan and are left out.
+      - `bypass_document_validation`, `comment`, `let` (optional): the
+        options of the bulk write.
+
+    Returns a list of ``(shape_hash, command, positions)`` tuples, one per
+    shape in the order the shapes first appear, where `command` is the
+    command of the first request with that shape.
+    """
+    builder = _BulkCommands(collection, bypass_document_validation, comment,
+                            let)
+    for request in requests:
+        try:
+            add_to_bulk = request._add_to_bulk
+        except AttributeError:
+            raise TypeError("%r is not a valid request" % (request,))
+        add_to_bulk(builder)
+    groups = {}
+    for position, command in enumerate(builder.commands):
+        if command is None:
+            continue
+        key = shape_hash(command)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = (command, [position])
+        else:
+            group[1].append(position)
+    return [(key, command, tuple(positions))
+            for key, (command, positions) in groups.items()]
@@ -0,0 +1,154 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Cache of explain responses keyed by query shape."""
+
+import threading
+import time
+from collections import OrderedDict
+
+from .shape import shape_hash
+
+
+def index_catalog_fingerprint(indexes):
+    """Return a value that changes whenever the given indexes change.
+
+    `indexes` is an iterable of index documents, as returned by
+    ``Collection.list_indexes()``.
+    """
+    return frozenset(repr(sorted(index.items())) for index in indexes)
+
+
+def _freeze(document):
+    if document is None:
+        return None
+    return repr(sorted(document.items()))
+
+
+class ExplainCache():
+    """A thread safe LRU cache of explain responses with a TTL.
+
+    Entries are keyed by namespace, query shape, verbosity, collation and
+    read preference, so commands that only differ in their literal values
+    share an entry, and explains routed to different members don't.
+
+    :Parameters:
+      - `max_size`: the maximum number of entries. The least recently used
+        entry is evicted when the cache is full.
+      - `ttl`: the number of seconds an entry stays valid.
+      - `index_check_interval`: how often, in seconds, the index catalog of
+        a namespace is re-read to detect index changes. All entries of a
+        namespace are invalidated when its indexes change. ``None`` disables
+        the check, in which case :meth:`invalidate` should be called after
+        creating or dropping indexes.
+    """
+
+    def __init__(self, max_size=1024, ttl=60.0, index_check_interval=10.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.index_check_interval = index_check_interval
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._catalogs = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(namespace, command, verbosity, read_preference=None):
+        """Return the cache key of an explained command document.
+
+        `read_preference` is the read preference the explain is sent with,
+        or ``None`` for the primary.
+        """
+        return (namespace, shape_hash(command), verbosity,
+                _freeze(command.get("collation")),
+                _freeze(read_preference.document)
+                if read_preference is not None else None)
+
+    def get(self, key):
+        """Return the cached explain response for `key`, or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Cache the explain response `value` under `key`."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace=None):
+        """Remove the entries of `namespace`, or all entries if ``None``."""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._catalogs.clear()
+                return
+            for key in [key for key in self._entries if key[0] == namespace]:
+                del self._entries[key]
+            self._catalogs.pop(namespace, None)
+
+    def needs_index_check(self, namespace):
+        """Return True if the index catalog of `namespace` is due a check."""
+        if self.index_check_interval is None:
+            return False
+        with self._lock:
+            checked = self._catalogs.get(namespace)
+        return checked is None or \
+            time.monotonic() - checked[0] >= self.index_check_interval
+
+    def set_index_catalog(self, namespace, fingerprint):
+        """Record the index catalog fingerprint of `namespace`.
+
+        Invalidates the entries of `namespace` if the fingerprint differs
+        from the one recorded previously. A ``None`` fingerprint records
+        that the catalog could not be read, e.g. for a view, and
+        :meth:`index_catalog_unknown` returns True until the next check
+        succeeds.
+        """
+        with self._lock:
+            previous = self._catalogs.get(namespace)
+            changed = previous is not None and previous[1] != fingerprint
+        if changed:
+            self.invalidate(namespace)
+        with self._lock:
+            self._catalogs[namespace] = (time.monotonic(), fingerprint)
+
+    def index_catalog_unknown(self, namespace):
+        """Return True if the last index check of `namespace` failed.
+
+        Explains of `namespace` should not use the cache then, since index
+        changes can't be detected.
+        """
+        with self._lock:
+            checked = self._catalogs.get(namespace)
+        return checked is not None and checked[1] is None
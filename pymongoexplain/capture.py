@@ -0,0 +1,129 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Capture of the commands a client sends, with command monitoring."""
+
+from pymongo import monitoring
+
+from .commands import RawCommand
+from .shape import shape_hash
+
+EXPLAINABLE_COMMANDS = frozenset([
+    "find", "aggregate", "count", "distinct", "update", "delete",
+    "findAndModify"])
+
+# The server only explains write commands with a single statement.
+_STATEMENT_FIELDS = {"update": "updates", "delete": "deletes"}
+
+
+def capture_collection(database, command):
+    """Return the collection a captured :class:`RawCommand` runs on.
+
+    Database level aggregations (``{"aggregate": 1}``) run on the
+    ``$cmd.aggregate`` namespace.
+    """
+    name = command.collection
+    if not isinstance(name, str):
+        name = "$cmd." + command.command_name
+    return database[name]
+
+
+def split_statements(command_name, document):
+    """Return the :class:`RawCommand` list of a captured command document.
+
+    ``update`` and ``delete`` commands sent by bulk writes and
+    ``update_many``/``delete_many`` batches can carry many statements, but
+    the server only explains them one at a time. They are split into one
+    single-statement command per query shape, in the order the shapes first
+    appear. Other commands are returned as a single ``RawCommand``.
+    """
+    field = _STATEMENT_FIELDS.get(command_name)
+    statements = document.get(field) if field is not None else None
+    if not statements or len(statements) == 1:
+        return [RawCommand(command_name, document)]
+    commands = []
+    seen = set()
+    for statement in statements:
+        command = RawCommand(command_name, document)
+        command.command_document[field] = [statement]
+        key = shape_hash(command)
+        if key not in seen:
+            seen.add(key)
+            commands.append(command)
+    return commands
+
+
+class CommandCapture(monitoring.CommandListener):
+    """Passes every explainable command a client sends to a callback.
+
+    :Parameters:
+      - `callback`: called with the client, the database name and the
+        :class:`~pymongoexplain.commands.RawCommand` of each ``find``,
+        ``aggregate``, ``count``, ``distinct``, ``update``, ``delete`` and
+        ``findAndModify`` command, before the command is sent. Write
+        commands with several statements are passed once per query shape,
+        see :func:`split_statements`.
+      - `duration_callback` (optional): called with the client, the
+        database name, the :class:`~pymongoexplain.commands.RawCommand` and
+        the duration in seconds of each of these commands once it succeeds
+        or fails. A split write command is timed as a whole, under its first
+        statement.
+
+    Listeners are passed to ``MongoClient`` when it is created, so commands
+    are only captured once the client is known: call :meth:`bind` after the
+    client is created, with the client the explains should be sent
+    through.
+
+    The callbacks run on the application's thread while it holds the
+    connection the command is sent on, and PyMongo ignores the exceptions
+    they raise. They should hand the command over to another thread and
+    client rather than explain it themselves.
+    """
+
+    def __init__(self, callback, duration_callback=None):
+        self.callback = callback
+        self.duration_callback = duration_callback
+        self.client = None
+        # The commands in flight, by connection and request id.
+        self._pending = {}
+
+    def bind(self, client):
+        self.client = client
+
+    def started(self, event):
+        if self.client is None or \
+                event.command_name not in EXPLAINABLE_COMMANDS:
+            return
+        commands = split_statements(event.command_name, event.command)
+        if self.duration_callback is not None:
+            self._pending[event.connection_id, event.request_id] = (
+                event.database_name, commands[0])
+        for command in commands:
+            self.callback(self.client, event.database_name, command)
+
+    def _finished(self, event):
+        if self.duration_callback is None:
+            return
+        pending = self._pending.pop((event.connection_id, event.request_id),
+                                    None)
+        if pending is not None:
+            self.duration_callback(self.client, pending[0], pending[1],
+                                   event.duration_micros / 1e6)
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        self._finished(event)
@@ -18,6 +18,7 @@
 
 from typing import Union
 
+from bson.raw_bson import RawBSONDocument
 from bson.son import SON
 from collections import abc
 
@@ -28,12 +29,26 @@ from .utils import convert_to_camelcase
 
 Document = Union[dict, SON]
 
+# Fields the driver, mongos and the server add to the commands they send,
+# which are not part of the operation or which the explain command rejects.
+_DRIVER_FIELDS = frozenset([
+    "$db", "lsid", "$clusterTime", "txnNumber", "startTransaction",
+    "autocommit", "readConcern", "writeConcern", "$readPreference",
+    "apiVersion", "apiStrict", "apiDeprecationErrors", "shardVersion",
+    "databaseVersion", "clientOperationKey", "maxTimeMSOpOnly",
+    "mayBypassWriteBlocking", "$client", "$configTime", "$topologyTime",
+    "$audit"])
+
 
 def _index_document(index_list):
     """Helper to generate an index specifying document.
 
-    Takes a list of (key, direction) pairs.
+    Takes a list of (key, direction) pairs. A RawBSONDocument is already
+    ordered, so it is returned as is and embedded in the command without
+    being decoded.
     """
+    if isinstance(index_list, RawBSONDocument):
+        return index_list
     if isinstance(index_list, abc.Mapping):
         raise TypeError("passing a dict to sort/create_index/hint is not "
                         "allowed - use a list of tuples instead. did you "
@@ -56,6 +71,17 @@ def _index_document(index_list):
     return index
 
 
+def _index_list(index):
+    """Helper to turn an index document into a list of (key, direction).
+
+    Index names and lists are returned as is.
+    """
+    if isinstance(index, abc.Mapping) and \
+            not isinstance(index, RawBSONDocument):
+        return list(index.items())
+    return index
+
+
 def _fields_list_to_dict(fields, option_name):
     """Takes a sequence of field names and returns a matching dictionary.
 
@@ -102,7 +128,8 @@ class UpdateCommand(BaseCommand):
     def __init__(self, collection: Collection, filter, update,
                  upsert=None, multi=None, collation=None, array_filters=None,
                  hint=None, ordered=None, write_concern=None,
-                 bypass_document_validation=None, comment=None):
+                 bypass_document_validation=None, comment=None, sort=None,
+                 let=None):
         super().__init__(collection.name, collation)
         update_doc = {"q": filter, "u": update}
         if upsert is not None:
@@ -117,6 +144,9 @@ class UpdateCommand(BaseCommand):
         if hint is not None:
             update_doc["hint"] = hint if \
                         isinstance(hint, str) else _index_document(hint)
+
+        if sort is not None:
+            update_doc["sort"] = sort
         self.command_document["updates"] = [update_doc]
 
         if ordered is not None:
@@ -132,7 +162,11 @@ class UpdateCommand(BaseCommand):
         if comment is not None:
             self.command_document["comment"] = comment
 
-        self.command_document = convert_to_camelcase(self.command_document)
+        if let is not None:
+            self.command_document["let"] = let
+
+        self.command_document = convert_to_camelcase(
+            self.command_document, recurse_into=("updates",))
 
     @property
     def command_name(self):
@@ -201,6 +235,8 @@ class FindCommand(BaseCommand):
             elif key == "sort":
                 self.command_document["sort"] = _index_document(
                     value)
+            elif key == "hint" and isinstance(value, (list, tuple)):
+                self.command_document["hint"] = _index_document(value)
             else:
                 self.command_document[key] = value
 
@@ -244,8 +280,32 @@ class DeleteCommand(BaseCommand):
             else:
                 self.command_document[key] = value
 
-        self.command_document = convert_to_camelcase(self.command_document)
+        self.command_document = convert_to_camelcase(
+            self.command_document, recurse_into=("deletes",))
 
     @property
     def command_name(self):
         return "delete"
+
+
+class RawCommand(BaseCommand):
+    """A command document sent by the driver, to be explained as is.
+
+    :Parameters:
+      - `command_name`: the name of the command, e.g. ``"find"``.
+      - `document`: the command document, as published in
+        :class:`~pymongo.monitoring.CommandStartedEvent`, a log or the
+        profiler. The fields added by the driver and the server, such as
+        ``lsid``, ``$db`` or ``writeConcern``, are left out.
+    """
+
+    def __init__(self, command_name, document):
+        super().__init__(document[command_name], None)
+        self._command_name = command_name
+        self.command_document = {
+            key: value for key, value in document.items()
+            if key != command_name and key not in _DRIVER_FIELDS}
+
+    @property
+    def command_name(self):
+        return self._command_name
@@ -0,0 +1,145 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Lazy cursors that explain a find once all its options are set."""
+
+from collections import abc
+
+from pymongo import ASCENDING
+from pymongo.errors import InvalidOperation
+
+from .commands import FindCommand
+
+
+class _BaseExplainCursor():
+    def __init__(self, explain, kwargs):
+        self._explain = explain
+        self._kwargs = kwargs
+        self._result = None
+
+    def _set(self, name, value):
+        if self._result is not None:
+            raise InvalidOperation("cannot set options after the find has "
+                                   "been explained")
+        self._kwargs[name] = value
+        return self
+
+    def sort(self, key_or_list, direction=None):
+        """Sort the results, like ``Cursor.sort``."""
+        if isinstance(key_or_list, str):
+            key_or_list = [(key_or_list,
+                            ASCENDING if direction is None else direction)]
+        return self._set("sort", key_or_list)
+
+    def limit(self, limit):
+        """Limit the number of results, like ``Cursor.limit``."""
+        return self._set("limit", limit)
+
+    def skip(self, skip):
+        """Skip the first `skip` results, like ``Cursor.skip``."""
+        return self._set("skip", skip)
+
+    def hint(self, index):
+        """Force the use of an index, like ``Cursor.hint``."""
+        return self._set("hint", index)
+
+    def projection(self, projection):
+        """Set the fields to return, as the `projection` of ``find``."""
+        return self._set("projection", projection)
+
+    def max_time_ms(self, max_time_ms):
+        """Set a time limit, like ``Cursor.max_time_ms``."""
+        return self._set("max_time_ms", max_time_ms)
+
+    def batch_size(self, batch_size):
+        """Set the batch size, like ``Cursor.batch_size``."""
+        return self._set("batch_size", batch_size)
+
+    def collation(self, collation):
+        """Set the collation, like ``Cursor.collation``."""
+        return self._set("collation", collation)
+
+    def command(self):
+        """Return the :class:`~pymongoexplain.commands.FindCommand`."""
+        return FindCommand(self._explain.collection, dict(self._kwargs))
+
+
+class ExplainCursor(_BaseExplainCursor, abc.Mapping):
+    """The lazy result of :meth:`ExplainableCollection.find`.
+
+    Collects the options of the fluent ``Cursor`` API and sends a single
+    explain command the first time the result is accessed::
+
+        result = explain.find({"status": "D"}).sort("qty").limit(10).explain()
+
+    An ``ExplainCursor`` is also a read-only mapping of the explain
+    response, and the attributes of
+    :class:`~pymongoexplain.result.ExplainResult` can be read on it.
+    """
+
+    def explain(self):
+        """Explain the find and return the explain response."""
+        if self._result is None:
+            self._result = self._explain._explain_command(self.command())
+        return self._result
+
+    @property
+    def result(self):
+        """The explain response, see :meth:`explain`."""
+        return self.explain()
+
+    def __getitem__(self, key):
+        return self.explain()[key]
+
+    def __iter__(self):
+        return iter(self.explain())
+
+    def __len__(self):
+        return len(self.explain())
+
+    def __eq__(self, other):
+        return self.explain() == other
+
+    __hash__ = None
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.explain(), name)
+
+    def __repr__(self):
+        if self._result is None:
+            return "ExplainCursor(%r)" % (self.command().get_SON(),)
+        return repr(self._result)
+
+
+class AsyncExplainCursor(_BaseExplainCursor):
+    """The lazy result of :meth:`AsyncExplainableCollection.find`.
+
+    Awaiting the cursor, or its :meth:`explain` method, returns the explain
+    response::
+
+        result = await explain.find({"status": "D"}).sort("qty").limit(10)
+    """
+
+    async def explain(self):
+        """Explain the find and return the explain response."""
+        if self._result is None:
+            self._result = await self._explain._explain_command(
+                self.command())
+        return self._result
+
+    def __await__(self):
+        return self.explain().__await__()
@@ -13,33 +13,367 @@
 # limitations under the License.
 
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union, List, Dict
 
+import bson
 import pymongo
-from pymongo.collection import Collection
+from pymongo.errors import ExecutionTimeout, OperationFailure
+from bson.raw_bson import RawBSONDocument
 from bson.son import SON
 
+from . import analysis
+from .bulk import BulkPlan, group_requests
+from .cache import index_catalog_fingerprint
 from .commands import AggregateCommand, FindCommand, CountCommand, \
     UpdateCommand, DistinctCommand, DeleteCommand, FindAndModifyCommand
+from .cursor import ExplainCursor
+from .result import ExplainDocument, ExplainResult
+from .stats import ExplainStats, ExplainTiming
+from .throttle import ExplainThrottled
 
 Document = Union[dict, SON]
 
+_NAMESPACE_NOT_FOUND = 26
+
+EXPLAINABLE_METHODS = frozenset([
+    "update_one", "replace_one", "update_many", "delete_one", "delete_many",
+    "aggregate", "watch", "find", "find_one", "find_one_and_delete",
+    "find_one_and_replace", "find_one_and_update", "count_documents",
+    "estimated_document_count", "distinct"])
+
+
+# Explains of these commands only read, unless an aggregation writes its
+# results with $out or $merge.
+READ_COMMANDS = frozenset(["find", "aggregate", "count", "distinct"])
+_WRITE_STAGES = ("$out", "$merge")
+
+
+def is_read_command(command):
+    """Return True if a command document only reads."""
+    command_name = next(iter(command))
+    if command_name not in READ_COMMANDS:
+        return False
+    pipeline = command.get("pipeline") if command_name == "aggregate" \
+        else None
+    if pipeline:
+        last_stage = pipeline[-1]
+        return not any(stage in last_stage for stage in _WRITE_STAGES)
+    return True
+
+
+class _ExplainRequest():
+    # The state of one explain call, shared by the steps around the send.
+    __slots__ = ("explain_command", "read_preference", "key", "build",
+                 "encode", "sent", "codec_options")
+
+    def __init__(self, explain_command, read_preference, key, build):
+        self.explain_command = explain_command
+        self.read_preference = read_preference
+        self.key = key
+        self.build = build
+        self.encode = 0.0
+        self.sent = None
+        self.codec_options = None
+
 
 class ExplainableCollection():
-    def __init__(self, collection, verbosity=None, comment=None):
+    _cursor_class = ExplainCursor
+
+    def __init__(self, collection, verbosity=None, comment=None, cache=None,
+                 analyze=False, max_time_ms=None, stats=None,
+                 timing_callback=None, read_preference=None,
+                 write_read_preference=None, rate_limiter=None,
+                 circuit_breaker=None):
+        if max_time_ms is not None and not isinstance(max_time_ms, int):
+            raise TypeError("max_time_ms must be an integer or None")
         self.collection = collection
         self.last_cmd_payload = None
+        self.last_findings = None
+        self.last_timing = None
         self.verbosity = verbosity or "queryPlanner"
         self.comment = comment
-
-    def _explain_command(self, command):
+        self.cache = cache
+        self.analyze = analyze
+        self.max_time_ms = max_time_ms
+        self.stats = stats if stats is not None else ExplainStats()
+        self.timing_callback = timing_callback
+        self.read_preference = read_preference
+        self.write_read_preference = write_read_preference
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+
+    def with_options(self, verbosity=None, comment=None, max_time_ms=None):
+        """Return a copy of this object with different explain options.
+
+        Options that are not given keep their current value, e.g.
+        ``explain.with_options(max_time_ms=500).find(...)`` explains a single
+        find with a 500 ms budget.
+        """
+        return type(self)(
+            self.collection, verbosity or self.verbosity,
+            comment if comment is not None else self.comment, self.cache,
+            self.analyze,
+            max_time_ms if max_time_ms is not None else self.max_time_ms,
+            self.stats, self.timing_callback, self.read_preference,
+            self.write_read_preference, self.rate_limiter,
+            self.circuit_breaker)
+
+    def _build_explain_command(self, command):
         command_son = command.get_SON()
         explain_command = SON([("explain", command_son)])
         explain_command["verbosity"] = self.verbosity
         if self.comment:
             explain_command["comment"] = self.comment
+        if self.max_time_ms is not None:
+            explain_command["maxTimeMS"] = self.max_time_ms
         self.last_cmd_payload = command_son
-        return self.collection.database.command(explain_command)
+        return explain_command
+
+    def _encode_explain_command(self, explain_command):
+        # The explained command is encoded here, where it can be timed;
+        # PyMongo copies the bytes of a RawBSONDocument as they are.
+        encoded = SON(explain_command)
+        encoded["explain"] = RawBSONDocument(bson.encode(
+            explain_command["explain"],
+            codec_options=self.collection.codec_options))
+        return encoded
+
+    def _record_timing(self, timing):
+        self.last_timing = timing
+        self.stats.add(timing)
+        if self.timing_callback is not None:
+            self.timing_callback(timing)
+
+    def _route(self, explain_command):
+        # The read preference to send an explain command with.
+        if is_read_command(explain_command["explain"]):
+            return self.read_preference
+        return self.write_read_preference
+
+    def _admit(self):
+        # Called right before an explain command is sent. The breaker is
+        # checked first, so an open circuit doesn't spend rate limit tokens.
+        if self.circuit_breaker is not None and \
+                not self.circuit_breaker.allow():
+            raise ExplainThrottled("explain circuit breaker is open")
+        if self.rate_limiter is not None and \
+                not self.rate_limiter.try_acquire():
+            raise ExplainThrottled("explain rate limit exceeded")
+
+    def _record_outcome(self, latency, failed):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(latency, failed)
+
+    def _raw_codec_options(self):
+        return self.collection.codec_options.with_options(
+            document_class=ExplainDocument)
+
+    def _cache_key(self, explain_command, read_preference):
+        if self.cache is None:
+            return None
+        return self.cache.make_key(self.collection.full_name,
+                                   explain_command["explain"], self.verbosity,
+                                   read_preference)
+
+    def _index_check_admitted(self):
+        # listIndexes goes to the members the explain is routed to and counts
+        # against the same limits. A throttled check is done on a later call.
+        if not self.cache.needs_index_check(self.collection.full_name):
+            return False
+        try:
+            self._admit()
+        except ExplainThrottled:
+            return False
+        return True
+
+    def _index_check_done(self, response, exc, sent):
+        # A missing collection has no indexes. Any other error, e.g. on a
+        # view or without the listIndexes privilege, leaves the catalog
+        # unknown, and the explain is sent without the cache until a later
+        # check succeeds.
+        missing = isinstance(exc, OperationFailure) and \
+            exc.code == _NAMESPACE_NOT_FOUND
+        failed = exc is not None and not missing
+        self._record_outcome(time.perf_counter() - sent, failed)
+        if failed:
+            fingerprint = None
+        else:
+            indexes = response["cursor"]["firstBatch"] \
+                if response is not None else []
+            fingerprint = index_catalog_fingerprint(indexes)
+        self.cache.set_index_catalog(self.collection.full_name, fingerprint)
+
+    def _check_index_catalog(self, read_preference):
+        if not self._index_check_admitted():
+            return
+        sent = time.perf_counter()
+        try:
+            response = self.collection.database.command(
+                "listIndexes", self.collection.name,
+                read_preference=read_preference)
+        except Exception as exc:
+            self._index_check_done(None, exc, sent)
+        else:
+            self._index_check_done(response, None, sent)
+
+    def _timed_out_result(self, exc):
+        # The server's error response, labeled by its MaxTimeMSExpired code.
+        details = exc.details or {"ok": 0.0, "errmsg": str(exc),
+                                  "code": exc.code}
+        return ExplainResult.from_document(details,
+                                           self._raw_codec_options())
+
+    def _analyze(self, result):
+        if self.analyze:
+            self.last_findings = analysis.analyze(result)
+        return result
+
+    def _start_explain(self, command):
+        start = time.perf_counter()
+        explain_command = self._build_explain_command(command)
+        build = time.perf_counter() - start
+        read_preference = self._route(explain_command)
+        return _ExplainRequest(
+            explain_command, read_preference,
+            self._cache_key(explain_command, read_preference), build)
+
+    def _before_send(self, request):
+        # Returns the cached result, or encodes and admits the explain
+        # command. The cache is skipped while the index catalog is unknown.
+        if request.key is not None and \
+                self.cache.index_catalog_unknown(self.collection.full_name):
+            request.key = None
+        if request.key is not None:
+            result = self.cache.get(request.key)
+            if result is not None:
+                self._record_timing(ExplainTiming(
+                    request.build, 0.0, 0.0, 0.0, 0, 0, True))
+                return self._analyze(result)
+        request.codec_options = self._raw_codec_options()
+        start = time.perf_counter()
+        request.explain_command = self._encode_explain_command(
+            request.explain_command)
+        self._admit()
+        request.sent = time.perf_counter()
+        request.encode = request.sent - start
+        return None
+
+    def _send_failed(self, request, exc):
+        received = time.perf_counter()
+        self._record_outcome(received - request.sent, True)
+        if not isinstance(exc, ExecutionTimeout):
+            raise exc
+        self._record_timing(ExplainTiming(
+            request.build, request.encode, received - request.sent, 0.0,
+            len(request.explain_command["explain"].raw), 0, False))
+        return self._analyze(self._timed_out_result(exc))
+
+    def _send_succeeded(self, request, raw):
+        received = time.perf_counter()
+        self._record_outcome(received - request.sent, False)
+        result = ExplainResult(raw.raw, request.codec_options)
+        self._record_timing(ExplainTiming(
+            request.build, request.encode, received - request.sent,
+            time.perf_counter() - received,
+            len(request.explain_command["explain"].raw), len(raw.raw),
+            False))
+        if request.key is not None and not result.timed_out:
+            self.cache.put(request.key, result)
+        return self._analyze(result)
+
+    def _explain_command(self, command):
+        request = self._start_explain(command)
+        if request.key is not None:
+            self._check_index_catalog(request.read_preference)
+        result = self._before_send(request)
+        if result is not None:
+            return result
+        try:
+            raw = self.collection.database.command(
+                request.explain_command,
+                read_preference=request.read_preference,
+                codec_options=request.codec_options)
+        except Exception as exc:
+            return self._send_failed(request, exc)
+        return self._send_succeeded(request, raw)
+
+    def _build_command(self, method_name, args, kwargs):
+        """Build the command object for one of the CRUD methods by name."""
+        if method_name not in EXPLAINABLE_METHODS:
+            raise ValueError("%r is not an explainable method" %
+                             (method_name,))
+        builder = _CommandBuilder(self.collection)
+        command = getattr(builder, method_name)(*args, **kwargs)
+        if isinstance(command, ExplainCursor):
+            return command.command()
+        return command
+
+    def _explain_or_error(self, command):
+        try:
+            return self._explain_command(command)
+        except Exception as exc:
+            return exc
+
+    def explain_many(self, ops, max_workers=8):
+        """Explain many operations concurrently.
+
+        :Parameters:
+          - `ops`: an iterable of ``(method_name, args, kwargs)`` tuples, where
+            `method_name` is the name of one of the CRUD methods of this
+            class, e.g. ``("find", ({"x": 1},), {"limit": 1})``.
+          - `max_workers`: the maximum number of explain commands in flight
+            at once.
+
+        All commands are built up front, then the explain commands are
+        dispatched on a thread pool of at most `max_workers` threads.
+
+        Returns a list with one entry per operation, in the same order as
+        `ops`. The entry for an operation that failed is the exception that
+        was raised instead of its explain response.
+        """
+        commands = []
+        for method_name, args, kwargs in ops:
+            try:
+                commands.append(self._build_command(method_name, args,
+                                                    kwargs))
+            except Exception as exc:
+                commands.append(exc)
+        results = [None] * len(commands)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for i, command in enumerate(commands):
+                if isinstance(command, Exception):
+                    results[i] = command
+                else:
+                    futures[i] = executor.submit(self._explain_or_error,
+                                                 command)
+            for i, future in futures.items():
+                results[i] = future.result()
+        return results
+
+    def bulk_write(self, requests, ordered=True,
+                   bypass_document_validation=None, session=None,
+                   comment=None, let=None, max_workers=8):
+        """Explain the update and delete requests of a bulk write.
+
+        The requests are grouped by query shape, and the first request of
+        each group is explained; the explain commands are dispatched on a
+        thread pool of at most `max_workers` threads.
+
+        Returns a list of :class:`~pymongoexplain.bulk.BulkPlan`, one per
+        shape in the order the shapes first appear in `requests`, with the
+        positions of the requests each plan covers.
+        """
+        groups = group_requests(self.collection, requests,
+                                bypass_document_validation, comment, let)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._explain_or_error, command)
+                       for _, command, _ in groups]
+            return [BulkPlan(key, command, positions, future.result())
+                    for (key, command, positions), future
+                    in zip(groups, futures)]
 
     def update_one(self, filter, update, upsert=False,
                    bypass_document_validation=False,
@@ -116,7 +450,8 @@ class ExplainableCollection():
             change_stream_options["fullDocument"] = full_document
 
         if pipeline is not None:
-            pipeline = [{"$changeStream": change_stream_options}]+pipeline
+            pipeline = [{"$changeStream": change_stream_options}]+list(
+                pipeline)
         else:
             pipeline = [{"$changeStream": change_stream_options}]
         cursor_args = {}
@@ -132,10 +467,7 @@ class ExplainableCollection():
              **kwargs: Dict[str, Union[int, str,Document, bool]]):
         kwargs.update(locals())
         del kwargs["self"], kwargs["kwargs"]
-        command = FindCommand(self.collection,
-                              kwargs)
-
-        return self._explain_command(command)
+        return self._cursor_class(self, kwargs)
 
     def find_one(self, filter: Document = None, **kwargs: Dict[str,
                                                                Union[int, str,
@@ -199,5 +531,12 @@ class ExplainableCollection():
         return self._explain_command(command)
 
 
+class _CommandBuilder(ExplainableCollection):
+    """Returns the built command object instead of explaining it."""
+
+    def _explain_command(self, command):
+        return command
+
+
 # Alias
 ExplainCollection = ExplainableCollection
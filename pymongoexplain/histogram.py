@@ -0,0 +1,110 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Latency histograms with bounded memory.
+
+Latencies are counted in log-linear buckets, as in HdrHistogram: values are
+grouped by their power of two, and each power of two is split into linear
+sub-buckets. The relative error of a value read back from the histogram is
+at most ``2 ** (1 - precision_bits)``, whatever its magnitude, and the
+number of buckets only grows with the logarithm of the largest value.
+"""
+
+import math
+
+
+class LatencyHistogram():
+    """Counts latencies with a bounded relative error.
+
+    :Parameters:
+      - `precision_bits`: the number of bits of each value that are kept.
+        The default of 7 keeps values within 1.6% of their true value.
+
+    Latencies are recorded in seconds with a resolution of one
+    microsecond. A ``LatencyHistogram`` is not thread safe.
+    """
+
+    def __init__(self, precision_bits=7):
+        if precision_bits < 2:
+            raise ValueError("precision_bits must be at least 2")
+        self.precision_bits = precision_bits
+        self._sub_buckets = 1 << precision_bits
+        self._half = self._sub_buckets >> 1
+        self._counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value < self._sub_buckets:
+            return value
+        shift = value.bit_length() - self.precision_bits
+        return shift * self._half + (value >> shift)
+
+    def _highest_value(self, index):
+        if index < self._sub_buckets:
+            return index
+        shift = index // self._half - 1
+        mantissa = index % self._half + self._half
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds):
+        """Record one latency, in seconds."""
+        value = max(int(seconds * 1e6), 0)
+        index = self._index(value)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self):
+        """The mean latency in seconds, or ``None``."""
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def percentile(self, percentile):
+        """Return the latency at `percentile` (0 to 100), in seconds.
+
+        Returns ``None`` if nothing was recorded.
+        """
+        if not self.count:
+            return None
+        rank = max(math.ceil(percentile / 100.0 * self.count), 1)
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(self._highest_value(index) / 1e6, self.max)
+        return self.max
+
+    def copy(self):
+        """Return a copy of the histogram."""
+        other = LatencyHistogram(self.precision_bits)
+        other._counts = dict(self._counts)
+        other.count = self.count
+        other.total = self.total
+        other.min = self.min
+        other.max = self.max
+        return other
+
+    def __repr__(self):
+        return "LatencyHistogram(count=%d, p50=%r, p99=%r, max=%r)" % (
+            self.count, self.percentile(50), self.percentile(99), self.max)
@@ -0,0 +1,160 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Explain the workload recorded by the database profiler."""
+
+from collections import abc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+
+from .capture import EXPLAINABLE_COMMANDS
+from .commands import DeleteCommand, RawCommand, UpdateCommand, \
+    _index_list
+from .replay import _explain_or_error
+from .shape import shape_hash
+
+# The profiler records write statements one by one, with the statement as
+# the "command".
+_PROFILED_OPS = ["query", "command", "update", "remove"]
+_PROJECTION = {"op": 1, "ns": 1, "command": 1, "millis": 1}
+
+
+class ProfiledShape(NamedTuple):
+    """The profiled operations of one namespace and query shape.
+
+    `command` is the command of the slowest operation, `count` the number of
+    operations, `total_millis` and `max_millis` the total and highest
+    ``millis`` of the operations, and `result` the ``executionStats``
+    explain response of `command`, or the exception raised explaining it.
+    """
+
+    namespace: str
+    shape_hash: str
+    command: Any
+    count: int
+    total_millis: int
+    max_millis: int
+    result: Any
+
+
+def profile_command(collection, entry):
+    """Return the command object of a ``system.profile`` entry.
+
+    :Parameters:
+      - `collection`: the ``Collection`` the entry's namespace refers to.
+      - `entry`: the profiler document.
+
+    Update and remove statements are turned into an
+    :class:`~pymongoexplain.commands.UpdateCommand` or a
+    :class:`~pymongoexplain.commands.DeleteCommand`, queries and commands
+    into a :class:`~pymongoexplain.commands.RawCommand`. Returns ``None``
+    for entries that can't be explained.
+    """
+    op = entry.get("op")
+    command = entry.get("command")
+    if not isinstance(command, abc.Mapping) or "$truncated" in command:
+        return None
+    if op == "update":
+        return UpdateCommand(collection, command.get("q"), command.get("u"),
+                             upsert=command.get("upsert"),
+                             multi=command.get("multi"),
+                             collation=command.get("collation"),
+                             array_filters=command.get("arrayFilters"),
+                             hint=_index_list(command.get("hint")))
+    if op == "remove":
+        kwargs = {"collation": command.get("collation")}
+        if command.get("hint") is not None:
+            kwargs["hint"] = _index_list(command["hint"])
+        return DeleteCommand(collection, command.get("q"),
+                             command.get("limit", 0), None, kwargs)
+    command_name = next(iter(command), None)
+    if command_name not in EXPLAINABLE_COMMANDS or \
+            command_name in ("update", "delete"):
+        return None
+    return RawCommand(command_name, command)
+
+
+def group_profile(database, entries):
+    """Group profiler entries by namespace and query shape.
+
+    Returns a dict mapping ``(namespace, shape_hash)`` to a list of the
+    command of the slowest entry, its ``millis``, the number of entries and
+    their total ``millis``.
+    """
+    groups = {}
+    for entry in entries:
+        namespace = entry.get("ns") or ""
+        name = namespace.split(".", 1)[-1]
+        if not name or name.startswith("system."):
+            continue
+        command = profile_command(database[name], entry)
+        if command is None:
+            continue
+        millis = entry.get("millis", 0)
+        key = (namespace, shape_hash(command))
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [command, millis, 1, millis]
+            continue
+        if millis > group[1]:
+            group[0], group[1] = command, millis
+        group[2] += 1
+        group[3] += millis
+    return groups
+
+
+def explain_profile(database, filter=None, max_workers=8, max_time_ms=None,
+                    read_preference=None, write_read_preference=None):
+    """Explain the slowest operation of each shape in ``system.profile``.
+
+    :Parameters:
+      - `database`: the ``Database`` whose profiler output is read. The
+        profiler must have been enabled with ``db.setProfilingLevel``.
+      - `filter` (optional): an additional filter on the profiler entries,
+        e.g. ``{"ts": {"$gte": start}}``.
+      - `max_workers`: the maximum number of explain commands in flight
+        at once.
+      - `max_time_ms` (optional): the time limit of each explain command.
+        Since ``executionStats`` explains run the query, this bounds the
+        cost of explaining a pathological shape.
+      - `read_preference`, `write_read_preference` (optional): the read
+        preferences to explain read and write commands with, see
+        :class:`~pymongoexplain.ExplainableCollection`.
+
+    The entries are read with a cursor and grouped by namespace and query
+    shape; the slowest entry of each group is explained with the
+    ``executionStats`` verbosity. Returns a list of :class:`ProfiledShape`,
+    the shapes with the highest total time first.
+    """
+    query = {"op": {"$in": _PROFILED_OPS}}
+    if filter:
+        query = {"$and": [query, filter]}
+    cursor = database["system.profile"].find(query, _PROJECTION)
+    try:
+        groups = group_profile(database, cursor)
+    finally:
+        cursor.close()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {key: executor.submit(_explain_or_error, database,
+                                         group[0], "executionStats",
+                                         max_time_ms, read_preference,
+                                         write_read_preference)
+                   for key, group in groups.items()}
+        shapes = [ProfiledShape(key[0], key[1], command, count, total,
+                                millis, futures[key].result())
+                  for key, (command, millis, count, total)
+                  in groups.items()]
+    shapes.sort(key=lambda shape: -shape.total_millis)
+    return shapes
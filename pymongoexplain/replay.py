@@ -0,0 +1,187 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Replay of the slow queries of a mongod structured JSON log.
+
+Every step is a generator, so a log of any size is processed one line at a
+time::
+
+    with open_log("mongod.log.gz") as lines:
+        queries = unique_shapes(iter_slow_queries(lines))
+        for query, result in explain_queries(client, queries):
+            ...
+"""
+
+import collections
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+from bson import json_util
+
+from .capture import capture_collection
+from .commands import RawCommand
+from .explainable_collection import ExplainableCollection
+from .shape import shape_hash
+
+SLOW_QUERY_COMMANDS = frozenset([
+    "find", "aggregate", "update", "delete", "findAndModify", "count",
+    "distinct"])
+
+# Slow write statements are logged on their own, with the statement as the
+# "command" and the type of the statement as the "type".
+_STATEMENT_TYPES = {"update": "update", "remove": "delete"}
+_STATEMENT_FIELDS = {"update": "updates", "delete": "deletes"}
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+class SlowQuery(NamedTuple):
+    """A command read from a ``Slow query`` log entry.
+
+    `millis` is the ``durationMillis`` of the entry.
+    """
+
+    namespace: str
+    command: RawCommand
+    millis: Optional[int]
+
+
+def open_log(path):
+    """Open a mongod log file for reading, decompressing it if needed."""
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == _GZIP_MAGIC:
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def _slow_query(entry):
+    attr = entry.get("attr") or {}
+    namespace = attr.get("ns")
+    command = attr.get("command")
+    if not namespace or not isinstance(command, dict) or \
+            "$truncated" in command:
+        return None
+    collection = namespace.split(".", 1)[1] if "." in namespace else None
+    command_name = _STATEMENT_TYPES.get(attr.get("type"))
+    if command_name is not None:
+        document = {command_name: collection,
+                    _STATEMENT_FIELDS[command_name]: [command]}
+    else:
+        command_name = next(iter(command), None)
+        if command_name not in SLOW_QUERY_COMMANDS:
+            return None
+        field = _STATEMENT_FIELDS.get(command_name)
+        if field is not None and field not in command:
+            # The statements were sent as a document sequence and are
+            # logged in entries of their own.
+            return None
+        document = command
+    return SlowQuery(namespace, RawCommand(command_name, document),
+                     attr.get("durationMillis"))
+
+
+def iter_slow_queries(lines):
+    """Yield a :class:`SlowQuery` for each explainable ``Slow query`` entry.
+
+    :Parameters:
+      - `lines`: an iterable of the lines of a mongod (4.4+) structured
+        JSON log.
+
+    Entries whose command was truncated in the log, and lines that are not
+    valid JSON, are skipped.
+    """
+    for line in lines:
+        # Only parse the lines that can be slow query entries.
+        if '"Slow query"' not in line:
+            continue
+        try:
+            entry = json_util.loads(line)
+        except ValueError:
+            continue
+        if entry.get("msg") != "Slow query":
+            continue
+        query = _slow_query(entry)
+        if query is not None:
+            yield query
+
+
+def unique_shapes(queries):
+    """Yield the first :class:`SlowQuery` of each namespace and query shape.
+
+    Only the shape hashes already seen are kept in memory.
+    """
+    seen = set()
+    for query in queries:
+        key = (query.namespace, shape_hash(query.command))
+        if key not in seen:
+            seen.add(key)
+            yield query
+
+
+def _explain_or_error(database, command, verbosity, max_time_ms,
+                      read_preference, write_read_preference):
+    # Shared by replay and profile: explains that run out of time are
+    # labeled by ExplainableCollection, and any other error is returned.
+    explain = ExplainableCollection(
+        capture_collection(database, command), verbosity=verbosity,
+        max_time_ms=max_time_ms, read_preference=read_preference,
+        write_read_preference=write_read_preference)
+    try:
+        return explain._explain_command(command)
+    except Exception as exc:
+        return exc
+
+
+def _explain(client, query, verbosity, max_time_ms, read_preference,
+             write_read_preference):
+    return _explain_or_error(
+        client[query.namespace.split(".", 1)[0]], query.command, verbosity,
+        max_time_ms, read_preference, write_read_preference)
+
+
+def explain_queries(client, queries, max_workers=8, verbosity=None,
+                    max_time_ms=None, read_preference=None,
+                    write_read_preference=None):
+    """Explain queries concurrently and yield ``(query, result)`` pairs.
+
+    :Parameters:
+      - `client`: the ``MongoClient`` to run the explain commands with.
+      - `queries`: an iterable of :class:`SlowQuery`.
+      - `max_workers`: the maximum number of explain commands in flight
+        at once.
+      - `verbosity` (optional): the verbosity of the explain commands.
+      - `max_time_ms` (optional): the time limit of each explain command.
+      - `read_preference`, `write_read_preference` (optional): the read
+        preferences to explain read and write commands with, see
+        :class:`~pymongoexplain.ExplainableCollection`.
+
+    Queries are read from `queries` only as fast as they are explained, and
+    the pairs are yielded in the same order. The result of a query that
+    failed to explain is the exception that was raised.
+    """
+    pending = collections.deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for query in queries:
+            pending.append((query, executor.submit(
+                _explain, client, query, verbosity, max_time_ms,
+                read_preference, write_read_preference)))
+            if len(pending) >= max_workers:
+                query, future = pending.popleft()
+                yield query, future.result()
+        while pending:
+            query, future = pending.popleft()
+            yield query, future.result()
@@ -0,0 +1,281 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""A summary of the operations of a run, by namespace and query shape.
+
+Calls, their latencies and explain responses are folded into the summary as
+they happen, so its size depends on the number of distinct shapes, not on
+the number of calls::
+
+    report = RunReport()
+    report.add("db.products", command, result)
+    report.record_latency("db.products", command, seconds)
+    for summary in report.summaries():
+        print(format_summary(summary))
+"""
+
+import threading
+from typing import NamedTuple, Optional, Tuple
+
+from bson import json_util
+
+from .analysis import BLOCKING_SORT, COLLSCAN, analyze
+from .histogram import LatencyHistogram
+from .result import ExplainResult, iter_stages
+from .shape import shape_hash
+
+
+class ShapeSummary(NamedTuple):
+    """The summary of the calls of one query shape on one namespace.
+
+    `count` is the number of calls and `explained` the number of them that
+    were explained. `plans` holds the distinct winning plans seen, each as
+    the tuple of its stage names, and `indexes` the indexes they used.
+    `worst_docs_ratio` is the highest ``totalDocsExamined`` to ``nReturned``
+    ratio, or ``None`` unless the commands were explained with the
+    ``executionStats`` or ``allPlansExecution`` verbosity. `collscan` and
+    `blocking_sort` are True if any plan scanned the whole collection or
+    sorted in memory, and `timed_out` is the number of explains that ran out
+    of time. `latency` is a :class:`~pymongoexplain.histogram.LatencyHistogram`
+    of the operations themselves, or ``None`` if none were timed.
+    """
+
+    namespace: str
+    shape_hash: str
+    command_name: str
+    count: int
+    explained: int
+    plans: Tuple[Tuple[str, ...], ...]
+    indexes: Tuple[str, ...]
+    worst_docs_ratio: Optional[float]
+    collscan: bool
+    blocking_sort: bool
+    timed_out: int
+    latency: Optional[LatencyHistogram]
+
+
+class _ShapeStats():
+    __slots__ = ("command_name", "count", "explained", "plans", "indexes",
+                 "worst_docs_ratio", "collscan", "blocking_sort", "timed_out",
+                 "latency")
+
+    def __init__(self, command_name):
+        self.command_name = command_name
+        self.count = 0
+        self.explained = 0
+        self.plans = []
+        self.indexes = set()
+        self.worst_docs_ratio = None
+        self.collscan = False
+        self.blocking_sort = False
+        self.timed_out = 0
+        self.latency = None
+
+
+def _command_name(command):
+    if hasattr(command, "command_name"):
+        return command.command_name
+    return next(iter(command))
+
+
+def _docs_ratio(result):
+    execution_stats = result.execution_stats
+    if execution_stats is None or "totalDocsExamined" not in execution_stats:
+        return None
+    return execution_stats["totalDocsExamined"] / max(
+        execution_stats.get("nReturned", 0), 1)
+
+
+class RunReport():
+    """Aggregates calls and explain responses by namespace and query shape.
+
+    :Parameters:
+      - `max_shapes`: the maximum number of shapes tracked. Calls of shapes
+        seen after the limit is reached are only counted in
+        :attr:`untracked`.
+      - `max_plans`: the maximum number of distinct winning plans kept for
+        each shape.
+      - `precision_bits`: the precision of the latency histograms, see
+        :class:`~pymongoexplain.histogram.LatencyHistogram`.
+
+    A ``RunReport`` can be shared by several threads.
+    """
+
+    def __init__(self, max_shapes=10000, max_plans=4, precision_bits=7):
+        self.max_shapes = max_shapes
+        self.max_plans = max_plans
+        self.precision_bits = precision_bits
+        self.untracked = 0
+        self._shapes = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, namespace, key, command):
+        # Must be called with the lock held.
+        stats = self._shapes.get((namespace, key))
+        if stats is None and len(self._shapes) < self.max_shapes:
+            stats = self._shapes[namespace, key] = _ShapeStats(
+                _command_name(command))
+        return stats
+
+    def add(self, namespace, command, result=None, key=None):
+        """Count a call, and fold in its explain response if it has one.
+
+        :Parameters:
+          - `namespace`: the namespace the command ran on.
+          - `command`: a command object from :mod:`pymongoexplain.commands`
+            or a command document.
+          - `result` (optional): the explain response of `command`, or
+            ``None`` if it was not explained.
+          - `key` (optional): the :func:`~pymongoexplain.shape.shape_hash`
+            of `command`, if it is already known.
+        """
+        if key is None:
+            key = shape_hash(command)
+        plan = indexes = ratio = codes = None
+        if result is not None:
+            if not isinstance(result, ExplainResult):
+                result = ExplainResult.from_document(result)
+            # Inspect the response before taking the lock.
+            stages = list(iter_stages(result.winning_plan))
+            plan = tuple(stage.get("stage") for stage in stages)
+            indexes = [stage["indexName"] for stage in stages
+                       if "indexName" in stage]
+            ratio = _docs_ratio(result)
+            codes = {finding.code for finding in analyze(result)}
+        with self._lock:
+            stats = self._stats(namespace, key, command)
+            if stats is None:
+                self.untracked += 1
+                return
+            stats.count += 1
+            if result is None:
+                return
+            stats.explained += 1
+            if result.timed_out:
+                stats.timed_out += 1
+            if plan and plan not in stats.plans and \
+                    len(stats.plans) < self.max_plans:
+                stats.plans.append(plan)
+            stats.indexes.update(indexes)
+            if ratio is not None and (stats.worst_docs_ratio is None or
+                                      ratio > stats.worst_docs_ratio):
+                stats.worst_docs_ratio = ratio
+            stats.collscan = stats.collscan or COLLSCAN in codes
+            stats.blocking_sort = stats.blocking_sort or \
+                BLOCKING_SORT in codes
+
+    def record_latency(self, namespace, command, seconds, key=None):
+        """Record how long one call of `command` took, in seconds.
+
+        Takes the same `namespace`, `command` and `key` arguments as
+        :meth:`add`. The call itself is counted by :meth:`add`.
+        """
+        if key is None:
+            key = shape_hash(command)
+        with self._lock:
+            stats = self._stats(namespace, key, command)
+            if stats is None:
+                return
+            if stats.latency is None:
+                stats.latency = LatencyHistogram(self.precision_bits)
+            stats.latency.record(seconds)
+
+    def summaries(self):
+        """Return the list of :class:`ShapeSummary`.
+
+        The shapes that took the most time come first, then the most called
+        ones.
+        """
+        with self._lock:
+            summaries = [ShapeSummary(
+                namespace, key, stats.command_name, stats.count,
+                stats.explained, tuple(stats.plans),
+                tuple(sorted(stats.indexes)), stats.worst_docs_ratio,
+                stats.collscan, stats.blocking_sort, stats.timed_out,
+                stats.latency.copy() if stats.latency is not None else None)
+                for (namespace, key), stats in self._shapes.items()]
+        summaries.sort(key=lambda summary: (
+            summary.latency.total if summary.latency is not None else 0.0,
+            summary.count), reverse=True)
+        return summaries
+
+    def save(self, path):
+        """Write the summaries to `path` as relaxed Extended JSON lines."""
+        with open(path, "w") as f:
+            for summary in self.summaries():
+                f.write(json_util.dumps(
+                    summary_document(summary),
+                    json_options=json_util.RELAXED_JSON_OPTIONS) + "\n")
+
+
+def format_summary(summary):
+    """Return a one line description of a :class:`ShapeSummary`."""
+    parts = ["%s %s %s: %d calls, %d explained" % (
+        summary.namespace, summary.command_name, summary.shape_hash,
+        summary.count, summary.explained)]
+    if summary.plans:
+        parts.append("plans %s" % (" | ".join(
+            " > ".join(str(stage) for stage in plan)
+            for plan in summary.plans),))
+    if summary.indexes:
+        parts.append("indexes %s" % (", ".join(summary.indexes),))
+    if summary.worst_docs_ratio is not None:
+        parts.append("worst docsExamined/nReturned %.1f" % (
+            summary.worst_docs_ratio,))
+    if summary.collscan:
+        parts.append(COLLSCAN)
+    if summary.blocking_sort:
+        parts.append(BLOCKING_SORT)
+    if summary.timed_out:
+        parts.append("%d timed out" % (summary.timed_out,))
+    latency = summary.latency
+    if latency is not None:
+        parts.append("latency p50 %.2f ms, p95 %.2f ms, p99 %.2f ms, max "
+                     "%.2f ms, total %.2f s" % (
+                         latency.percentile(50) * 1000,
+                         latency.percentile(95) * 1000,
+                         latency.percentile(99) * 1000,
+                         latency.max * 1000, latency.total))
+    else:
+        parts.append("latency not timed")
+    return ", ".join(parts)
+
+
+def _latency_document(latency):
+    if latency is None:
+        return None
+    return {"count": latency.count,
+            "totalMs": latency.total * 1000,
+            "meanMs": latency.mean * 1000,
+            "p50Ms": latency.percentile(50) * 1000,
+            "p95Ms": latency.percentile(95) * 1000,
+            "p99Ms": latency.percentile(99) * 1000,
+            "maxMs": latency.max * 1000}
+
+
+def summary_document(summary):
+    """Return a :class:`ShapeSummary` as a document with camelCase keys."""
+    return {"namespace": summary.namespace,
+            "shapeHash": summary.shape_hash,
+            "command": summary.command_name,
+            "count": summary.count,
+            "explained": summary.explained,
+            "plans": [list(plan) for plan in summary.plans],
+            "indexes": list(summary.indexes),
+            "worstDocsRatio": summary.worst_docs_ratio,
+            "collscan": summary.collscan,
+            "blockingSort": summary.blocking_sort,
+            "timedOut": summary.timed_out,
+            "latency": _latency_document(summary.latency)}
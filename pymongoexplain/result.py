@@ -0,0 +1,219 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Lazily decoded explain responses."""
+
+from collections import abc
+
+import bson
+from bson.raw_bson import RawBSONDocument, DEFAULT_RAW_BSON_OPTIONS
+
+_CHILD_FIELDS = ("inputStage", "outerStage", "innerStage", "thenStage",
+                 "elseStage")
+_CHILDREN_FIELDS = ("inputStages", "shards")
+_MAX_TIME_MS_EXPIRED = 50
+
+
+def _plan_root(plan):
+    # SBE plans nest the plan tree under "queryPlan", and sharded plans
+    # nest each shard's plan under "winningPlan" or "executionStages".
+    while True:
+        if "queryPlan" in plan:
+            plan = plan["queryPlan"]
+        elif "winningPlan" in plan:
+            plan = plan["winningPlan"]
+        elif "executionStages" in plan:
+            plan = plan["executionStages"]
+        else:
+            return plan
+
+
+def iter_stages(plan):
+    """Iterate over the stages of a plan tree, parents before children.
+
+    Handles the classic, SBE (``queryPlan``) and sharded (``shards``) plan
+    layouts, as well as ``executionStats`` trees.
+    """
+    if plan is None:
+        return
+    stack = [plan]
+    while stack:
+        stage = _plan_root(stack.pop())
+        yield stage
+        stack.extend(reversed(stage_children(stage)))
+
+
+def stage_children(stage):
+    """Return the list of input stages of a plan stage."""
+    children = []
+    for field in _CHILD_FIELDS:
+        child = stage.get(field)
+        if child is not None:
+            children.append(child)
+    for field in _CHILDREN_FIELDS:
+        children.extend(stage.get(field) or ())
+    return children
+
+
+def _explain_codec_options(codec_options):
+    if codec_options is None:
+        return _DEFAULT_CODEC_OPTIONS
+    if not issubclass(codec_options.document_class, ExplainDocument):
+        return codec_options.with_options(document_class=ExplainDocument)
+    return codec_options
+
+
+class ExplainDocument(RawBSONDocument):
+    """A document of an explain response, decoded on first access.
+
+    The sub-documents of an :class:`ExplainResult` are ``ExplainDocument``
+    instances. Unlike a plain ``RawBSONDocument``, an ``ExplainDocument``
+    compares equal to any mapping with the same content, e.g.
+    ``result["queryPlanner"]["winningPlan"] == {"stage": "COLLSCAN"}``.
+
+    :Parameters:
+      - `bson_bytes`: the BSON bytes of the document.
+      - `codec_options` (optional): the codec options used to decode it. Its
+        ``document_class`` is replaced by ``ExplainDocument`` unless it is a
+        subclass of it.
+    """
+
+    __slots__ = ("_codec_options",)
+
+    def __init__(self, bson_bytes, codec_options=None):
+        codec_options = _explain_codec_options(codec_options)
+        super().__init__(bson_bytes, codec_options)
+        self._codec_options = codec_options
+
+    def to_dict(self):
+        """Decode the whole document into a ``dict``.
+
+        Uses the codec options of the document, with ``dict`` as the
+        document class.
+        """
+        return bson.decode(self.raw, self._codec_options.with_options(
+            document_class=dict))
+
+    def __eq__(self, other):
+        if isinstance(other, RawBSONDocument):
+            return self.raw == other.raw
+        if isinstance(other, abc.Mapping):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self.to_dict())
+
+
+_DEFAULT_CODEC_OPTIONS = DEFAULT_RAW_BSON_OPTIONS.with_options(
+    document_class=ExplainDocument)
+
+
+class ExplainResult(ExplainDocument):
+    """An explain response that is only decoded when it is accessed.
+
+    ``ExplainResult`` keeps the raw BSON of the response and decodes each
+    sub-document on first access. It is a read-only mapping, so it can be
+    used like the ``dict`` returned by ``Database.command``, but it is not a
+    ``dict``: use :meth:`to_dict` to pass it to ``json.dumps``.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_document(cls, document, codec_options=None):
+        """Create an ``ExplainResult`` from a decoded or raw document."""
+        if isinstance(document, RawBSONDocument):
+            return cls(document.raw, codec_options)
+        return cls(bson.encode(document), codec_options)
+
+    def _section(self, name):
+        if name in self:
+            return self[name]
+        # Aggregations that are not pushed down into the query layer report
+        # the query plan in their first stage.
+        for stage in self.get("stages") or ():
+            cursor = stage.get("$cursor")
+            if cursor is not None and name in cursor:
+                return cursor[name]
+        return None
+
+    @property
+    def query_planner(self):
+        """The ``queryPlanner`` section of the response, or ``None``."""
+        return self._section("queryPlanner")
+
+    @property
+    def execution_stats(self):
+        """The ``executionStats`` section of the response, or ``None``."""
+        return self._section("executionStats")
+
+    @property
+    def namespace(self):
+        """The namespace that was explained, or ``None``."""
+        query_planner = self.query_planner
+        if query_planner is None:
+            return None
+        return query_planner.get("namespace")
+
+    @property
+    def winning_plan(self):
+        """The root stage of the winning plan, or ``None``."""
+        query_planner = self.query_planner
+        if query_planner is None or "winningPlan" not in query_planner:
+            return None
+        return _plan_root(query_planner["winningPlan"])
+
+    @property
+    def rejected_plans(self):
+        """The root stages of the rejected plans."""
+        query_planner = self.query_planner
+        if query_planner is None:
+            return []
+        return [_plan_root(plan)
+                for plan in query_planner.get("rejectedPlans") or ()]
+
+    @property
+    def server_address(self):
+        """The ``(host, port)`` of the server that ran the explain.
+
+        Read from the ``serverInfo`` section of the response, so on a
+        replica set it is the member that answered. ``None`` if the response
+        has no ``serverInfo``.
+        """
+        server_info = self.get("serverInfo")
+        if server_info is None or "host" not in server_info:
+            return None
+        return server_info["host"], server_info.get("port")
+
+    @property
+    def timed_out(self):
+        """True if the explain ran out of its ``maxTimeMS`` budget.
+
+        The response is then either the server's error response or, when
+        the query was executed, partial ``executionStats``.
+        """
+        if self.get("code") == _MAX_TIME_MS_EXPIRED:
+            return True
+        execution_stats = self.execution_stats
+        return execution_stats is not None and \
+            not execution_stats.get("executionSuccess", True) and \
+            execution_stats.get("errorCode") == _MAX_TIME_MS_EXPIRED
+
+    def stages(self):
+        """The names of the stages of the winning plan, parents first."""
+        return [stage.get("stage") for stage in iter_stages(self.winning_plan)]
@@ -0,0 +1,71 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Sampling policies that decide which operations get explained."""
+
+import threading
+import time
+
+from .shape import shape_hash
+
+
+class Sampler():
+    """Decides whether a command should be explained.
+
+    A command is explained only if it passes every configured policy:
+
+    :Parameters:
+      - `rate`: explain one in every `rate` commands.
+      - `per_shape`: explain only the first `per_shape` commands of each
+        query shape.
+      - `seconds`: explain only during the first `seconds` seconds after the
+        sampler was created.
+    """
+
+    def __init__(self, rate=1, per_shape=None, seconds=None):
+        if rate < 1:
+            raise ValueError("rate must be at least 1")
+        self.rate = rate
+        self.per_shape = per_shape
+        self.seconds = seconds
+        self._start = time.monotonic()
+        self._calls = 0
+        self._shapes = {}
+        self._lock = threading.Lock()
+
+    def should_explain(self, command, key=None):
+        """Return True if `command` should be explained.
+
+        `key` is the :func:`~pymongoexplain.shape.shape_hash` of `command`,
+        if it is already known.
+        """
+        if self.seconds is not None and \
+                time.monotonic() - self._start >= self.seconds:
+            return False
+        if self.per_shape is None:
+            key = None
+        elif key is None:
+            key = shape_hash(command)
+        with self._lock:
+            if key is not None:
+                seen = self._shapes.get(key, 0)
+                if seen >= self.per_shape:
+                    return False
+            self._calls += 1
+            if (self._calls - 1) % self.rate:
+                return False
+            if key is not None:
+                self._shapes[key] = seen + 1
+        return True
@@ -0,0 +1,247 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Query shape fingerprinting of command documents.
+
+The shape of a command keeps its structure (command name, namespace, field
+names, operators, sort and hint) and replaces literal values with type
+placeholders, so ``{"x": 1}`` and ``{"x": 2}`` have the same shape. This is
+similar to the server's ``queryHash``, but is computed locally without a
+round-trip.
+"""
+
+import datetime
+import hashlib
+import re
+import uuid
+from collections import abc
+
+import bson
+from bson.binary import Binary
+from bson.code import Code
+from bson.decimal128 import Decimal128
+from bson.int64 import Int64
+from bson.max_key import MaxKey
+from bson.min_key import MinKey
+from bson.objectid import ObjectId
+from bson.regex import Regex
+from bson.timestamp import Timestamp
+
+
+_TYPE_PLACEHOLDERS = {
+    bool: "?bool",
+    int: "?number",
+    Int64: "?number",
+    float: "?number",
+    Decimal128: "?number",
+    str: "?string",
+    bytes: "?binData",
+    Binary: "?binData",
+    uuid.UUID: "?binData",
+    ObjectId: "?objectId",
+    datetime.datetime: "?date",
+    Timestamp: "?timestamp",
+    Regex: "?regex",
+    re.Pattern: "?regex",
+    Code: "?javascript",
+    MinKey: "?minKey",
+    MaxKey: "?maxKey",
+    type(None): "?null",
+}
+
+_LOGICAL_OPERATORS = frozenset(["$and", "$or", "$nor"])
+_FILTER_FIELDS = frozenset(["filter", "q", "query"])
+_UPDATE_FIELDS = frozenset(["u", "update"])
+_STATEMENT_FIELDS = frozenset(["updates", "deletes"])
+_KEPT_FIELDS = frozenset(["sort", "hint", "projection", "fields", "key",
+                          "multi", "upsert", "remove", "new", "collation"])
+_PLACEHOLDER_FIELDS = frozenset(["limit", "skip"])
+_SUBPIPELINE_STAGES = frozenset(["$lookup", "$unionWith"])
+
+
+def _type_placeholder(tp):
+    placeholder = _TYPE_PLACEHOLDERS.get(tp)
+    if placeholder is not None:
+        return placeholder
+    if issubclass(tp, abc.Mapping):
+        return "?object"
+    if issubclass(tp, (list, tuple)):
+        return "?array"
+    return "?" + tp.__name__
+
+
+def _array_placeholder(values):
+    # Only the distinct element types are inspected, so large $in lists cost
+    # a single pass over the list.
+    types = sorted(set(map(_type_placeholder, set(map(type, values)))))
+    return "?array<%s>" % (",".join(types),)
+
+
+def _literal_shape(value):
+    if isinstance(value, (list, tuple)):
+        return _array_placeholder(value)
+    return _type_placeholder(type(value))
+
+
+def _is_operator_document(value):
+    if not isinstance(value, abc.Mapping):
+        return False
+    for key in value:
+        return key.startswith("$")
+    return False
+
+
+def _predicate_shape(value):
+    """Shape of the value that a field is compared to in a filter."""
+    if not _is_operator_document(value):
+        return _literal_shape(value)
+    shape = {}
+    for operator, argument in value.items():
+        if operator == "$elemMatch":
+            if _is_operator_document(argument):
+                shape[operator] = _predicate_shape(argument)
+            else:
+                shape[operator] = filter_shape(argument)
+        elif operator == "$not":
+            shape[operator] = _predicate_shape(argument)
+        else:
+            shape[operator] = _literal_shape(argument)
+    return shape
+
+
+def filter_shape(filter):
+    """Return the shape of a query filter document."""
+    if not isinstance(filter, abc.Mapping):
+        return _literal_shape(filter)
+    shape = {}
+    for key, value in filter.items():
+        if key in _LOGICAL_OPERATORS and isinstance(value, (list, tuple)):
+            shape[key] = [filter_shape(clause) for clause in value]
+        elif key == "$expr":
+            shape[key] = _expression_shape(value)
+        elif key.startswith("$"):
+            shape[key] = _literal_shape(value)
+        else:
+            shape[key] = _predicate_shape(value)
+    return shape
+
+
+def _expression_shape(value):
+    """Shape of an aggregation expression, keeping field paths."""
+    if isinstance(value, str):
+        return value if value.startswith("$") else "?string"
+    if isinstance(value, abc.Mapping):
+        return {key: _expression_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        types = set(map(type, value))
+        if str in types or any(issubclass(tp, (abc.Mapping, list, tuple))
+                               for tp in types):
+            return [_expression_shape(item) for item in value]
+        return _array_placeholder(value)
+    return _literal_shape(value)
+
+
+def pipeline_shape(pipeline):
+    """Return the shape of an aggregation pipeline."""
+    if not isinstance(pipeline, (list, tuple)):
+        return _literal_shape(pipeline)
+    shape = []
+    for stage in pipeline:
+        stage_shape = {}
+        for name, spec in stage.items():
+            if name == "$match":
+                stage_shape[name] = filter_shape(spec)
+            elif name in ("$sort", "$hint"):
+                stage_shape[name] = spec
+            elif name in ("$limit", "$skip", "$sample"):
+                stage_shape[name] = _literal_shape(spec)
+            elif name == "$facet" and isinstance(spec, abc.Mapping):
+                stage_shape[name] = {facet: pipeline_shape(sub)
+                                     for facet, sub in spec.items()}
+            elif name in _SUBPIPELINE_STAGES and \
+                    isinstance(spec, abc.Mapping) and "pipeline" in spec:
+                sub_shape = {key: value for key, value in spec.items()
+                             if key not in ("pipeline", "let")}
+                sub_shape["pipeline"] = pipeline_shape(spec["pipeline"])
+                stage_shape[name] = sub_shape
+            else:
+                stage_shape[name] = _expression_shape(spec)
+        shape.append(stage_shape)
+    return shape
+
+
+def _update_shape(update):
+    if isinstance(update, (list, tuple)):
+        return pipeline_shape(update)
+    if not _is_operator_document(update):
+        # Replacement documents only contribute their type.
+        return _literal_shape(update)
+    return {operator: {field: _literal_shape(value)
+                       for field, value in fields.items()}
+            if isinstance(fields, abc.Mapping) else _literal_shape(fields)
+            for operator, fields in update.items()}
+
+
+def _fields_shape(items, statement=False):
+    shape = {}
+    for key, value in items:
+        if key in _FILTER_FIELDS:
+            shape[key] = filter_shape(value)
+        elif key == "pipeline":
+            shape[key] = pipeline_shape(value)
+        elif key in _UPDATE_FIELDS:
+            shape[key] = _update_shape(value)
+        elif key in _STATEMENT_FIELDS:
+            shape[key] = [_fields_shape(item.items(), statement=True)
+                          for item in value]
+        elif key == "arrayFilters":
+            shape[key] = [filter_shape(item) for item in value]
+        elif key in _KEPT_FIELDS or (statement and key == "limit"):
+            # The limit of a delete statement chooses deleteOne/deleteMany.
+            shape[key] = value
+        elif key in _PLACEHOLDER_FIELDS:
+            shape[key] = _literal_shape(value)
+    return shape
+
+
+def query_shape(command):
+    """Return the query shape of a command.
+
+    :Parameters:
+      - `command`: a command object from :mod:`pymongoexplain.commands` or
+        a command document such as the output of ``BaseCommand.get_SON()``.
+
+    Options that do not affect the query plan, such as ``comment`` or
+    ``batchSize``, are not part of the shape. ``collation`` is kept, since
+    it decides which indexes on string fields can be used, like in the
+    ``queryHash`` of the server.
+    """
+    if hasattr(command, "get_SON"):
+        command = command.get_SON()
+    items = iter(command.items())
+    command_name, collection = next(items)
+    shape = {command_name: collection}
+    shape.update(_fields_shape(items))
+    return shape
+
+
+def shape_hash(command):
+    """Return a stable hash of the query shape of a command.
+
+    The hash is a string of 16 uppercase hexadecimal digits that is equal
+    for commands with the same :func:`query_shape`.
+    """
+    encoded = bson.encode(query_shape(command))
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest().upper()
@@ -0,0 +1,158 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Destinations for explain records.
+
+An explain record is a document with the fields ``ts``, ``namespace``,
+``method``, ``command`` (the explained command) and ``explain`` (the explain
+response).
+"""
+
+import logging
+import os
+import threading
+
+import bson
+from bson import json_util
+
+
+class Sink():
+    """Base class of the explain record destinations."""
+
+    def write(self, record):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class LoggingSink(Sink):
+    """Logs each explain response with :func:`logging.info`."""
+
+    def write(self, record):
+        logging.info("%s explain response: %s", record["method"],
+                     record["explain"])
+
+
+class NullSink(Sink):
+    """Discards the explain records."""
+
+    def write(self, record):
+        pass
+
+
+class MemorySink(Sink):
+    """Collects the explain records in the :attr:`records` list."""
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        with self._lock:
+            self.records.append(record)
+
+
+class _FileSink(Sink):
+    """Buffers encoded records and writes them to a size rotated file.
+
+    :Parameters:
+      - `path`: the path of the file to write.
+      - `buffer_size`: the number of records buffered before they are
+        written to the file in one batch.
+      - `max_bytes`: when the file reaches this size it is renamed to
+        ``<path>.1``, the previous ``<path>.1`` to ``<path>.2`` and so on, and
+        a new file is started. ``None`` disables rotation.
+      - `backup_count`: the number of rotated files to keep.
+    """
+
+    mode = "ab"
+
+    def __init__(self, path, buffer_size=100, max_bytes=None,
+                 backup_count=5):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._file = open(path, self.mode)
+        self._size = self._file.tell()
+
+    def _encode(self, record):
+        raise NotImplementedError
+
+    def write(self, record):
+        data = self._encode(record)
+        with self._lock:
+            self._buffer.append(data)
+            if len(self._buffer) >= self.buffer_size:
+                self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        data = b"".join(self._buffer)
+        self._buffer = []
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+        if self.max_bytes is not None and self._size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            source = "%s.%d" % (self.path, i)
+            if os.path.exists(source):
+                os.replace(source, "%s.%d" % (self.path, i + 1))
+        if self.backup_count > 0:
+            os.replace(self.path, self.path + ".1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, self.mode)
+        self._size = 0
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._file.close()
+
+
+class JSONLSink(_FileSink):
+    """Writes one relaxed Extended JSON document per line."""
+
+    def _encode(self, record):
+        return (json_util.dumps(
+            record, json_options=json_util.RELAXED_JSON_OPTIONS) +
+            "\n").encode("utf-8")
+
+
+class BSONSink(_FileSink):
+    """Writes the records as consecutive BSON documents.
+
+    Each BSON document starts with its length, so the file can be read back
+    with :func:`bson.decode_file_iter`.
+    """
+
+    def _encode(self, record):
+        return bson.encode(record)
@@ -0,0 +1,102 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Timing of the explain calls themselves."""
+
+import threading
+from typing import NamedTuple
+
+
+class ExplainTiming(NamedTuple):
+    """Where the time of one explain call went, in seconds.
+
+    `build` is the time spent turning the command object into the explain
+    command, `encode` encoding it to BSON, `network` waiting for the
+    server's response (including PyMongo's own work to send the command and
+    read the response) and `decode` wrapping the response. The response is
+    decoded lazily as it is accessed, so `decode` does not include that.
+
+    `request_bytes` and `response_bytes` are the sizes of the encoded
+    command and of the response. `cached` is True when the result came from
+    the :class:`~pymongoexplain.ExplainCache` and no command was sent.
+    """
+
+    build: float
+    encode: float
+    network: float
+    decode: float
+    request_bytes: int
+    response_bytes: int
+    cached: bool
+
+    @property
+    def total(self):
+        return self.build + self.encode + self.network + self.decode
+
+
+class ExplainStats():
+    """Accumulates the :class:`ExplainTiming` of explain calls.
+
+    A single ``ExplainStats`` can be shared by several
+    :class:`~pymongoexplain.ExplainableCollection` objects and threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear the accumulated timings."""
+        with self._lock:
+            self.count = 0
+            self.cached = 0
+            self.build = 0.0
+            self.encode = 0.0
+            self.network = 0.0
+            self.decode = 0.0
+            self.max_total = 0.0
+            self.request_bytes = 0
+            self.response_bytes = 0
+
+    def add(self, timing):
+        """Add the timing of one explain call."""
+        with self._lock:
+            self.count += 1
+            self.cached += timing.cached
+            self.build += timing.build
+            self.encode += timing.encode
+            self.network += timing.network
+            self.decode += timing.decode
+            self.max_total = max(self.max_total, timing.total)
+            self.request_bytes += timing.request_bytes
+            self.response_bytes += timing.response_bytes
+
+    @property
+    def total(self):
+        """The total time spent in explain calls, in seconds."""
+        return self.build + self.encode + self.network + self.decode
+
+    def as_dict(self):
+        """Return a consistent snapshot of the statistics as a dict."""
+        with self._lock:
+            return {"count": self.count, "cached": self.cached,
+                    "build": self.build, "encode": self.encode,
+                    "network": self.network, "decode": self.decode,
+                    "total": self.total, "maxTotal": self.max_total,
+                    "requestBytes": self.request_bytes,
+                    "responseBytes": self.response_bytes}
+
+    def __repr__(self):
+        return "ExplainStats(%r)" % (self.as_dict(),)
@@ -0,0 +1,155 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Limits on the explain traffic sent to a deployment."""
+
+import collections
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class ExplainThrottled(Exception):
+    """Raised instead of sending a throttled explain command.
+
+    The explain was refused by a :class:`RateLimiter` or an open
+    :class:`CircuitBreaker`.
+    """
+
+
+class RateLimiter():
+    """A token bucket limiting the number of explains per second.
+
+    :Parameters:
+      - `rate`: the number of explains allowed per second, on average.
+      - `burst` (optional): the number of explains that can be sent at once
+        after a quiet period. Defaults to `rate`, and at least 1.
+
+    A ``RateLimiter`` can be shared by several
+    :class:`~pymongoexplain.ExplainableCollection` objects and threads.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1)
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rejected = 0
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """Take a token and return True, or return False if there is none."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._tokens + (now - self._last) * self.rate,
+                               self.burst)
+            self._last = now
+            if self._tokens < 1:
+                self.rejected += 1
+                return False
+            self._tokens -= 1
+            return True
+
+
+class CircuitBreaker():
+    """Turns explains off while they are slow or failing.
+
+    :Parameters:
+      - `max_latency` (optional): open the circuit when the mean time the
+        recent explains waited on the server exceeds this many seconds.
+      - `max_error_rate`: open the circuit when more than this fraction of
+        the recent explains failed or ran out of time.
+      - `window`: the number of recent explains considered.
+      - `min_calls`: the number of explains needed before the circuit can
+        open.
+      - `cooldown`: the number of seconds the circuit stays open. A single
+        trial explain is then let through: the circuit closes if it is fast
+        and succeeds, and opens again otherwise.
+
+    A ``CircuitBreaker`` can be shared by several
+    :class:`~pymongoexplain.ExplainableCollection` objects and threads.
+    """
+
+    def __init__(self, max_latency=None, max_error_rate=0.5, window=20,
+                 min_calls=5, cooldown=30.0):
+        self.max_latency = max_latency
+        self.max_error_rate = max_error_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.rejected = 0
+        self.opened = 0
+        self._outcomes = collections.deque(maxlen=window)
+        self._changed = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _open(self, now):
+        self.state = OPEN
+        self.opened += 1
+        self._changed = now
+        self._outcomes.clear()
+
+    def allow(self):
+        """Return True if an explain may be sent now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            # A trial that never reported back doesn't keep the circuit
+            # half-open forever.
+            if now - self._changed >= self.cooldown:
+                self.state = HALF_OPEN
+                self._changed = now
+                return True
+            self.rejected += 1
+            return False
+
+    def _too_slow(self, latency):
+        return self.max_latency is not None and latency > self.max_latency
+
+    def record(self, latency, failed):
+        """Record the outcome of an explain that :meth:`allow` let through.
+
+        :Parameters:
+          - `latency`: the time the explain waited on the server, in
+            seconds.
+          - `failed`: True if the explain failed or ran out of time.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == HALF_OPEN:
+                if failed or self._too_slow(latency):
+                    self._open(now)
+                else:
+                    self.state = CLOSED
+                    self._changed = now
+                return
+            if self.state == OPEN:
+                return
+            self._outcomes.append((latency, failed))
+            calls = len(self._outcomes)
+            if calls < self.min_calls:
+                return
+            errors = sum(1 for _, failed in self._outcomes if failed)
+            mean = sum(latency for latency, _ in self._outcomes) / calls
+            if errors > self.max_error_rate * calls or self._too_slow(mean):
+                self._open(now)
@@ -15,18 +15,72 @@
 
 """Utility functions"""
 
+# Converted keys, precomputed for the options PyMongo's CRUD methods accept.
+# The "_ms" options don't follow the general rule.
+_CAMELCASE_KEYS = {
+    "allow_disk_use": "allowDiskUse",
+    "allow_partial_results": "allowPartialResults",
+    "array_filters": "arrayFilters",
+    "batch_size": "batchSize",
+    "bypass_document_validation": "bypassDocumentValidation",
+    "full_document": "fullDocument",
+    "full_document_before_change": "fullDocumentBeforeChange",
+    "max_await_time_ms": "maxAwaitTimeMS",
+    "max_time_ms": "maxTimeMS",
+    "no_cursor_timeout": "noCursorTimeout",
+    "oplog_replay": "oplogReplay",
+    "read_concern": "readConcern",
+    "resume_after": "resumeAfter",
+    "return_key": "returnKey",
+    "show_expanded_events": "showExpandedEvents",
+    "show_record_id": "showRecordId",
+    "start_after": "startAfter",
+    "start_at_operation_time": "startAtOperationTime",
+    "write_concern": "writeConcern",
+}
 
-def convert_to_camelcase(d):
+# Bounds the memo table when callers pass arbitrary keys.
+_MAX_CACHED_KEYS = 4096
+
+# Options of PyMongo's CRUD methods that are not sent in the command.
+# max_await_time_ms only applies to the getMore commands of tailable cursors
+# and change streams; find and aggregate reject it.
+_DRIVER_ONLY_KEYS = frozenset(["session", "cursor_type", "max_await_time_ms"])
+
+
+def camelcase_key(key):
+    """Return the camelCase version of a snake_case option name."""
+    new_key = _CAMELCASE_KEYS.get(key)
+    if new_key is not None:
+        return new_key
+    new_key = key
+    if "_" in key and key[0] != "_":
+        parts = key.split("_")
+        new_key = parts[0] + "".join([part.capitalize()
+                                      for part in parts[1:]])
+    if len(_CAMELCASE_KEYS) < _MAX_CACHED_KEYS:
+        _CAMELCASE_KEYS[key] = new_key
+    return new_key
+
+
+def convert_to_camelcase(d, recurse_into=()):
+    """Return a copy of `d` with camelCase keys and without ``None`` values.
+
+    The values of the keys in `recurse_into` are option documents, or lists
+    of option documents, whose keys are converted as well.
+    """
     if not isinstance(d, dict):
         return d
     ret = dict()
-    for key in d.keys():
-        if d[key] is None:
+    cached = _CAMELCASE_KEYS.get
+    for key, value in d.items():
+        if value is None or key in _DRIVER_ONLY_KEYS:
             continue
-        new_key = key
-        if "_" in key and key[0] != "_":
-            new_key = key.split("_")[0] + ''.join(
-                [i.capitalize() for i in key.split("_")[1:]])
-        else:
-            ret[new_key] = d[key]
+        new_key = cached(key) or camelcase_key(key)
+        if key in recurse_into:
+            if isinstance(value, list):
+                value = [convert_to_camelcase(item) for item in value]
+            else:
+                value = convert_to_camelcase(value)
+        ret[new_key] = value
     return ret
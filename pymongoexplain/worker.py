@@ -0,0 +1,92 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Background threads that run explains off the application's threads."""
+
+import logging
+import queue
+import threading
+
+BLOCK = "block"
+DROP_OLDEST = "drop-oldest"
+
+_STOP = object()
+
+
+class ExplainWorker():
+    """Runs tasks on background threads fed by a bounded queue.
+
+    :Parameters:
+      - `num_threads`: the number of worker threads.
+      - `queue_size`: the maximum number of tasks waiting in the queue.
+      - `policy`: what :meth:`submit` does when the queue is full, either
+        ``"block"`` to wait for room or ``"drop-oldest"`` to discard the
+        oldest waiting task.
+    """
+
+    def __init__(self, num_threads=1, queue_size=1000, policy=BLOCK):
+        if policy not in (BLOCK, DROP_OLDEST):
+            raise ValueError("policy must be %r or %r, not %r" %
+                             (BLOCK, DROP_OLDEST, policy))
+        if num_threads < 1:
+            raise ValueError("num_threads must be at least 1")
+        self.policy = policy
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        for i in range(num_threads):
+            thread = threading.Thread(target=self._run, daemon=True,
+                                      name="pymongoexplain-worker-%d" % i)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, fn, *args):
+        """Queue ``fn(*args)`` to run on a worker thread."""
+        if self.policy == BLOCK:
+            self._queue.put((fn, args))
+            return
+        while True:
+            try:
+                self._queue.put_nowait((fn, args))
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    with self._lock:
+                        self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _run(self):
+        while True:
+            task = self._queue.get()
+            try:
+                if task is _STOP:
+                    return
+                fn, args = task
+                fn(*args)
+            except Exception:
+                logging.exception("background explain failed")
+            finally:
+                self._queue.task_done()
+
+    def close(self, timeout=None):
+        """Run the remaining queued tasks, then stop the worker threads."""
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
@@ -0,0 +1,90 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Micro-benchmark of the per-command overhead of option key conversion.
+
+Compares :func:`~pymongoexplain.utils.convert_to_camelcase` with the
+conversion of pymongoexplain 1.3, which split and capitalized every option
+name on every call. Run with ``python -m test.performance.bench_camelcase``.
+"""
+
+import timeit
+
+from pymongo import MongoClient
+
+from pymongoexplain.commands import FindCommand
+from pymongoexplain.utils import convert_to_camelcase
+
+NUMBER = 100000
+
+WIDE_KWARGS = {
+    "filter": {"status": "A", "qty": {"$lt": 30}},
+    "projection": {"item": 1, "status": 1},
+    "sort": [("qty", 1)],
+    "skip": 10,
+    "limit": 20,
+    "batch_size": 100,
+    "max_time_ms": 1000,
+    "max_await_time_ms": None,
+    "allow_disk_use": True,
+    "allow_partial_results": False,
+    "no_cursor_timeout": False,
+    "return_key": False,
+    "show_record_id": False,
+    "comment": "bench",
+    "hint": None,
+    "let": {"x": 1},
+    "custom_option_one": 1,
+    "custom_option_two": 2,
+}
+
+
+def convert_to_camelcase_1_3(d):
+    # The conversion of pymongoexplain 1.3, with its bug fixed: it computed
+    # the new name of options with an underscore but never stored them.
+    if not isinstance(d, dict):
+        return d
+    ret = dict()
+    for key in d.keys():
+        if d[key] is None:
+            continue
+        new_key = key
+        if "_" in key and key[0] != "_":
+            new_key = key.split("_")[0] + ''.join(
+                [i.capitalize() for i in key.split("_")[1:]])
+        ret[new_key] = d[key]
+    return ret
+
+
+def bench(name, stmt):
+    seconds = min(timeit.repeat(stmt, number=NUMBER, repeat=5))
+    print("%-28s %8.2f us/call" % (name, seconds / NUMBER * 1e6))
+    return seconds
+
+
+def main():
+    client = MongoClient(connect=False)
+    collection = client.pymongoexplain_bench.test
+    old = bench("1.3 conversion",
+                lambda: convert_to_camelcase_1_3(WIDE_KWARGS))
+    new = bench("convert_to_camelcase",
+                lambda: convert_to_camelcase(WIDE_KWARGS))
+    print("%-28s %8.2fx" % ("speedup", old / new))
+    bench("FindCommand (wide kwargs)",
+          lambda: FindCommand(collection, dict(WIDE_KWARGS)))
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
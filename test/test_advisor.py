@@ -0,0 +1,133 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+import unittest
+
+from bson.regex import Regex
+from bson.son import SON
+
+from pymongoexplain.advisor import IndexAdvisor, index_keys
+
+
+def find(filter, sort=None):
+    command = SON([("find", "products"), ("filter", filter)])
+    if sort is not None:
+        command["sort"] = SON(sort)
+    return command
+
+
+ID_INDEX = {"name": "_id_", "key": SON([("_id", 1)])}
+
+
+class TestIndexKeys(unittest.TestCase):
+    def test_equality_sort_range(self):
+        keys = index_keys(find({"qty": {"$gt": 5}, "status": "A",
+                                "category": {"$eq": "x"}},
+                               [("date", -1)]))
+        self.assertEqual(keys, [(("category", 1), ("status", 1),
+                                 ("date", -1), ("qty", 1))])
+
+    def test_in_is_equality_without_sort(self):
+        self.assertEqual(index_keys(find({"sku": {"$in": [1, 2]}})),
+                         [(("sku", 1),)])
+        self.assertEqual(
+            index_keys(find({"a": 1, "sku": {"$in": [1, 2]}}, [("b", 1)])),
+            [(("a", 1), ("b", 1), ("sku", 1))])
+
+    def test_and_or(self):
+        self.assertEqual(
+            index_keys(find({"$and": [{"a": 1}, {"b": {"$lt": 2}}],
+                             "$or": [{"c": 1}, {"d": 1}]})),
+            [(("a", 1), ("b", 1))])
+
+    def test_regex_is_range(self):
+        expected = [(("status", 1), ("date", -1), ("name", 1))]
+        for regex in (re.compile("^a"), Regex("^a"), {"$regex": "^a"}):
+            self.assertEqual(index_keys(find({"name": regex, "status": "A"},
+                                             [("date", -1)])), expected)
+
+    def test_sort_only(self):
+        command = SON([("find", "products"), ("sort", SON([("date", -1)]))])
+        self.assertEqual(index_keys(command), [(("date", -1),)])
+        self.assertEqual(index_keys(find(None, [("date", -1)])),
+                         [(("date", -1),)])
+
+    def test_id_only(self):
+        self.assertEqual(index_keys(find({"_id": 1})), [])
+
+    def test_aggregate_and_writes(self):
+        command = SON([("aggregate", "products"), ("pipeline", [
+            {"$match": {"a": 1}}, {"$sort": {"b": -1}}])])
+        self.assertEqual(index_keys(command), [(("a", 1), ("b", -1))])
+        command = SON([("update", "products"), ("updates", [
+            {"q": {"a": 1}, "u": {"$set": {"b": 1}}}])])
+        self.assertEqual(index_keys(command), [(("a", 1),)])
+
+
+class TestIndexAdvisor(unittest.TestCase):
+    def test_folds_prefixes(self):
+        advisor = IndexAdvisor()
+        advisor.add("db.products", find({"a": 1}))
+        advisor.add("db.products", find({"a": 2}))
+        advisor.add("db.products", find({"a": 1}, [("b", 1)]))
+        advisor.add("db.products", find({"c": 1}))
+        suggestions = advisor.suggestions()
+        self.assertEqual([(s.keys, s.shapes, s.operations)
+                          for s in suggestions],
+                         [((("a", 1), ("b", 1)), 2, 3),
+                          ((("c", 1),), 1, 1)])
+
+    def test_existing_indexes(self):
+        advisor = IndexAdvisor()
+        advisor.add("db.products", find({"a": 1}, [("b", -1)]))
+        advisor.add("db.products", find({"c": 1}))
+        existing = {"db.products": [
+            ID_INDEX, {"name": "a_1_b_1", "key": SON([("a", -1),
+                                                      ("b", 1)])}]}
+        self.assertEqual([s.keys for s in advisor.suggestions(existing)],
+                         [(("c", 1),)])
+
+    def test_existing_special_indexes(self):
+        advisor = IndexAdvisor()
+        advisor.add("db.products", find({"a": 1, "c": {"$gt": 1}}))
+        advisor.add("db.products", find({"b": 1}))
+        advisor.add("db.products", find({"d": 1}))
+        existing = {"db.products": [
+            ID_INDEX,
+            # Only serves a prefix of (a, c), not (a, c) itself.
+            {"name": "a_1_loc_2dsphere_c_1", "key": SON([
+                ("a", 1), ("loc", "2dsphere"), ("c", 1)])},
+            # Text indexes don't serve queries without $text.
+            {"name": "b_1_description_text", "key": SON([
+                ("b", 1), ("_fts", "text"), ("_ftsx", 1)])},
+            {"name": "d_hashed", "key": SON([("d", "hashed")])}]}
+        self.assertEqual([s.keys for s in advisor.suggestions(existing)],
+                         [(("a", 1), ("c", 1)), (("b", 1),), (("d", 1),)])
+
+    def test_unused_indexes(self):
+        advisor = IndexAdvisor()
+        advisor.add("db.products", find({"a": 1}), {"queryPlanner": {
+            "winningPlan": {"stage": "FETCH", "inputStage": {
+                "stage": "IXSCAN", "indexName": "a_1"}}}})
+        existing = {"db.products": [
+            ID_INDEX, {"name": "a_1", "key": SON([("a", 1)])},
+            {"name": "b_1", "key": SON([("b", 1)])}],
+            "db.other": [ID_INDEX]}
+        self.assertEqual(advisor.unused_indexes(existing),
+                         {"db.products": ["b_1"]})
+
+
+if __name__ == '__main__':
+    unittest.main()
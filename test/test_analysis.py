@@ -0,0 +1,95 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from pymongoexplain.analysis import analyze, BLOCKING_SORT, COLLSCAN, \
+    FETCH_RATIO, HIGH, LOOKUP_NO_INDEX, OR_FANOUT, UNBOUNDED_IXSCAN
+
+
+def codes(result, **kwargs):
+    return sorted(finding.code for finding in analyze(result, **kwargs))
+
+
+class TestAnalyze(unittest.TestCase):
+    def test_good_plan(self):
+        result = {"queryPlanner": {"winningPlan": {
+            "stage": "FETCH", "inputStage": {
+                "stage": "IXSCAN", "indexName": "x_1",
+                "indexBounds": {"x": ["[1, 1]"]}}}}}
+        self.assertEqual(analyze(result), [])
+
+    def test_collscan_and_sort(self):
+        result = {"queryPlanner": {"winningPlan": {
+            "stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}}}
+        findings = analyze(result)
+        self.assertEqual(sorted(f.code for f in findings),
+                         [BLOCKING_SORT, COLLSCAN])
+        collscan = [f for f in findings if f.code == COLLSCAN][0]
+        self.assertEqual(collscan.severity, HIGH)
+        self.assertEqual(collscan.stage, "COLLSCAN")
+
+    def test_sbe_layout(self):
+        result = {"queryPlanner": {"winningPlan": {
+            "queryPlan": {"stage": "COLLSCAN"},
+            "slotBasedPlan": {}}}}
+        self.assertEqual(codes(result), [COLLSCAN])
+
+    def test_unbounded_ixscan(self):
+        result = {"queryPlanner": {"winningPlan": {
+            "stage": "IXSCAN", "indexName": "x_1_y_1",
+            "indexBounds": {"x": ["[MinKey, MaxKey]"],
+                            "y": ["[MinKey, MaxKey]"]}}}}
+        self.assertEqual(codes(result), [UNBOUNDED_IXSCAN])
+
+    def test_or_fanout(self):
+        result = {"queryPlanner": {"winningPlan": {
+            "stage": "SORT_MERGE",
+            "inputStages": [{"stage": "IXSCAN"}] * 5}}}
+        self.assertEqual(codes(result), [OR_FANOUT])
+        self.assertEqual(codes(result, max_or_branches=6), [])
+
+    def test_fetch_ratio(self):
+        result = {
+            "queryPlanner": {"winningPlan": {"stage": "FETCH"}},
+            "executionStats": {"executionStages": {
+                "stage": "FETCH", "docsExamined": 500, "nReturned": 2,
+                "inputStage": {"stage": "IXSCAN"}}}}
+        self.assertEqual(codes(result), [FETCH_RATIO])
+        self.assertEqual(codes(result, max_docs_per_result=500), [])
+
+    def test_lookup_without_index(self):
+        classic = {"stages": [
+            {"$cursor": {"queryPlanner": {"winningPlan": {
+                "stage": "IXSCAN", "indexBounds": {"x": ["[1, 1]"]}}}}},
+            {"$lookup": {"from": "orders", "as": "o"},
+             "collectionScans": 3, "indexesUsed": []}]}
+        self.assertEqual(codes(classic), [LOOKUP_NO_INDEX])
+        sbe = {"queryPlanner": {"winningPlan": {"queryPlan": {
+            "stage": "EQ_LOOKUP", "foreignCollection": "db.orders",
+            "strategy": "HashJoin",
+            "inputStage": {"stage": "IXSCAN",
+                           "indexBounds": {"x": ["[1, 1]"]}}}}}}
+        self.assertEqual(codes(sbe), [LOOKUP_NO_INDEX])
+
+    def test_pipeline_sort(self):
+        result = {"stages": [
+            {"$cursor": {"queryPlanner": {"winningPlan": {
+                "stage": "IXSCAN", "indexBounds": {"x": ["[1, 1]"]}}}}},
+            {"$sort": {"sortKey": {"y": 1}}}]}
+        self.assertEqual(codes(result), [BLOCKING_SORT])
+
+
+if __name__ == '__main__':
+    unittest.main()
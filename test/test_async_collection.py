@@ -0,0 +1,112 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+
+from pymongo import AsyncMongoClient, UpdateOne
+
+from pymongoexplain import AsyncExplainableCollection, AsyncExplainCollection
+from test.test_collection import CommandLogger
+
+
+class TestAsyncExplainableCollection(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.logger = CommandLogger()
+        self.client = AsyncMongoClient(serverSelectionTimeoutMS=1000,
+                                       event_listeners=[self.logger])
+        self.collection = self.client.db.products
+        await self.collection.insert_one({'x': 1})
+        self.explain = AsyncExplainableCollection(self.collection)
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+
+    def _compare_command_dicts(self, ours, theirs):
+        for key in ours.keys():
+            self.assertEqual(ours[key], theirs[key])
+
+    async def test_update_one(self):
+        await self.collection.update_one(
+            {"quantity": 1057, "category": "apparel"},
+            {"$set": {"reorder": True}})
+        last_logger_payload = self.logger.cmd_payload
+        res = await self.explain.update_one(
+            {"quantity": 1057, "category": "apparel"},
+            {"$set": {"reorder": True}})
+        self.assertIn("queryPlanner", res)
+        self._compare_command_dicts(self.explain.last_cmd_payload,
+                                    last_logger_payload)
+
+    async def test_find(self):
+        await self.collection.find({"status": "D"}).to_list()
+        last_logger_payload = self.logger.cmd_payload
+        res = await self.explain.find({"status": "D"})
+        self.assertIn("queryPlanner", res)
+        self._compare_command_dicts(self.explain.last_cmd_payload,
+                                    last_logger_payload)
+
+    async def test_find_cursor(self):
+        res = await self.explain.find({"x": 1}).sort("x").limit(1)
+        self.assertIn("queryPlanner", res)
+        self.assertEqual(self.explain.last_cmd_payload["limit"], 1)
+
+    async def test_bulk_write(self):
+        plans = await self.explain.bulk_write(
+            [UpdateOne({"x": i}, {"$set": {"y": 1}}) for i in range(10)])
+        self.assertEqual(len(plans), 1)
+        self.assertEqual(plans[0].operations, 10)
+        self.assertIn("queryPlanner", plans[0].result)
+
+    async def test_aggregate(self):
+        pipeline = [{"$project": {"tags": 1}}, {"$unwind": "$tags"}]
+        await (await self.collection.aggregate(pipeline)).to_list()
+        last_logger_payload = self.logger.cmd_payload
+        res = await self.explain.aggregate(pipeline)
+        self.assertIn("queryPlanner", res["stages"][0]["$cursor"])
+        self._compare_command_dicts(self.explain.last_cmd_payload,
+                                    last_logger_payload)
+
+    async def test_find_one_and_update(self):
+        await self.collection.find_one_and_update(
+            {'_id': 665}, {'$inc': {'count': 1}})
+        last_logger_payload = self.logger.cmd_payload
+        res = await self.explain.find_one_and_update(
+            {'_id': 665}, {'$inc': {'count': 1}})
+        self.assertIn("queryPlanner", res)
+        self._compare_command_dicts(self.explain.last_cmd_payload,
+                                    last_logger_payload)
+
+    async def test_concurrent_explains(self):
+        results = await asyncio.gather(
+            *[self.explain.find({"x": i}) for i in range(50)])
+        self.assertEqual(len(results), 50)
+        for res in results:
+            self.assertIn("queryPlanner", res)
+
+    async def test_explain_many(self):
+        ops = [("find", ({"x": i},), {}) for i in range(20)]
+        ops.append(("find", ({},), {"sort": {"x": 1}}))
+        res = await self.explain.explain_many(ops, max_workers=4)
+        self.assertEqual(len(res), len(ops))
+        for r in res[:20]:
+            self.assertIn("queryPlanner", r)
+        self.assertIsInstance(res[20], TypeError)
+
+    def test_imports(self):
+        self.assertEqual(AsyncExplainableCollection, AsyncExplainCollection)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+from bson.objectid import ObjectId
+
+from pymongoexplain.baseline import compare_plans, summarize_plan, \
+    PlanBaseline, DOCS_EXAMINED, INDEX_CHANGED, KEYS_EXAMINED, \
+    PLAN_CHANGED, STAGES_CHANGED
+
+
+def explain_result(stage="IXSCAN", index="x_1", direction="forward",
+                   keys=10, docs=10):
+    return {
+        "queryPlanner": {"winningPlan": {
+            "stage": "FETCH",
+            "inputStage": {"stage": stage, "indexName": index,
+                           "keyPattern": {"x": 1},
+                           "direction": direction}}},
+        "executionStats": {"totalKeysExamined": keys,
+                           "totalDocsExamined": docs}}
+
+
+class TestPlanComparison(unittest.TestCase):
+    def test_summary(self):
+        summary = summarize_plan(explain_result())
+        self.assertEqual(summary.stages, ("FETCH", "IXSCAN"))
+        self.assertEqual(summary.indexes, ("x_1",))
+        self.assertEqual(summary.keys_examined, 10)
+        self.assertEqual(summary, summarize_plan(explain_result()))
+
+    def test_unchanged(self):
+        baseline = summarize_plan(explain_result())
+        current = summarize_plan(explain_result(keys=14, docs=5))
+        self.assertEqual(compare_plans("op", baseline, current), [])
+
+    def test_regressions(self):
+        baseline = summarize_plan(explain_result())
+
+        def reasons(**kwargs):
+            current = summarize_plan(explain_result(**kwargs))
+            return [r.reason for r in compare_plans("op", baseline, current)]
+
+        self.assertEqual(reasons(stage="COLLSCAN", index=None),
+                         [STAGES_CHANGED])
+        self.assertEqual(reasons(index="x_1_y_1"), [INDEX_CHANGED])
+        self.assertEqual(reasons(direction="backward"), [PLAN_CHANGED])
+        self.assertEqual(reasons(keys=100, docs=100),
+                         [KEYS_EXAMINED, DOCS_EXAMINED])
+
+    def test_save_and_load(self):
+        oid = ObjectId()
+        baseline = PlanBaseline(
+            {"by_id": ("find", ({"_id": oid},), {"limit": 1})},
+            {"by_id": summarize_plan(explain_result())})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "baseline.json")
+            baseline.save(path)
+            loaded = PlanBaseline.load(path)
+        self.assertEqual(loaded.operations, baseline.operations)
+        self.assertEqual(loaded.plans, baseline.plans)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from bson.son import SON
+from pymongo import (DeleteMany, DeleteOne, InsertOne, MongoClient,
+                     ReplaceOne, UpdateMany, UpdateOne)
+
+from pymongoexplain.bulk import group_requests
+
+REQUESTS = [
+    UpdateOne({"x": 1}, {"$set": {"y": 1}}),
+    InsertOne({"x": 1}),
+    UpdateOne({"x": 2}, {"$set": {"y": 2}}),
+    UpdateMany({"x": 3}, {"$set": {"y": 3}}),
+    ReplaceOne({"x": 4}, {"z": 1}, hint=[("x", 1)]),
+    DeleteOne({"x": 5}),
+    DeleteMany({"x": 6}),
+    DeleteOne({"x": 7}),
+    UpdateOne({"x": 8}, {"$set": {"y": 8}}),
+]
+
+
+class TestGroupRequests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = MongoClient(connect=False)
+        cls.collection = cls.client.db.products
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+
+    def test_group_requests(self):
+        groups = group_requests(self.collection, REQUESTS, comment="bulk")
+        self.assertEqual([positions for _, _, positions in groups],
+                         [(0, 2, 8), (3,), (4,), (5, 7), (6,)])
+        _, update, _ = groups[0]
+        self.assertEqual(update.get_SON(), SON([
+            ("update", "products"),
+            ("updates", [{"q": {"x": 1}, "u": {"$set": {"y": 1}},
+                          "upsert": False, "multi": False}]),
+            ("comment", "bulk")]))
+        _, replace, _ = groups[2]
+        self.assertEqual(replace.command_document["updates"][0]["hint"],
+                         SON([("x", 1)]))
+        _, delete, _ = groups[3]
+        self.assertEqual(delete.command_document["deletes"],
+                         [{"q": {"x": 5}, "limit": 1}])
+
+    def test_collation_is_grouped_apart(self):
+        groups = group_requests(self.collection, [
+            UpdateOne({"x": 1}, {"$set": {"y": 1}},
+                      collation={"locale": "fr"}),
+            UpdateOne({"x": 2}, {"$set": {"y": 2}}),
+            UpdateOne({"x": 3}, {"$set": {"y": 3}},
+                      collation={"locale": "fr"})])
+        self.assertEqual([positions for _, _, positions in groups],
+                         [(0, 2), (1,)])
+
+    def test_invalid_request(self):
+        with self.assertRaises(TypeError):
+            group_requests(self.collection, [{"x": 1}])
+
+
+if __name__ == '__main__':
+    unittest.main()
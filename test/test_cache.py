@@ -0,0 +1,164 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+from unittest import mock
+
+import bson
+from bson.raw_bson import RawBSONDocument
+from bson.son import SON
+from pymongo import MongoClient, ReadPreference
+from pymongo.errors import OperationFailure
+
+from pymongoexplain import CircuitBreaker, ExplainableCollection, \
+    ExplainCache
+from pymongoexplain.cache import index_catalog_fingerprint
+
+
+def find_command(value, collation=None):
+    command = SON([("find", "products"), ("filter", {"x": value})])
+    if collation is not None:
+        command["collation"] = collation
+    return command
+
+
+class TestExplainCache(unittest.TestCase):
+    def test_key_ignores_literals(self):
+        key = ExplainCache.make_key("db.products", find_command(1),
+                                    "queryPlanner")
+        self.assertEqual(key, ExplainCache.make_key(
+            "db.products", find_command(2), "queryPlanner"))
+        self.assertNotEqual(key, ExplainCache.make_key(
+            "db.products", find_command(1), "executionStats"))
+        self.assertNotEqual(key, ExplainCache.make_key(
+            "db.other", find_command(1), "queryPlanner"))
+        self.assertNotEqual(key, ExplainCache.make_key(
+            "db.products", find_command(1, {"locale": "fr"}),
+            "queryPlanner"))
+
+    def test_key_read_preference(self):
+        key = ExplainCache.make_key("db.products", find_command(1),
+                                    "queryPlanner", ReadPreference.SECONDARY)
+        self.assertEqual(key, ExplainCache.make_key(
+            "db.products", find_command(2), "queryPlanner",
+            ReadPreference.SECONDARY))
+        self.assertNotEqual(key, ExplainCache.make_key(
+            "db.products", find_command(1), "queryPlanner"))
+        self.assertNotEqual(key, ExplainCache.make_key(
+            "db.products", find_command(1), "queryPlanner",
+            ReadPreference.NEAREST))
+
+    def test_lru_eviction(self):
+        cache = ExplainCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_ttl(self):
+        cache = ExplainCache(ttl=0.05)
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("a"))
+
+    def test_index_catalog_invalidation(self):
+        cache = ExplainCache(index_check_interval=0)
+        key = ExplainCache.make_key("db.products", find_command(1),
+                                    "queryPlanner")
+        indexes = [{"v": 2, "key": SON([("_id", 1)]), "name": "_id_"}]
+        self.assertTrue(cache.needs_index_check("db.products"))
+        cache.set_index_catalog("db.products",
+                                index_catalog_fingerprint(indexes))
+        cache.put(key, 1)
+        cache.set_index_catalog("db.products",
+                                index_catalog_fingerprint(indexes))
+        self.assertEqual(cache.get(key), 1)
+        indexes.append({"v": 2, "key": SON([("x", 1)]), "name": "x_1"})
+        cache.set_index_catalog("db.products",
+                                index_catalog_fingerprint(indexes))
+        self.assertIsNone(cache.get(key))
+
+    def test_unknown_index_catalog(self):
+        cache = ExplainCache(index_check_interval=60)
+        key = ExplainCache.make_key("db.products", find_command(1),
+                                    "queryPlanner")
+        cache.set_index_catalog("db.products", index_catalog_fingerprint([]))
+        cache.put(key, 1)
+        self.assertFalse(cache.index_catalog_unknown("db.products"))
+        cache.set_index_catalog("db.products", None)
+        self.assertTrue(cache.index_catalog_unknown("db.products"))
+        self.assertFalse(cache.needs_index_check("db.products"))
+        self.assertIsNone(cache.get(key))
+        self.assertFalse(cache.index_catalog_unknown("db.other"))
+
+    def test_invalidate(self):
+        cache = ExplainCache()
+        cache.put(("db.a", "H", "queryPlanner", None), 1)
+        cache.put(("db.b", "H", "queryPlanner", None), 2)
+        cache.invalidate("db.a")
+        self.assertEqual(len(cache), 1)
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+
+class TestIndexCheck(unittest.TestCase):
+    def setUp(self):
+        self.client = MongoClient(connect=False)
+        self.addCleanup(self.client.close)
+        self.commands = []
+
+    def explain_with_index_error(self, error):
+        def command(name, *args, **kwargs):
+            self.commands.append(name if isinstance(name, str) else "explain")
+            if name == "listIndexes":
+                raise error
+            return RawBSONDocument(bson.encode(
+                {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}},
+                 "ok": 1.0}))
+
+        breaker = CircuitBreaker(max_error_rate=0.3, min_calls=3)
+        explain = ExplainableCollection(
+            self.client.db.products, circuit_breaker=breaker,
+            cache=ExplainCache(index_check_interval=60))
+        with mock.patch.object(explain.collection.database, "command",
+                               side_effect=command):
+            first = explain.find({"x": 1}).explain()
+            second = explain.find({"x": 2}).explain()
+        self.assertEqual(first["queryPlanner"]["winningPlan"]["stage"],
+                         "COLLSCAN")
+        # The explains are still sent, without the cache, and the failed
+        # check is only counted by the breaker: 1 error in 3 calls opens it.
+        self.assertIsNot(first, second)
+        self.assertEqual(self.commands, ["listIndexes", "explain", "explain"])
+        self.assertEqual(len(explain.cache), 0)
+        self.assertEqual(breaker.state, "open")
+
+    def test_view(self):
+        self.explain_with_index_error(OperationFailure(
+            "Namespace db.products is a view, not a collection", code=166))
+
+    def test_unauthorized(self):
+        self.explain_with_index_error(OperationFailure(
+            "not authorized on db to execute command", code=13))
+
+
+if __name__ == '__main__':
+    unittest.main()
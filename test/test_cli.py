@@ -0,0 +1,346 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import contextlib
+import io
+import logging
+import unittest
+
+from bson.codec_options import CodecOptions
+from bson.son import SON
+from pymongo import MongoClient, ReadPreference
+from pymongo.monitoring import CommandStartedEvent
+
+from pymongoexplain import CircuitBreaker, ExplainableCollection, \
+    RateLimiter
+from pymongoexplain.__main__ import ExplainSettings, \
+    add_explain_client_arguments, add_routing_arguments, \
+    add_throttle_arguments, explain_command, explain_sampled, \
+    make_explain_client, make_func, make_routing, make_throttle, \
+    patch_client, write_explain
+from pymongoexplain.report import RunReport, format_summary
+from pymongoexplain.sampling import Sampler
+from pymongoexplain.sinks import MemorySink
+
+
+class TestExplainClient(unittest.TestCase):
+    def make_client(self, argv):
+        parser = argparse.ArgumentParser()
+        add_explain_client_arguments(parser)
+        client = make_explain_client(parser, parser.parse_args(argv))
+        if client is not None:
+            self.addCleanup(client.close)
+        return client
+
+    def test_no_explain_client(self):
+        self.assertIsNone(self.make_client([]))
+        for argv in (["--explain-timeout-ms", "500"],
+                     ["--explain-max-pool-size", "2"]):
+            with contextlib.redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    self.make_client(argv)
+
+    def test_explain_client(self):
+        client = self.make_client([
+            "--explain-uri", "mongodb://localhost:27017/?connect=false",
+            "--explain-max-pool-size", "2", "--explain-timeout-ms", "500"])
+        self.assertEqual(client.options.pool_options.max_pool_size, 2)
+        self.assertEqual(client.options.timeout, 0.5)
+        client = self.make_client([
+            "--explain-uri", "mongodb://localhost:27017/?connect=false"])
+        self.assertEqual(client.options.pool_options.max_pool_size, 4)
+
+    def test_explain_client_down(self):
+        app_client = MongoClient(connect=False)
+        self.addCleanup(app_client.close)
+        explain_client = self.make_client([
+            "--explain-uri", "mongodb://localhost:1/?connect=false",
+            "--explain-timeout-ms", "100"])
+        settings = ExplainSettings(explain_client=explain_client,
+                                   sink=MemorySink())
+        new_update = make_func(lambda collection, *args: "updated",
+                               "update_one", settings)
+        with self.assertLogs(level=logging.WARNING):
+            self.assertEqual(new_update(app_client.db.products, {"x": 1},
+                                        {"$set": {"y": 1}}), "updated")
+        self.assertEqual(settings.failed, 1)
+
+    def test_explain_collection(self):
+        app_client = MongoClient(connect=False)
+        self.addCleanup(app_client.close)
+        codec_options = CodecOptions(tz_aware=True)
+        collection = app_client.db.get_collection(
+            "products", codec_options=codec_options)
+
+        explain = ExplainSettings().explain_collection(collection)
+        self.assertIs(explain.collection, collection)
+        self.assertIsNone(explain.read_preference)
+        self.assertIsNone(explain.write_read_preference)
+
+        explain_client = MongoClient(connect=False,
+                                     readPreference="secondary")
+        self.addCleanup(explain_client.close)
+        settings = ExplainSettings(explain_client=explain_client,
+                                   max_time_ms=100)
+        explain = settings.explain_collection(collection)
+        self.assertIs(explain.collection.database.client, explain_client)
+        self.assertEqual(explain.collection.full_name, "db.products")
+        self.assertEqual(explain.collection.codec_options, codec_options)
+        self.assertEqual(explain.read_preference, ReadPreference.SECONDARY)
+        self.assertEqual(explain.max_time_ms, 100)
+        # The commands are the same as with the application's collection.
+        command = explain._build_command("find", ({"x": 1},), {})
+        self.assertEqual(command.get_SON()["find"], "products")
+
+        settings = ExplainSettings(
+            explain_client=explain_client,
+            read_preference=ReadPreference.NEAREST,
+            write_read_preference=ReadPreference.PRIMARY_PREFERRED)
+        explain = settings.explain_collection(collection)
+        self.assertEqual(explain.read_preference, ReadPreference.NEAREST)
+        self.assertEqual(explain.write_read_preference,
+                         ReadPreference.PRIMARY_PREFERRED)
+
+
+class TestWriteExplain(unittest.TestCase):
+    def test_write_explain(self):
+        sink = MemorySink()
+        command = SON([("find", "products"), ("filter", {"x": 1})])
+        self.assertTrue(write_explain(sink, "db.products", "find", command,
+                                      {"ok": 1.0}))
+        record, = sink.records
+        self.assertEqual(record["namespace"], "db.products")
+        self.assertEqual(record["method"], "find")
+        self.assertIs(record["command"], command)
+        self.assertEqual(record["explain"], {"ok": 1.0})
+        # Errors are logged instead of written.
+        with self.assertLogs(level=logging.WARNING) as logs:
+            self.assertFalse(write_explain(
+                sink, "db.products", "find", command,
+                ValueError("no such member")))
+        self.assertIn("failed to explain find on db.products",
+                      logs.output[0])
+        self.assertEqual(len(sink.records), 1)
+
+    def test_settings_count_failures(self):
+        settings = ExplainSettings(sink=MemorySink())
+        with self.assertLogs(level=logging.WARNING):
+            settings.write_explain("db.products", "find", None,
+                                   ValueError("no such member"))
+        settings.write_explain("db.products", "find", {}, {"ok": 1.0})
+        self.assertEqual(settings.failed, 1)
+        self.assertEqual(len(settings.sink.records), 1)
+
+
+class RecordingWorker():
+    def __init__(self):
+        self.tasks = []
+
+    def submit(self, fn, *args):
+        self.tasks.append((fn, args))
+
+
+class TestSampling(unittest.TestCase):
+    def test_sampled_before_queueing(self):
+        client = MongoClient(connect=False)
+        self.addCleanup(client.close)
+        explain = ExplainableCollection(client.db.products)
+        worker = RecordingWorker()
+        report = RunReport()
+        settings = ExplainSettings(sampler=Sampler(rate=2), worker=worker,
+                                   report=report)
+        filters = [{"x": i} for i in range(4)]
+        for filter in filters:
+            command = explain._build_command("find", (filter,), {})
+            explain_sampled(explain, "find", command, settings)
+        # Only the sampled commands are queued, as copies.
+        self.assertEqual(len(worker.tasks), 2)
+        for (fn, args), filter in zip(worker.tasks, filters[::2]):
+            self.assertIs(fn, explain_command)
+            self.assertEqual(args[2].get_SON()["filter"], filter)
+            self.assertIsNot(args[2].get_SON()["filter"], filter)
+        # The operations that were not sampled are counted right away.
+        summary, = report.summaries()
+        self.assertEqual((summary.count, summary.explained), (2, 0))
+
+    def test_lazy_find_not_timed(self):
+        client = MongoClient(connect=False)
+        self.addCleanup(client.close)
+        report = RunReport()
+        # Nothing is explained, so the calls are only counted and timed.
+        settings = ExplainSettings(sampler=Sampler(per_shape=0),
+                                   report=report)
+        new_find = make_func(lambda collection, *args: "cursor", "find",
+                             settings)
+        new_count = make_func(lambda collection, *args: 1,
+                              "count_documents", settings)
+        new_find(client.db.products, {"x": 1})
+        new_count(client.db.products, {"x": 1})
+        # find returns before its query is sent, so it isn't timed.
+        count, find = report.summaries()
+        self.assertEqual(find.command_name, "find")
+        self.assertIsNone(find.latency)
+        self.assertIn("latency not timed", format_summary(find))
+        self.assertEqual(count.latency.count, 1)
+
+
+class TestCapture(unittest.TestCase):
+    def test_explain_clients(self):
+        init = MongoClient.__init__
+        self.addCleanup(setattr, MongoClient, "__init__", init)
+        worker = RecordingWorker()
+        explain_clients = patch_client(ExplainSettings(worker=worker))
+        client = MongoClient(connect=False, maxPoolSize=1)
+        self.addCleanup(client.close)
+        # Explains go through a copy of the client with a pool of its own.
+        explain_client, = explain_clients
+        self.addCleanup(explain_client.close)
+        self.assertIsNot(explain_client, client)
+        self.assertEqual(explain_client.options.pool_options.max_pool_size,
+                         1)
+        listener = client.options.event_listeners[-1]
+        self.assertIs(listener.client, explain_client)
+        self.assertEqual(explain_client.options.event_listeners, [])
+        # And they are queued for the worker instead of run by the listener.
+        listener.started(CommandStartedEvent(
+            SON([("find", "products"), ("filter", {}), ("$db", "db")]),
+            "db", 1, ("localhost", 27017), 1))
+        (fn, args), = worker.tasks
+        self.assertIs(fn, explain_command)
+        self.assertIs(args[0].collection.database.client, explain_client)
+
+
+class TestRouting(unittest.TestCase):
+    def make_routing(self, argv):
+        parser = argparse.ArgumentParser()
+        add_routing_arguments(parser)
+        return make_routing(parser, parser.parse_args(argv))
+
+    def test_default(self):
+        self.assertEqual(self.make_routing([]), (None, None))
+
+    def test_routing(self):
+        read, write = self.make_routing([
+            "--explain-read-preference", "secondary",
+            "--explain-read-preference-tags", "nodeType:ANALYTICS,dc:east",
+            "--explain-read-preference-tags", "",
+            "--explain-write-read-preference", "primaryPreferred"])
+        self.assertEqual(read.mongos_mode, "secondary")
+        self.assertEqual(read.tag_sets,
+                         [{"nodeType": "ANALYTICS", "dc": "east"}, {}])
+        self.assertEqual(write, ReadPreference.PRIMARY_PREFERRED)
+
+    def test_unsatisfiable_tags(self):
+        read, _ = self.make_routing([
+            "--explain-read-preference", "secondary",
+            "--explain-read-preference-tags", "dc:nowhere"])
+        # No member of this replica set can match the tag set.
+        client = MongoClient(replicaSet="pymongoexplain-unknown",
+                             serverSelectionTimeoutMS=100)
+        self.addCleanup(client.close)
+        sink = MemorySink()
+        report = RunReport()
+        settings = ExplainSettings(sink=sink, report=report,
+                                   read_preference=read)
+        calls = []
+
+        def find(collection, *args, **kwargs):
+            calls.append(args)
+            return "found"
+
+        new_find = make_func(find, "find", settings)
+        with self.assertLogs(level=logging.WARNING):
+            self.assertEqual(new_find(client.db.products, {"x": 1}),
+                             "found")
+        # The operation ran even though the explain could not be sent.
+        self.assertEqual(calls, [({"x": 1},)])
+        self.assertEqual(settings.failed, 1)
+        self.assertEqual(sink.records, [])
+        summary, = report.summaries()
+        self.assertEqual((summary.count, summary.explained), (1, 0))
+
+    def test_invalid(self):
+        for argv in (["--explain-read-preference-tags", "dc:east"],
+                     ["--explain-read-preference", "primary",
+                      "--explain-read-preference-tags", "dc:east"]):
+            with contextlib.redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    self.make_routing(argv)
+
+
+class TestThrottle(unittest.TestCase):
+    def make_throttle(self, argv):
+        parser = argparse.ArgumentParser()
+        add_throttle_arguments(parser)
+        return make_throttle(parser, parser.parse_args(argv))
+
+    def test_default(self):
+        self.assertEqual(self.make_throttle([]), (None, None))
+
+    def test_throttle(self):
+        limiter, breaker = self.make_throttle([
+            "--explain-rate", "20", "--explain-burst", "5",
+            "--breaker-latency-ms", "250", "--breaker-cooldown", "10"])
+        self.assertEqual(limiter.rate, 20)
+        self.assertEqual(limiter.burst, 5)
+        self.assertEqual(breaker.max_latency, 0.25)
+        self.assertEqual(breaker.max_error_rate, 0.5)
+        self.assertEqual(breaker.cooldown, 10)
+
+    def test_invalid(self):
+        for argv in (["--explain-rate", "0"], ["--explain-rate", "-1"],
+                     ["--explain-rate", "1", "--explain-burst", "0"],
+                     ["--explain-burst", "5"]):
+            with contextlib.redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    self.make_throttle(argv)
+
+    def test_breaker_failures_are_contained(self):
+        breaker = CircuitBreaker(max_error_rate=0.5, min_calls=2,
+                                 cooldown=60)
+        limiter = RateLimiter(rate=0.001, burst=2)
+        client = MongoClient(replicaSet="pymongoexplain-unknown",
+                             serverSelectionTimeoutMS=100)
+        self.addCleanup(client.close)
+        settings = ExplainSettings(sink=MemorySink(), rate_limiter=limiter,
+                                   circuit_breaker=breaker)
+        new_find = make_func(lambda collection, *args: "found", "find",
+                             settings)
+        with self.assertLogs(level=logging.WARNING):
+            for _ in range(4):
+                self.assertEqual(new_find(client.db.products, {"x": 1}),
+                                 "found")
+        # The failures opened the circuit without reaching the script, and
+        # the open circuit refused the next explains before the limiter.
+        self.assertEqual(breaker.state, "open")
+        self.assertEqual(settings.failed, 2)
+        self.assertEqual(breaker.rejected, 2)
+        self.assertEqual(limiter.rejected, 0)
+
+    def test_explain_collection(self):
+        limiter, breaker = self.make_throttle([
+            "--explain-rate", "1", "--breaker-error-rate", "0.2"])
+        self.assertIsNone(breaker.max_latency)
+        client = MongoClient(connect=False)
+        self.addCleanup(client.close)
+        explain = ExplainSettings(
+            rate_limiter=limiter, circuit_breaker=breaker
+        ).explain_collection(client.db.products)
+        self.assertIs(explain.rate_limiter, limiter)
+        self.assertIs(explain.circuit_breaker, breaker)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,12 +15,19 @@
 import unittest
 import subprocess
 import os
+import tempfile
 
-from pymongo import MongoClient
+from pymongo import DeleteMany, MongoClient, ReadPreference, UpdateOne
 from pymongo import monitoring
-from bson import Timestamp
+from pymongo.errors import OperationFailure
+from bson import Timestamp, json_util
 from bson.son import SON
 
+from pymongoexplain import CircuitBreaker, ExplainCache, ExplainStats, \
+    ExplainThrottled
+from pymongoexplain.baseline import PlanBaseline
+from pymongoexplain.capture import CommandCapture
+from pymongoexplain.profiler import explain_profile
 from pymongoexplain.explainable_collection import ExplainCollection, Document
 
 
@@ -139,11 +146,24 @@ class TestExplainableCollection(unittest.TestCase):
         for _ in self.collection.find({}, limit=10):
             pass
         last_logger_payload = self.logger.cmd_payload
-        res = self.explain.find({}, limit=10)
+        res = self.explain.find({}, limit=10).explain()
         last_cmd_payload = self.explain.last_cmd_payload
         self._compare_command_dicts(last_cmd_payload, last_logger_payload)
 
 
+    def test_find_cursor(self):
+        for _ in self.collection.find({"x": {"$gt": 0}}).sort("x", -1).skip(
+                1).limit(5).hint([("_id", 1)]).max_time_ms(1000).batch_size(
+                2):
+            pass
+        last_logger_payload = self.logger.cmd_payload
+        cursor = self.explain.find({"x": {"$gt": 0}}).sort("x", -1).skip(
+            1).limit(5).hint([("_id", 1)]).max_time_ms(1000).batch_size(2)
+        self.assertIn("queryPlanner", cursor)
+        self.assertEqual(cursor.namespace, "db.products")
+        self._compare_command_dicts(self.explain.last_cmd_payload,
+                                    last_logger_payload)
+
 
     def test_find_one(self):
         self.collection.find_one(projection=['a', 'b.c'])
@@ -213,6 +233,294 @@ class TestExplainableCollection(unittest.TestCase):
         self.assertNotEqual(res.stdout, "")
         self.assertTrue(res.returncode == 0)
 
+    def test_cli_tool_sampling(self):
+        script_path = os.path.join(os.path.dirname(os.path.realpath(
+            __file__)), "test_cli_tool_script.py")
+        res = subprocess.run(["python3", "-m", "pymongoexplain",
+                              "--sample-rate", "2", "--sample-per-shape", "1",
+                              "--sample-seconds", "60", script_path],
+                             stderr=subprocess.PIPE)
+        self.assertEqual(res.returncode, 0)
+        self.assertIn(b"update_one explain response", res.stderr)
+
+    def test_cli_tool_jsonl_output(self):
+        script_path = os.path.join(os.path.dirname(os.path.realpath(
+            __file__)), "test_cli_tool_script.py")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "explain.jsonl")
+            res = subprocess.run(["python3", "-m", "pymongoexplain",
+                                  "--output-format", "jsonl",
+                                  "--output", output, script_path])
+            self.assertEqual(res.returncode, 0)
+            with open(output) as f:
+                records = [json_util.loads(line) for line in f]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["method"], "update_one")
+        self.assertEqual(records[0]["namespace"], "db.products")
+        self.assertIn("queryPlanner", records[0]["explain"])
+
+    def test_cli_tool_report(self):
+        script_path = os.path.join(os.path.dirname(os.path.realpath(
+            __file__)), "test_cli_tool_script.py")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report = os.path.join(tmpdir, "report.jsonl")
+            res = subprocess.run(["python3", "-m", "pymongoexplain",
+                                  "--output-format", "none",
+                                  "--verbosity", "executionStats",
+                                  "--report-output", report, script_path],
+                                 stderr=subprocess.PIPE)
+            self.assertEqual(res.returncode, 0)
+            self.assertNotIn(b"explain response", res.stderr)
+            with open(report) as f:
+                summaries = [json_util.loads(line) for line in f]
+        self.assertEqual(len(summaries), 1)
+        self.assertEqual(summaries[0]["namespace"], "db.products")
+        self.assertEqual(summaries[0]["command"], "update")
+        self.assertEqual(summaries[0]["count"], 1)
+        self.assertTrue(summaries[0]["plans"])
+        self.assertEqual(summaries[0]["latency"]["count"], 1)
+        self.assertGreater(summaries[0]["latency"]["maxMs"], 0)
+
+    def test_cli_tool_explain_client(self):
+        script_path = os.path.join(os.path.dirname(os.path.realpath(
+            __file__)), "test_cli_tool_script.py")
+        res = subprocess.run(["python3", "-m", "pymongoexplain",
+                              "--explain-uri", "mongodb://localhost:27017",
+                              "--explain-max-pool-size", "1",
+                              "--explain-timeout-ms", "10000",
+                              "--explain-read-preference", "primaryPreferred",
+                              script_path],
+                             stderr=subprocess.PIPE)
+        self.assertEqual(res.returncode, 0)
+        self.assertIn(b"update_one explain response", res.stderr)
+
+    def test_cli_tool_throttle(self):
+        script_path = os.path.join(os.path.dirname(os.path.realpath(
+            __file__)), "test_cli_tool_script.py")
+        res = subprocess.run(["python3", "-m", "pymongoexplain",
+                              "--explain-rate", "10",
+                              "--breaker-latency-ms", "5000",
+                              "--breaker-error-rate", "0.5", script_path],
+                             stderr=subprocess.PIPE)
+        self.assertEqual(res.returncode, 0)
+        self.assertIn(b"update_one explain response", res.stderr)
+
+    def test_cli_tool_replay(self):
+        entry = {"msg": "Slow query",
+                 "attr": {"type": "command", "ns": "db.products",
+                          "command": {"find": "products",
+                                      "filter": {"quantity": 1057},
+                                      "$db": "db"},
+                          "durationMillis": 150}}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = os.path.join(tmpdir, "mongod.log")
+            with open(log, "w") as f:
+                for _ in range(3):
+                    f.write(json_util.dumps(entry) + "\n")
+            output = os.path.join(tmpdir, "explain.jsonl")
+            res = subprocess.run(["python3", "-m", "pymongoexplain",
+                                  "replay", "--output-format", "jsonl",
+                                  "--output", output, log])
+            self.assertEqual(res.returncode, 0)
+            with open(output) as f:
+                records = [json_util.loads(line) for line in f]
+        # Commands with the same shape are explained once.
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["method"], "find")
+        self.assertEqual(records[0]["namespace"], "db.products")
+        self.assertIn("queryPlanner", records[0]["explain"])
+
+    def test_cli_tool_capture_commands(self):
+        script_path = os.path.join(os.path.dirname(os.path.realpath(
+            __file__)), "test_cli_tool_script.py")
+        res = subprocess.run(["python3", "-m", "pymongoexplain",
+                              "--capture", "commands", script_path],
+                             stderr=subprocess.PIPE)
+        self.assertEqual(res.returncode, 0)
+        self.assertIn(b"update explain response", res.stderr)
+
+    def test_cli_tool_explain_client_down(self):
+        script_path = os.path.join(os.path.dirname(os.path.realpath(
+            __file__)), "test_cli_tool_script.py")
+        res = subprocess.run(["python3", "-m", "pymongoexplain",
+                              "--explain-uri", "mongodb://localhost:1",
+                              "--explain-timeout-ms", "100", script_path],
+                             stderr=subprocess.PIPE)
+        self.assertEqual(res.returncode, 0)
+        self.assertIn(b"failed to explain", res.stderr)
+
+    def test_cli_tool_background_workers(self):
+        script_path = os.path.join(os.path.dirname(os.path.realpath(
+            __file__)), "test_cli_tool_script.py")
+        res = subprocess.run(["python3", "-m", "pymongoexplain",
+                              "--background-workers", "2",
+                              "--queue-size", "10",
+                              "--queue-full", "drop-oldest", script_path],
+                             stderr=subprocess.PIPE)
+        self.assertEqual(res.returncode, 0)
+        self.assertIn(b"update_one explain response", res.stderr)
+
+    def test_explain_many(self):
+        ops = [("find", ({"x": i},), {}) for i in range(20)]
+        ops.append(("update_one", ({"x": 1}, {"$set": {"y": 1}}), {}))
+        ops.append(("find", ({},), {"sort": {"x": 1}}))
+        ops.append(("insert_one", ({"x": 1},), {}))
+        res = self.explain.explain_many(ops, max_workers=4)
+        self.assertEqual(len(res), len(ops))
+        for r in res[:21]:
+            self.assertIn("queryPlanner", r)
+        self.assertIsInstance(res[21], TypeError)
+        self.assertIsInstance(res[22], ValueError)
+
+    def test_bulk_write(self):
+        requests = [UpdateOne({"x": i}, {"$set": {"y": 1}})
+                    for i in range(100)]
+        requests.append(DeleteMany({"y": 1}))
+        plans = self.explain.bulk_write(requests)
+        self.assertEqual([plan.operations for plan in plans], [100, 1])
+        self.assertEqual(plans[0].command.command_name, "update")
+        self.assertEqual(plans[1].command.command_name, "delete")
+        for plan in plans:
+            self.assertIn("queryPlanner", plan.result)
+
+    def test_capture_bulk_write(self):
+        captured = []
+        listener = CommandCapture(lambda *args: captured.append(args[2]))
+        client = MongoClient(serverSelectionTimeoutMS=1000,
+                             event_listeners=[listener])
+        self.addCleanup(client.close)
+        listener.bind(client)
+        client.db.products.bulk_write([
+            UpdateOne({"x": 1}, {"$set": {"y": 1}}),
+            UpdateOne({"z": {"$gt": 1}}, {"$set": {"y": 2}})])
+        self.assertEqual([len(command.command_document["updates"])
+                          for command in captured], [1, 1])
+        for command in captured:
+            self.assertIn("queryPlanner",
+                          self.explain._explain_command(command))
+
+    def test_max_time_ms(self):
+        self.collection.insert_many([{"x": i} for i in range(10)])
+        explain = ExplainCollection(self.collection,
+                                    verbosity="executionStats",
+                                    max_time_ms=1)
+        res = explain.find({"$where": "sleep(100) || true"}).explain()
+        self.assertTrue(res.timed_out)
+        self.assertEqual(self.logger.cmd_payload["maxTimeMS"], 1)
+        res = explain.with_options(max_time_ms=60000).find({}).explain()
+        self.assertFalse(res.timed_out)
+
+    def test_cache(self):
+        self.explain = ExplainCollection(self.collection,
+                                         cache=ExplainCache())
+        first = self.explain.find({"x": 1}).explain()
+        self.assertEqual(dict(self.logger.cmd_payload["explain"]["filter"]),
+                         {"x": 1})
+        second = self.explain.find({"x": 2}).explain()
+        self.assertIs(first, second)
+        self.assertEqual(dict(self.logger.cmd_payload["explain"]["filter"]),
+                         {"x": 1})
+        self.assertEqual(self.explain.last_cmd_payload["filter"], {"x": 2})
+        self.collection.create_index("x")
+        self.explain.cache.invalidate()
+        third = self.explain.find({"x": 3}).explain()
+        self.assertIsNot(first, third)
+        self.collection.drop_index("x_1")
+
+    def test_cache_view(self):
+        self.collection.database.drop_collection("products_view")
+        self.collection.database.command("create", "products_view",
+                                         viewOn="products", pipeline=[])
+        self.addCleanup(self.collection.database.drop_collection,
+                        "products_view")
+        explain = ExplainCollection(self.collection.database.products_view,
+                                    cache=ExplainCache())
+        first = explain.find({"x": 1}).explain()
+        second = explain.find({"x": 2}).explain()
+        self.assertIsNot(first, second)
+        self.assertEqual(len(explain.cache), 0)
+
+    def test_timing(self):
+        timings = []
+        stats = ExplainStats()
+        self.explain = ExplainCollection(self.collection, stats=stats,
+                                         timing_callback=timings.append)
+        self.explain.find({"x": 1}).explain()
+        self.explain.with_options(verbosity="executionStats").update_one(
+            {"x": 1}, {"$set": {"y": 1}})
+        self.assertEqual(len(timings), 2)
+        self.assertIs(self.explain.last_timing, timings[1])
+        for timing in timings:
+            self.assertGreater(timing.network, 0)
+            self.assertGreater(timing.request_bytes, 0)
+            self.assertGreater(timing.response_bytes, 0)
+            self.assertFalse(timing.cached)
+        self.assertEqual(stats.count, 2)
+        self.assertAlmostEqual(stats.total,
+                               sum(timing.total for timing in timings))
+
+    def test_routing(self):
+        self.explain = ExplainCollection(
+            self.collection, read_preference=ReadPreference.PRIMARY_PREFERRED,
+            write_read_preference=ReadPreference.PRIMARY_PREFERRED)
+        result = self.explain.find({"x": 1}).explain()
+        self.assertIsNotNone(result.server_address)
+        result = self.explain.update_one({"x": 1}, {"$set": {"y": 1}})
+        self.assertIsNotNone(result.server_address)
+
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker(max_latency=60, max_error_rate=0.4,
+                                 min_calls=1)
+        self.explain = ExplainCollection(self.collection,
+                                         circuit_breaker=breaker)
+        self.explain.find({"x": 1}).explain()
+        self.assertEqual(breaker.state, "closed")
+        with self.assertRaises(OperationFailure):
+            self.explain.find({"$invalid": 1}).explain()
+        self.assertEqual(breaker.state, "open")
+        with self.assertRaises(ExplainThrottled):
+            self.explain.find({"x": 1}).explain()
+
+    def test_analyze(self):
+        self.explain = ExplainCollection(self.collection, analyze=True)
+        self.explain.find({"not_indexed": 1}).explain()
+        self.assertIn("COLLSCAN",
+                      [finding.code for finding in self.explain.last_findings])
+
+    def test_plan_baseline(self):
+        operations = {"by_x": ("find", ({"x": 1},), {}),
+                      "update_x": ("update_one", ({"x": 1},
+                                                  {"$set": {"y": 1}}), {})}
+        baseline = PlanBaseline.record(self.explain, operations)
+        self.assertEqual(baseline.compare(self.explain), [])
+        self.collection.create_index("x")
+        try:
+            regressions = baseline.compare(self.explain)
+        finally:
+            self.collection.drop_index("x_1")
+        self.assertEqual(sorted(r.name for r in regressions),
+                         ["by_x", "update_x"])
+
+    def test_explain_profile(self):
+        db = self.client.pymongoexplain_profile
+        db.drop_collection("system.profile")
+        db.command("profile", 2)
+        try:
+            for i in range(3):
+                db.products.find_one({"x": i})
+            db.products.update_one({"x": 1}, {"$set": {"y": 1}})
+        finally:
+            db.command("profile", 0)
+        shapes = explain_profile(db)
+        self.client.drop_database(db)
+        counts = {shape.command.command_name: shape.count
+                  for shape in shapes}
+        self.assertEqual(counts, {"find": 3, "update": 1})
+        self.assertEqual(shapes, sorted(shapes,
+                                        key=lambda s: -s.total_millis))
+        for shape in shapes:
+            self.assertIn("executionStats", shape.result)
+
     def test_imports(self):
         from pymongoexplain import ExplainCollection
         from pymongoexplain import ExplainableCollection
@@ -232,10 +540,10 @@ class TestExplainableCollection(unittest.TestCase):
         self.assertIn("allPlansExecution", res["executionStats"])
 
     def test_comment(self):
-        self.explain.find({})
+        self.explain.find({}).explain()
         self.assertNotIn("comment", self.logger.cmd_payload)
         self.explain = ExplainCollection(self.collection, comment="comment")
-        self.explain.find({})
+        self.explain.find({}).explain()
         self.assertIn("comment", self.logger.cmd_payload)
 
 if __name__ == '__main__':
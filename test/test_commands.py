@@ -0,0 +1,258 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import unittest
+
+import bson
+from bson.raw_bson import RawBSONDocument
+from bson.son import SON
+from pymongo import MongoClient, ReadPreference
+from pymongo.monitoring import CommandFailedEvent, CommandStartedEvent, \
+    CommandSucceededEvent
+
+from pymongoexplain import ExplainableCollection
+from pymongoexplain.capture import CommandCapture, capture_collection, \
+    split_statements
+from pymongoexplain.commands import RawCommand
+
+
+def raw(document):
+    return RawBSONDocument(bson.encode(document))
+
+
+class TestRawBSONCommands(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = MongoClient(connect=False)
+        cls.explain = ExplainableCollection(
+            cls.client.pymongoexplain_test.test)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+
+    def build(self, method_name, *args, **kwargs):
+        command = self.explain._build_command(method_name, args, kwargs)
+        return command.get_SON()
+
+    def test_find(self):
+        filter = raw({"x": {"$in": list(range(1000))}})
+        sort = raw(SON([("a", 1), ("b", -1)]))
+        hint = raw({"x": 1})
+        cmd = self.build("find", filter, sort=sort, hint=hint)
+        self.assertIs(cmd["filter"], filter)
+        self.assertIs(cmd["sort"], sort)
+        self.assertIs(cmd["hint"], hint)
+        # The raw bytes are embedded in the encoded command.
+        self.assertIn(filter.raw, bson.encode(cmd))
+
+    def test_update_and_delete(self):
+        filter = raw({"x": 1})
+        replacement = raw({"y": "a" * 1000})
+        hint = raw({"x": 1})
+        cmd = self.build("replace_one", filter, replacement, hint=hint)
+        statement = cmd["updates"][0]
+        self.assertIs(statement["q"], filter)
+        self.assertIs(statement["u"], replacement)
+        self.assertIs(statement["hint"], hint)
+
+        cmd = self.build("delete_many", filter, hint=hint)
+        self.assertIs(cmd["deletes"][0]["q"], filter)
+        self.assertIs(cmd["deletes"][0]["hint"], hint)
+
+    def test_find_and_modify(self):
+        filter = raw({"x": 1})
+        sort = raw({"y": 1})
+        cmd = self.build("find_one_and_delete", filter, sort=sort)
+        self.assertIs(cmd["query"], filter)
+        self.assertIs(cmd["sort"], sort)
+
+    def test_pipelines(self):
+        stages = (raw({"$match": {"x": 1}}), raw({"$sort": {"y": 1}}))
+        cmd = self.build("aggregate", list(stages))
+        self.assertIs(cmd["pipeline"][0], stages[0])
+
+        cmd = self.build("watch", stages)
+        self.assertEqual(len(cmd["pipeline"]), 3)
+        self.assertIs(cmd["pipeline"][1], stages[0])
+
+    def test_dict_sort_still_rejected(self):
+        with self.assertRaises(TypeError):
+            self.build("find", {}, sort={"a": 1})
+
+
+class TestExplainOptions(unittest.TestCase):
+    def test_max_time_ms(self):
+        client = MongoClient(connect=False)
+        self.addCleanup(client.close)
+        explain = ExplainableCollection(client.db.products,
+                                        verbosity="executionStats")
+        command = explain._build_command("find", ({"x": 1},), {})
+        self.assertNotIn("maxTimeMS", explain._build_explain_command(command))
+        budget = explain.with_options(max_time_ms=500)
+        self.assertEqual(budget.verbosity, "executionStats")
+        self.assertEqual(
+            budget._build_explain_command(command)["maxTimeMS"], 500)
+        # The original is unchanged.
+        self.assertIsNone(explain.max_time_ms)
+        with self.assertRaises(TypeError):
+            ExplainableCollection(client.db.products, max_time_ms="500")
+
+    def test_read_preference(self):
+        client = MongoClient(connect=False)
+        self.addCleanup(client.close)
+        explain = ExplainableCollection(client.db.products)
+        self.assertIsNone(explain.read_preference)
+        explain = ExplainableCollection(
+            client.db.products, read_preference=ReadPreference.SECONDARY)
+        self.assertEqual(explain.with_options(max_time_ms=5).read_preference,
+                         ReadPreference.SECONDARY)
+
+    def test_routing(self):
+        client = MongoClient(connect=False)
+        self.addCleanup(client.close)
+        explain = ExplainableCollection(
+            client.db.products, read_preference=ReadPreference.SECONDARY,
+            write_read_preference=ReadPreference.PRIMARY_PREFERRED)
+        explain = explain.with_options(verbosity="executionStats")
+
+        def route(method_name, *args):
+            command = explain._build_command(method_name, args, {})
+            return explain._route(explain._build_explain_command(command))
+
+        for method_name, args in [
+                ("find", ({"x": 1},)), ("count_documents", ({},)),
+                ("distinct", ("x",)), ("aggregate", ([{"$match": {}}],))]:
+            self.assertEqual(route(method_name, *args),
+                             ReadPreference.SECONDARY, method_name)
+        for method_name, args in [
+                ("update_one", ({}, {"$set": {"x": 1}})),
+                ("delete_many", ({},)),
+                ("find_one_and_delete", ({},)),
+                ("aggregate", ([{"$match": {}}, {"$out": "other"}],)),
+                ("aggregate", ([{"$merge": {"into": "other"}}],))]:
+            self.assertEqual(route(method_name, *args),
+                             ReadPreference.PRIMARY_PREFERRED, method_name)
+
+
+class TestRawCommand(unittest.TestCase):
+    def test_driver_fields_are_removed(self):
+        document = SON([("find", "products"), ("filter", {"x": 1}),
+                        ("limit", 1), ("lsid", {"id": 1}),
+                        ("$db", "db"), ("$clusterTime", {}),
+                        ("readConcern", {"level": "local"})])
+        command = RawCommand("find", document)
+        self.assertEqual(command.get_SON(), SON([("find", "products"),
+                                                 ("filter", {"x": 1}),
+                                                 ("limit", 1)]))
+        self.assertIs(command.command_document["filter"], document["filter"])
+
+    def test_capture(self):
+        client = MongoClient(connect=False)
+        self.addCleanup(client.close)
+        captured = []
+        listener = CommandCapture(lambda *args: captured.append(args))
+
+        def start(document):
+            listener.started(CommandStartedEvent(
+                document, "db", 1, ("localhost", 27017), 1))
+
+        start(SON([("find", "products"), ("filter", {}), ("$db", "db")]))
+        self.assertEqual(captured, [])
+        listener.bind(client)
+        start(SON([("find", "products"), ("filter", {}), ("$db", "db")]))
+        start(SON([("insert", "products"), ("documents", [{}])]))
+        start(SON([("explain", SON([("find", "products")]))]))
+        start(SON([("aggregate", 1), ("pipeline", []), ("cursor", {})]))
+        self.assertEqual(len(captured), 2)
+        self.assertIs(captured[0][0], client)
+        self.assertEqual(captured[0][1], "db")
+        self.assertEqual(captured[0][2].get_SON(),
+                         SON([("find", "products"), ("filter", {})]))
+        self.assertEqual(
+            capture_collection(client.db, captured[1][2]).full_name,
+            "db.$cmd.aggregate")
+
+    def test_capture_bulk_write(self):
+        client = MongoClient(connect=False)
+        self.addCleanup(client.close)
+        captured = []
+        durations = []
+        listener = CommandCapture(lambda *args: captured.append(args[2]),
+                                  lambda *args: durations.append(args[2]))
+        listener.bind(client)
+        address = ("localhost", 27017)
+        # The command a two-statement bulk_write sends.
+        listener.started(CommandStartedEvent(SON([
+            ("update", "products"), ("ordered", True),
+            ("updates", [{"q": {"x": 1}, "u": {"$set": {"y": 1}}},
+                         {"q": {"z": {"$gt": 1}}, "u": {"$set": {"y": 2}}}]),
+            ("$db", "db")]), "db", 1, address, 1))
+        listener.succeeded(CommandSucceededEvent(
+            datetime.timedelta(microseconds=100), {"ok": 1}, "update", 1,
+            address, 1))
+        self.assertEqual([command.get_SON() for command in captured], [
+            SON([("update", "products"), ("ordered", True),
+                 ("updates", [{"q": {"x": 1}, "u": {"$set": {"y": 1}}}])]),
+            SON([("update", "products"), ("ordered", True),
+                 ("updates", [{"q": {"z": {"$gt": 1}},
+                               "u": {"$set": {"y": 2}}}])])])
+        self.assertEqual(durations, captured[:1])
+
+    def test_split_statements(self):
+        document = SON([("delete", "products"), ("deletes", [
+            {"q": {"x": 1}, "limit": 0}, {"q": {"x": 2}, "limit": 0},
+            {"q": {"y": 1}, "limit": 1}])])
+        commands = split_statements("delete", document)
+        # Statements with the same shape are explained once.
+        self.assertEqual([command.command_document["deletes"]
+                          for command in commands],
+                         [[{"q": {"x": 1}, "limit": 0}],
+                          [{"q": {"y": 1}, "limit": 1}]])
+        self.assertEqual(len(document["deletes"]), 3)
+        find = SON([("find", "products"), ("filter", {})])
+        self.assertEqual([command.get_SON() for command in
+                          split_statements("find", find)], [find])
+
+    def test_capture_durations(self):
+        client = MongoClient(connect=False)
+        self.addCleanup(client.close)
+        durations = []
+        listener = CommandCapture(
+            lambda *args: None,
+            lambda *args: durations.append(args))
+        listener.bind(client)
+        address = ("localhost", 27017)
+        listener.started(CommandStartedEvent(
+            SON([("find", "products"), ("filter", {}), ("$db", "db")]),
+            "db", 1, address, 1))
+        listener.started(CommandStartedEvent(
+            SON([("delete", "products"), ("deletes", []), ("$db", "db")]),
+            "db", 2, address, 1))
+        listener.succeeded(CommandSucceededEvent(
+            datetime.timedelta(microseconds=1500), {"ok": 1}, "find", 1, address, 1))
+        listener.failed(CommandFailedEvent(
+            datetime.timedelta(microseconds=250), {"ok": 0}, "delete", 2, address, 1))
+        # Commands that are not captured are ignored.
+        listener.succeeded(CommandSucceededEvent(
+            datetime.timedelta(microseconds=100), {"ok": 1}, "insert", 3, address, 1))
+        self.assertEqual([(args[1], args[2].command_name, args[3])
+                          for args in durations],
+                         [("db", "find", 0.0015), ("db", "delete", 0.00025)])
+        self.assertEqual(listener._pending, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
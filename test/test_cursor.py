@@ -0,0 +1,113 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from bson.son import SON
+from pymongo import MongoClient
+from pymongo.collation import Collation
+from pymongo.errors import InvalidOperation
+
+from pymongoexplain import AsyncExplainableCollection, ExplainableCollection
+from pymongoexplain.cursor import AsyncExplainCursor, ExplainCursor
+from pymongoexplain.result import ExplainResult
+
+RESPONSE = {"queryPlanner": {"namespace": "db.products",
+                             "winningPlan": {"stage": "COLLSCAN"}},
+            "ok": 1.0}
+
+
+class FakeExplainableCollection(ExplainableCollection):
+    """Records the commands instead of sending them."""
+
+    def __init__(self, collection):
+        super().__init__(collection)
+        self.commands = []
+
+    def _explain_command(self, command):
+        self.commands.append(command.get_SON())
+        return ExplainResult.from_document(RESPONSE)
+
+
+class FakeAsyncExplainableCollection(AsyncExplainableCollection):
+    def __init__(self, collection):
+        super().__init__(collection)
+        self.commands = []
+
+    async def _explain_command(self, command):
+        self.commands.append(command.get_SON())
+        return ExplainResult.from_document(RESPONSE)
+
+
+class TestExplainCursor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = MongoClient(connect=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+
+    def setUp(self):
+        self.explain = FakeExplainableCollection(
+            self.client.db.products)
+
+    def test_options_are_batched(self):
+        cursor = self.explain.find({"x": 1}).sort("a", -1).skip(5).limit(
+            10).hint([("a", 1)]).projection(["a"]).max_time_ms(
+            100).batch_size(2).collation(Collation("en_US"))
+        self.assertIsInstance(cursor, ExplainCursor)
+        self.assertEqual(self.explain.commands, [])
+        self.assertEqual(cursor["ok"], 1.0)
+        self.assertEqual(cursor.stages(), ["COLLSCAN"])
+        self.assertEqual(sorted(cursor), ["ok", "queryPlanner"])
+        self.assertEqual(cursor.explain(), RESPONSE)
+        self.assertEqual(self.explain.commands, [SON([
+            ("find", "products"), ("collation", {"locale": "en_US"}),
+            ("filter", {"x": 1}), ("sort", SON([("a", -1)])), ("skip", 5),
+            ("limit", 10), ("hint", SON([("a", 1)])),
+            ("projection", {"a": 1}), ("maxTimeMS", 100),
+            ("batchSize", 2)])])
+
+    def test_find_arguments(self):
+        cursor = self.explain.find({"x": 1}, limit=3).limit(4)
+        self.assertEqual(cursor.command().get_SON()["limit"], 4)
+
+    def test_options_after_explain(self):
+        cursor = self.explain.find({})
+        cursor.explain()
+        with self.assertRaises(InvalidOperation):
+            cursor.limit(1)
+
+    def test_build_command(self):
+        command = self.explain._build_command("find", ({"x": 1},),
+                                              {"sort": [("a", 1)]})
+        self.assertEqual(command.get_SON()["sort"], SON([("a", 1)]))
+
+
+class TestAsyncExplainCursor(unittest.IsolatedAsyncioTestCase):
+    async def test_await(self):
+        client = MongoClient(connect=False)
+        self.addCleanup(client.close)
+        explain = FakeAsyncExplainableCollection(client.db.products)
+        cursor = explain.find({"x": 1}).sort("a").limit(1)
+        self.assertIsInstance(cursor, AsyncExplainCursor)
+        self.assertEqual(await cursor, RESPONSE)
+        self.assertEqual(await cursor.explain(), RESPONSE)
+        self.assertEqual(len(explain.commands), 1)
+        self.assertEqual(explain.commands[0]["sort"], SON([("a", 1)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import unittest
+
+from pymongoexplain.histogram import LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.count, 0)
+        self.assertIsNone(histogram.percentile(50))
+        self.assertIsNone(histogram.mean)
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        values = [i / 1000.0 for i in range(1, 1001)]
+        random.Random(0).shuffle(values)
+        for value in values:
+            histogram.record(value)
+        self.assertEqual(histogram.count, 1000)
+        self.assertEqual(histogram.min, 0.001)
+        self.assertEqual(histogram.max, 1.0)
+        self.assertAlmostEqual(histogram.mean, 0.5005)
+        for percentile, expected in [(50, 0.5), (95, 0.95), (99, 0.99),
+                                     (100, 1.0)]:
+            value = histogram.percentile(percentile)
+            self.assertGreaterEqual(value, expected * 0.999)
+            self.assertLessEqual(value, expected * (1 + 1 / 64.0))
+
+    def test_relative_error(self):
+        histogram = LatencyHistogram(precision_bits=7)
+        for seconds in [0.000003, 0.000127, 0.0042, 1.5, 3600.0]:
+            single = LatencyHistogram(precision_bits=7)
+            single.record(seconds)
+            single.record(seconds * 10)
+            self.assertLessEqual(abs(single.percentile(50) - seconds),
+                                 seconds / 64.0 + 1e-6)
+            histogram.record(seconds)
+        self.assertEqual(histogram.percentile(100), 3600.0)
+
+    def test_bounded(self):
+        histogram = LatencyHistogram(precision_bits=7)
+        rng = random.Random(0)
+        for _ in range(100000):
+            histogram.record(rng.expovariate(100.0))
+        # Far fewer buckets than values.
+        self.assertLess(len(histogram._counts), 2000)
+
+    def test_copy(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.01)
+        other = histogram.copy()
+        histogram.record(0.02)
+        self.assertEqual(other.count, 1)
+        self.assertEqual(other.max, 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from bson.son import SON
+from pymongo import MongoClient
+
+from pymongoexplain.commands import DeleteCommand, RawCommand, UpdateCommand
+from pymongoexplain.profiler import group_profile, profile_command
+
+ENTRIES = [
+    {"op": "query", "ns": "db.products", "millis": 5,
+     "command": {"find": "products", "filter": {"x": 1}, "$db": "db",
+                 "lsid": {"id": 1}}},
+    {"op": "query", "ns": "db.products", "millis": 40,
+     "command": {"find": "products", "filter": {"x": 2}, "$db": "db"}},
+    {"op": "update", "ns": "db.products", "millis": 12,
+     "command": {"q": {"x": 1}, "u": {"$set": {"y": 1}}, "multi": False,
+                 "upsert": False, "hint": {"x": 1}}},
+    {"op": "remove", "ns": "db.products", "millis": 3,
+     "command": {"q": {"x": 1}, "limit": 1}},
+    {"op": "command", "ns": "db.products", "millis": 1,
+     "command": {"insert": "products", "documents": []}},
+    {"op": "query", "ns": "db.system.profile", "millis": 1,
+     "command": {"find": "system.profile", "filter": {}}},
+]
+
+
+class TestProfiler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = MongoClient(connect=False)
+        cls.db = cls.client.db
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+
+    def test_profile_command(self):
+        collection = self.db.products
+        find = profile_command(collection, ENTRIES[0])
+        self.assertIsInstance(find, RawCommand)
+        self.assertEqual(find.get_SON(), SON([("find", "products"),
+                                              ("filter", {"x": 1})]))
+        update = profile_command(collection, ENTRIES[2])
+        self.assertIsInstance(update, UpdateCommand)
+        self.assertEqual(update.command_document["updates"][0]["hint"],
+                         SON([("x", 1)]))
+        delete = profile_command(collection, ENTRIES[3])
+        self.assertIsInstance(delete, DeleteCommand)
+        self.assertEqual(delete.command_document["deletes"],
+                         [{"q": {"x": 1}, "limit": 1}])
+        self.assertIsNone(profile_command(collection, ENTRIES[4]))
+        self.assertIsNone(profile_command(
+            collection, {"op": "query", "command": {"$truncated": "..."}}))
+
+    def test_group_profile(self):
+        groups = group_profile(self.db, ENTRIES)
+        self.assertEqual(len(groups), 3)
+        by_name = {group[0].command_name: group[1:]
+                   for group in groups.values()}
+        # The slowest example of each shape is kept.
+        self.assertEqual(by_name["find"], [40, 2, 45])
+        self.assertEqual(by_name["update"], [12, 1, 12])
+        self.assertEqual(by_name["delete"], [3, 1, 3])
+        find = [group[0] for group in groups.values()
+                if group[0].command_name == "find"][0]
+        self.assertEqual(find.command_document["filter"], {"x": 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
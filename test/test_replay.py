@@ -0,0 +1,95 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from bson.son import SON
+
+from pymongoexplain.replay import iter_slow_queries, open_log, unique_shapes
+
+
+def log_line(msg, **attr):
+    return json.dumps({"t": {"$date": "2026-01-01T00:00:00.000+00:00"},
+                       "s": "I", "c": "COMMAND", "id": 51803, "ctx": "conn1",
+                       "msg": msg, "attr": attr}) + "\n"
+
+
+LINES = [
+    log_line("Slow query", type="command", ns="db.products",
+             command={"find": "products", "filter": {"x": 1},
+                      "lsid": {"id": {"$uuid": "00" * 16}}, "$db": "db",
+                      "shardVersion": {}},
+             durationMillis=120),
+    log_line("Slow query", type="command", ns="db.products",
+             command={"find": "products", "filter": {"x": 2}, "$db": "db"},
+             durationMillis=80),
+    log_line("Slow query", type="update", ns="db.products",
+             command={"q": {"x": 1}, "u": {"$set": {"y": 1}},
+                      "multi": False, "upsert": False},
+             durationMillis=200),
+    log_line("Slow query", type="remove", ns="db.products",
+             command={"q": {"x": 1}, "limit": 0}, durationMillis=150),
+    # The statements are logged in entries of their own.
+    log_line("Slow query", type="command", ns="db.products",
+             command={"update": "products", "ordered": True, "$db": "db"}),
+    log_line("Slow query", type="command", ns="db.products",
+             command={"getMore": 1, "collection": "products"}),
+    log_line("Slow query", type="command", ns="db.products",
+             command={"$truncated": "{ find: \"products\", filter: ..."}),
+    log_line("Connection ended", remote="127.0.0.1:5000"),
+    '{"msg": "Slow query", not json\n',
+]
+
+
+class TestReplay(unittest.TestCase):
+    def test_iter_slow_queries(self):
+        queries = list(iter_slow_queries(LINES))
+        self.assertEqual([q.command.command_name for q in queries],
+                         ["find", "find", "update", "delete"])
+        self.assertEqual([q.millis for q in queries], [120, 80, 200, 150])
+        self.assertEqual(queries[0].namespace, "db.products")
+        self.assertEqual(queries[0].command.get_SON(),
+                         SON([("find", "products"), ("filter", {"x": 1})]))
+        self.assertEqual(queries[2].command.get_SON(), SON([
+            ("update", "products"),
+            ("updates", [{"q": {"x": 1}, "u": {"$set": {"y": 1}},
+                          "multi": False, "upsert": False}])]))
+        self.assertEqual(queries[3].command.get_SON(), SON([
+            ("delete", "products"),
+            ("deletes", [{"q": {"x": 1}, "limit": 0}])]))
+
+    def test_unique_shapes(self):
+        queries = list(unique_shapes(iter_slow_queries(LINES)))
+        self.assertEqual([q.millis for q in queries], [120, 200, 150])
+
+    def test_open_log(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plain = os.path.join(tmpdir, "mongod.log")
+            with open(plain, "w") as f:
+                f.writelines(LINES)
+            # Rotated logs are often compressed without a .gz suffix.
+            compressed = os.path.join(tmpdir, "mongod.log.1")
+            with gzip.open(compressed, "wt") as f:
+                f.writelines(LINES)
+            for path in (plain, compressed):
+                with open_log(path) as lines:
+                    self.assertEqual(len(list(iter_slow_queries(lines))), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
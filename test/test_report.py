@@ -0,0 +1,140 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+from bson import json_util
+from bson.son import SON
+
+from pymongoexplain.report import RunReport, format_summary
+from pymongoexplain.shape import shape_hash
+
+
+def find_command(field, value=1):
+    return SON([("find", "products"), ("filter", {field: value})])
+
+
+IXSCAN_PLAN = {"queryPlanner": {"winningPlan": {
+    "stage": "FETCH", "inputStage": {
+        "stage": "IXSCAN", "indexName": "x_1",
+        "indexBounds": {"x": ["[1, 1]"]}}}},
+    "executionStats": {"nReturned": 2, "totalDocsExamined": 4}}
+COLLSCAN_PLAN = {"queryPlanner": {"winningPlan": {
+    "stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}},
+    "executionStats": {"nReturned": 0, "totalDocsExamined": 1000}}
+
+
+class TestRunReport(unittest.TestCase):
+    def test_add(self):
+        report = RunReport()
+        report.add("db.products", find_command("x", 1), IXSCAN_PLAN)
+        report.add("db.products", find_command("x", 2))
+        report.add("db.products", find_command("x", 3), COLLSCAN_PLAN)
+        report.add("db.products", find_command("y"), IXSCAN_PLAN)
+        report.add("db.orders", find_command("x"))
+        summaries = report.summaries()
+        self.assertEqual([(s.namespace, s.count) for s in summaries],
+                         [("db.products", 3), ("db.products", 1),
+                          ("db.orders", 1)])
+        summary = summaries[0]
+        self.assertEqual(summary.shape_hash, shape_hash(find_command("x")))
+        self.assertEqual(summary.command_name, "find")
+        self.assertEqual(summary.explained, 2)
+        self.assertEqual(summary.plans, (("FETCH", "IXSCAN"),
+                                         ("SORT", "COLLSCAN")))
+        self.assertEqual(summary.indexes, ("x_1",))
+        self.assertEqual(summary.worst_docs_ratio, 1000)
+        self.assertTrue(summary.collscan)
+        self.assertTrue(summary.blocking_sort)
+        self.assertFalse(summaries[1].collscan)
+        self.assertEqual(summaries[1].worst_docs_ratio, 2)
+        self.assertIsNone(summaries[2].worst_docs_ratio)
+        self.assertEqual(summaries[2].plans, ())
+
+    def test_bounded(self):
+        report = RunReport(max_shapes=2, max_plans=1)
+        for field in "abcd":
+            report.add("db.products", find_command(field), IXSCAN_PLAN)
+            report.add("db.products", find_command(field), COLLSCAN_PLAN)
+        summaries = report.summaries()
+        self.assertEqual(len(summaries), 2)
+        self.assertEqual(report.untracked, 4)
+        self.assertEqual(summaries[0].plans, (("FETCH", "IXSCAN"),))
+        self.assertTrue(summaries[0].collscan)
+
+    def test_record_latency(self):
+        report = RunReport()
+        for i in range(100):
+            report.add("db.products", find_command("x", i))
+            report.record_latency("db.products", find_command("x", i),
+                                  (i + 1) / 1000.0)
+        report.add("db.products", find_command("y"))
+        report.add("db.products", find_command("y"))
+        report.record_latency("db.products", find_command("y"), 1.0)
+        summaries = report.summaries()
+        # The shapes that took the most time come first.
+        self.assertEqual([s.count for s in summaries], [100, 2])
+        latency = summaries[0].latency
+        self.assertEqual(latency.count, 100)
+        self.assertAlmostEqual(latency.percentile(50), 0.05, places=3)
+        self.assertAlmostEqual(latency.percentile(99), 0.099, places=3)
+        self.assertEqual(latency.max, 0.1)
+        self.assertIn("latency p50 ", format_summary(summaries[0]))
+        self.assertEqual(summaries[1].latency.count, 1)
+
+    def test_record_latency_bounded(self):
+        report = RunReport(max_shapes=1)
+        report.record_latency("db.products", find_command("x"), 0.1)
+        report.record_latency("db.products", find_command("y"), 0.1)
+        summaries = report.summaries()
+        self.assertEqual(len(summaries), 1)
+        self.assertEqual(summaries[0].count, 0)
+
+    def test_timed_out(self):
+        report = RunReport()
+        report.add("db.products", find_command("x"),
+                   {"ok": 0, "code": 50, "codeName": "MaxTimeMSExpired"})
+        self.assertEqual(report.summaries()[0].timed_out, 1)
+
+    def test_format_summary(self):
+        report = RunReport()
+        report.add("db.products", find_command("x"), COLLSCAN_PLAN)
+        line = format_summary(report.summaries()[0])
+        self.assertIn("db.products find", line)
+        self.assertIn("1 calls, 1 explained", line)
+        self.assertIn("plans SORT > COLLSCAN", line)
+        self.assertIn("worst docsExamined/nReturned 1000.0", line)
+        self.assertIn("COLLSCAN, BLOCKING_SORT", line)
+
+    def test_save(self):
+        report = RunReport()
+        report.add("db.products", find_command("x"), IXSCAN_PLAN)
+        report.add("db.products", find_command("y"))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "report.jsonl")
+            report.save(path)
+            with open(path) as f:
+                documents = [json_util.loads(line) for line in f]
+        self.assertEqual(len(documents), 2)
+        self.assertEqual(documents[0]["plans"], [["FETCH", "IXSCAN"]])
+        self.assertEqual(documents[0]["indexes"], ["x_1"])
+        self.assertEqual(documents[0]["worstDocsRatio"], 2.0)
+        self.assertIsNone(documents[1]["worstDocsRatio"])
+        self.assertIsNone(documents[0]["latency"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import pickle
+import unittest
+
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+from pymongoexplain import ExplainDocument, ExplainResult
+
+CLASSIC = {
+    "queryPlanner": {
+        "namespace": "db.products",
+        "winningPlan": {
+            "stage": "FETCH",
+            "inputStage": {"stage": "IXSCAN", "indexName": "x_1"}},
+        "rejectedPlans": [{"stage": "COLLSCAN"}]},
+    "executionStats": {"nReturned": 1, "totalDocsExamined": 1},
+    "ok": 1.0}
+
+SBE = {
+    "queryPlanner": {
+        "namespace": "db.products",
+        "winningPlan": {
+            "queryPlan": {
+                "stage": "SORT",
+                "inputStage": {"stage": "COLLSCAN"}},
+            "slotBasedPlan": {"stages": "..."}},
+        "rejectedPlans": []},
+    "ok": 1.0}
+
+AGGREGATE = {
+    "stages": [
+        {"$cursor": {"queryPlanner": {
+            "namespace": "db.products",
+            "winningPlan": {"stage": "PROJECTION_SIMPLE",
+                            "inputStage": {"stage": "COLLSCAN"}}}}},
+        {"$unwind": {"path": "$tags"}}],
+    "ok": 1.0}
+
+SHARDED = {
+    "queryPlanner": {
+        "winningPlan": {
+            "stage": "SHARD_MERGE",
+            "shards": [
+                {"shardName": "a", "winningPlan": {"stage": "COLLSCAN"}},
+                {"shardName": "b", "winningPlan": {
+                    "queryPlan": {"stage": "IXSCAN"}}}]}},
+    "ok": 1.0}
+
+
+class TestExplainResult(unittest.TestCase):
+    def test_mapping_access(self):
+        result = ExplainResult.from_document(CLASSIC)
+        self.assertIn("queryPlanner", result)
+        self.assertEqual(result["queryPlanner"]["namespace"], "db.products")
+        self.assertEqual(result.get("missing", 1), 1)
+        self.assertEqual(result, CLASSIC)
+        self.assertEqual(result.to_dict(), CLASSIC)
+        with self.assertRaises(TypeError):
+            result["ok"] = 0
+
+    def test_nested_equality(self):
+        result = ExplainResult.from_document(CLASSIC)
+        query_planner = result["queryPlanner"]
+        self.assertIsInstance(query_planner, ExplainDocument)
+        self.assertEqual(query_planner, CLASSIC["queryPlanner"])
+        self.assertEqual(query_planner["winningPlan"]["inputStage"],
+                         {"stage": "IXSCAN", "indexName": "x_1"})
+        self.assertEqual(query_planner["rejectedPlans"],
+                         [{"stage": "COLLSCAN"}])
+        self.assertNotEqual(query_planner["rejectedPlans"][0],
+                            {"stage": "IXSCAN"})
+        self.assertEqual(result.winning_plan.to_dict(),
+                         CLASSIC["queryPlanner"]["winningPlan"])
+        # A plain RawBSONDocument codec is upgraded to ExplainDocument.
+        raw = ExplainResult(result.raw, CodecOptions(
+            document_class=RawBSONDocument))
+        self.assertEqual(raw["executionStats"], CLASSIC["executionStats"])
+
+    def test_to_dict_codec_options(self):
+        document = {"ts": datetime.datetime(2026, 1, 1)}
+        result = ExplainResult.from_document(
+            document, CodecOptions(tz_aware=True))
+        decoded = result.to_dict()
+        self.assertIs(type(decoded), dict)
+        self.assertIsNotNone(decoded["ts"].tzinfo)
+
+    def test_no_instance_dict(self):
+        result = ExplainResult.from_document(CLASSIC)
+        self.assertFalse(hasattr(result, "__dict__"))
+
+    def test_classic(self):
+        result = ExplainResult.from_document(CLASSIC)
+        self.assertEqual(result.namespace, "db.products")
+        self.assertEqual(result.winning_plan["stage"], "FETCH")
+        self.assertEqual(result.stages(), ["FETCH", "IXSCAN"])
+        self.assertEqual([p["stage"] for p in result.rejected_plans],
+                         ["COLLSCAN"])
+        self.assertEqual(result.execution_stats["nReturned"], 1)
+
+    def test_sbe(self):
+        result = ExplainResult.from_document(SBE)
+        self.assertEqual(result.stages(), ["SORT", "COLLSCAN"])
+        self.assertIsNone(result.execution_stats)
+
+    def test_aggregate(self):
+        result = ExplainResult.from_document(AGGREGATE)
+        self.assertEqual(result.namespace, "db.products")
+        self.assertEqual(result.stages(), ["PROJECTION_SIMPLE", "COLLSCAN"])
+
+    def test_sharded(self):
+        result = ExplainResult.from_document(SHARDED)
+        self.assertEqual(result.stages(),
+                         ["SHARD_MERGE", "COLLSCAN", "IXSCAN"])
+
+    def test_pickle(self):
+        result = ExplainResult.from_document(CLASSIC)
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+
+    def test_timed_out(self):
+        self.assertFalse(ExplainResult.from_document(CLASSIC).timed_out)
+        error = {"ok": 0.0, "errmsg": "operation exceeded time limit",
+                 "code": 50, "codeName": "MaxTimeMSExpired"}
+        self.assertTrue(ExplainResult.from_document(error).timed_out)
+        partial = {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}},
+                   "executionStats": {"executionSuccess": False,
+                                      "errorCode": 50, "nReturned": 3},
+                   "ok": 1.0}
+        self.assertTrue(ExplainResult.from_document(partial).timed_out)
+
+    def test_server_address(self):
+        self.assertIsNone(ExplainResult.from_document(CLASSIC).server_address)
+        result = ExplainResult.from_document(
+            {"queryPlanner": {}, "serverInfo": {
+                "host": "analytics-1", "port": 27018, "version": "8.0.0"}})
+        self.assertEqual(result.server_address, ("analytics-1", 27018))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+
+from bson.son import SON
+
+from pymongoexplain.sampling import Sampler
+
+
+def find_command(field, value=1):
+    return SON([("find", "products"), ("filter", {field: value})])
+
+
+class TestSampler(unittest.TestCase):
+    def test_default_explains_everything(self):
+        sampler = Sampler()
+        self.assertTrue(all(sampler.should_explain(find_command("x"))
+                            for _ in range(10)))
+
+    def test_rate(self):
+        sampler = Sampler(rate=3)
+        decisions = [sampler.should_explain(find_command("x"))
+                     for _ in range(9)]
+        self.assertEqual(decisions, [True, False, False] * 3)
+
+    def test_per_shape(self):
+        sampler = Sampler(per_shape=2)
+        decisions = [sampler.should_explain(find_command("x", i))
+                     for i in range(4)]
+        self.assertEqual(decisions, [True, True, False, False])
+        self.assertTrue(sampler.should_explain(find_command("y")))
+
+    def test_per_shape_key(self):
+        sampler = Sampler(per_shape=1)
+        self.assertTrue(sampler.should_explain(find_command("x"), "A"))
+        self.assertFalse(sampler.should_explain(find_command("y"), "A"))
+        self.assertTrue(sampler.should_explain(find_command("x"), "B"))
+
+    def test_seconds(self):
+        sampler = Sampler(seconds=0.05)
+        self.assertTrue(sampler.should_explain(find_command("x")))
+        time.sleep(0.1)
+        self.assertFalse(sampler.should_explain(find_command("x")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+
+from bson.objectid import ObjectId
+from bson.son import SON
+
+from pymongoexplain.shape import query_shape, shape_hash
+
+
+class TestQueryShape(unittest.TestCase):
+    def test_literals_are_replaced(self):
+        shape = query_shape(SON([("find", "products"),
+                                 ("filter", {"a": 1, "b": "x",
+                                             "c": ObjectId()}),
+                                 ("limit", 10), ("comment", "hi")]))
+        self.assertEqual(shape, {"find": "products",
+                                 "filter": {"a": "?number", "b": "?string",
+                                            "c": "?objectId"},
+                                 "limit": "?number"})
+
+    def test_same_shape_same_hash(self):
+        first = SON([("find", "products"), ("filter", {"a": 1}),
+                     ("sort", SON([("b", 1)]))])
+        second = SON([("find", "products"), ("filter", {"a": 2}),
+                      ("sort", SON([("b", 1)])), ("batchSize", 5)])
+        third = SON([("find", "products"), ("filter", {"a": 2}),
+                     ("sort", SON([("b", -1)]))])
+        self.assertEqual(shape_hash(first), shape_hash(second))
+        self.assertNotEqual(shape_hash(first), shape_hash(third))
+        self.assertNotEqual(shape_hash(first),
+                            shape_hash(SON([("find", "other"),
+                                            ("filter", {"a": 1})])))
+
+    def test_nested_operators(self):
+        shape = query_shape(SON([("find", "c"), ("filter", {
+            "$or": [{"a": {"$gt": 1}},
+                    {"$and": [{"b": "x"}, {"c": {"$ne": None}}]}],
+            "d": {"$elemMatch": {"e": 1, "f": {"$lt": 2}}},
+            "g": {"$elemMatch": {"$gte": 1}},
+            "h": {"$not": {"$in": [1, "a"]}}})]))
+        self.assertEqual(shape["filter"], {
+            "$or": [{"a": {"$gt": "?number"}},
+                    {"$and": [{"b": "?string"}, {"c": {"$ne": "?null"}}]}],
+            "d": {"$elemMatch": {"e": "?number", "f": {"$lt": "?number"}}},
+            "g": {"$elemMatch": {"$gte": "?number"}},
+            "h": {"$not": {"$in": "?array<?number,?string>"}}})
+
+    def test_large_in_list(self):
+        command = SON([("find", "c"),
+                       ("filter", {"a": {"$in": list(range(10000))}})])
+        start = time.perf_counter()
+        digest = shape_hash(command)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(digest, shape_hash(
+            SON([("find", "c"), ("filter", {"a": {"$in": [1]}})])))
+
+    def test_pipeline(self):
+        shape = query_shape(SON([("aggregate", "c"), ("pipeline", [
+            {"$match": {"a": 1}}, {"$sort": {"b": 1}}, {"$limit": 5},
+            {"$project": {"a": 1, "b": "$c"}}]), ("cursor", {})]))
+        self.assertEqual(shape["pipeline"], [
+            {"$match": {"a": "?number"}}, {"$sort": {"b": 1}},
+            {"$limit": "?number"},
+            {"$project": {"a": "?number", "b": "$c"}}])
+        self.assertNotIn("cursor", shape)
+
+    def test_write_statements(self):
+        shape = query_shape(SON([("update", "c"), ("updates", [
+            {"q": {"a": 1}, "u": {"$set": {"b": 2}}, "multi": True}])]))
+        self.assertEqual(shape["updates"], [
+            {"q": {"a": "?number"}, "u": {"$set": {"b": "?number"}},
+             "multi": True}])
+        shape = query_shape(SON([("delete", "c"), ("deletes", [
+            {"q": {"a": 1}, "limit": 1}])]))
+        self.assertEqual(shape["deletes"], [{"q": {"a": "?number"},
+                                             "limit": 1}])
+
+    def test_collation(self):
+        find = SON([("find", "c"), ("filter", {"a": "x"})])
+        french = SON([("find", "c"), ("filter", {"a": "y"}),
+                      ("collation", {"locale": "fr"})])
+        self.assertEqual(query_shape(french)["collation"], {"locale": "fr"})
+        self.assertNotEqual(shape_hash(find), shape_hash(french))
+        self.assertNotEqual(
+            shape_hash(french),
+            shape_hash(SON([("find", "c"), ("filter", {"a": "x"}),
+                            ("collation", {"locale": "de"})])))
+        pipeline = [{"$match": {"a": "x"}}]
+        self.assertNotEqual(
+            shape_hash(SON([("aggregate", "c"), ("pipeline", pipeline)])),
+            shape_hash(SON([("aggregate", "c"), ("pipeline", pipeline),
+                            ("collation", {"locale": "fr"})])))
+        update = SON([("update", "c"), ("updates", [
+            {"q": {"a": "x"}, "u": {"$set": {"b": 1}}}])])
+        french_update = SON([("update", "c"), ("updates", [
+            {"q": {"a": "x"}, "u": {"$set": {"b": 1}},
+             "collation": {"locale": "fr"}}])])
+        self.assertNotEqual(shape_hash(update), shape_hash(french_update))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import os
+import tempfile
+import unittest
+
+import bson
+from bson import json_util
+from bson.son import SON
+
+from pymongoexplain.sinks import BSONSink, JSONLSink, LoggingSink, \
+    MemorySink
+
+
+def make_record(i):
+    return {"ts": datetime.datetime(2026, 1, 1,
+                                    tzinfo=datetime.timezone.utc),
+            "namespace": "db.products", "method": "find",
+            "command": SON([("find", "products"), ("filter", {"x": i})]),
+            "explain": {"queryPlanner": {"winningPlan": {"stage": "EOF"}},
+                        "ok": 1.0}}
+
+
+class TestSinks(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "explain.out")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_memory_sink(self):
+        sink = MemorySink()
+        sink.write(make_record(1))
+        sink.close()
+        self.assertEqual(sink.records, [make_record(1)])
+
+    def test_logging_sink(self):
+        with self.assertLogs(level="INFO") as logs:
+            LoggingSink().write(make_record(1))
+        self.assertIn("find explain response", logs.output[0])
+
+    def test_jsonl_sink(self):
+        sink = JSONLSink(self.path, buffer_size=2)
+        for i in range(3):
+            sink.write(make_record(i))
+        with open(self.path) as f:
+            self.assertEqual(len(f.readlines()), 2)
+        sink.close()
+        with open(self.path) as f:
+            options = json_util.JSONOptions(tz_aware=True)
+            records = [json_util.loads(line, json_options=options)
+                       for line in f]
+        self.assertEqual([r["command"]["filter"]["x"] for r in records],
+                         [0, 1, 2])
+        self.assertEqual(records[0]["ts"], make_record(0)["ts"])
+
+    def test_bson_sink(self):
+        sink = BSONSink(self.path)
+        for i in range(3):
+            sink.write(make_record(i))
+        sink.close()
+        with open(self.path, "rb") as f:
+            records = list(bson.decode_file_iter(f))
+        self.assertEqual([r["command"]["filter"]["x"] for r in records],
+                         [0, 1, 2])
+
+    def test_rotation(self):
+        size = len(bson.encode(make_record(0)))
+        sink = BSONSink(self.path, buffer_size=1, max_bytes=size * 2,
+                        backup_count=2)
+        for i in range(7):
+            sink.write(make_record(i))
+        sink.close()
+        counts = []
+        for path in (self.path, self.path + ".1", self.path + ".2"):
+            with open(path, "rb") as f:
+                counts.append([r["command"]["filter"]["x"]
+                               for r in bson.decode_file_iter(f)])
+        self.assertEqual(counts, [[6], [4, 5], [2, 3]])
+        self.assertFalse(os.path.exists(self.path + ".3"))
+
+
+if __name__ == '__main__':
+    unittest.main()
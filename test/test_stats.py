@@ -0,0 +1,73 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+import bson
+from bson.raw_bson import RawBSONDocument
+from pymongo import MongoClient
+
+from pymongoexplain import ExplainableCollection, ExplainStats
+from pymongoexplain.stats import ExplainTiming
+
+
+class TestExplainStats(unittest.TestCase):
+    def test_add(self):
+        stats = ExplainStats()
+        stats.add(ExplainTiming(0.001, 0.002, 0.010, 0.001, 100, 1000,
+                                False))
+        stats.add(ExplainTiming(0.001, 0.0, 0.0, 0.0, 0, 0, True))
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.cached, 1)
+        self.assertAlmostEqual(stats.total, 0.015)
+        self.assertAlmostEqual(stats.max_total, 0.014)
+        snapshot = stats.as_dict()
+        self.assertEqual(snapshot["requestBytes"], 100)
+        self.assertEqual(snapshot["responseBytes"], 1000)
+        stats.reset()
+        self.assertEqual(stats.count, 0)
+        self.assertEqual(stats.total, 0.0)
+
+    def test_threads(self):
+        stats = ExplainStats()
+        timing = ExplainTiming(0.0, 0.0, 0.001, 0.0, 1, 1, False)
+
+        def add():
+            for _ in range(1000):
+                stats.add(timing)
+
+        threads = [threading.Thread(target=add) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(stats.count, 4000)
+        self.assertEqual(stats.request_bytes, 4000)
+
+    def test_encode_explain_command(self):
+        client = MongoClient(connect=False)
+        self.addCleanup(client.close)
+        explain = ExplainableCollection(client.db.products)
+        command = explain._build_command("find", ({"x": 1},), {"limit": 2})
+        explain_command = explain._build_explain_command(command)
+        encoded = explain._encode_explain_command(explain_command)
+        self.assertIsInstance(encoded["explain"], RawBSONDocument)
+        self.assertEqual(bson.decode(encoded["explain"].raw),
+                         explain_command["explain"])
+        self.assertEqual(list(encoded), list(explain_command))
+
+
+if __name__ == '__main__':
+    unittest.main()
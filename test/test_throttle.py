@@ -0,0 +1,150 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+
+from pymongo import AsyncMongoClient, MongoClient, ReadPreference
+
+from pymongoexplain import AsyncExplainableCollection, CircuitBreaker, \
+    ExplainableCollection, ExplainCache, ExplainThrottled, RateLimiter
+from pymongoexplain.throttle import CLOSED, HALF_OPEN, OPEN
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_burst(self):
+        limiter = RateLimiter(rate=1, burst=3)
+        self.assertEqual([limiter.try_acquire() for _ in range(5)],
+                         [True, True, True, False, False])
+        self.assertEqual(limiter.rejected, 2)
+
+    def test_refill(self):
+        limiter = RateLimiter(rate=50)
+        while limiter.try_acquire():
+            pass
+        time.sleep(0.1)
+        self.assertTrue(limiter.try_acquire())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=0)
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=1, burst=0)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_errors(self):
+        breaker = CircuitBreaker(max_error_rate=0.5, window=4, min_calls=4,
+                                 cooldown=60)
+        for failed in (True, False, True):
+            self.assertTrue(breaker.allow())
+            breaker.record(0.001, failed)
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record(0.001, True)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.rejected, 1)
+        self.assertEqual(breaker.opened, 1)
+
+    def test_latency(self):
+        breaker = CircuitBreaker(max_latency=0.1, window=3, min_calls=3)
+        for latency in (0.05, 0.1, 0.1):
+            breaker.record(latency, False)
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record(0.2, False)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_cooldown(self):
+        breaker = CircuitBreaker(max_error_rate=0, min_calls=1,
+                                 cooldown=0.05)
+        breaker.record(0.001, True)
+        self.assertFalse(breaker.allow())
+        time.sleep(0.1)
+        # A single trial explain is let through.
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow())
+        breaker.record(0.001, True)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertEqual(breaker.opened, 2)
+        time.sleep(0.1)
+        self.assertTrue(breaker.allow())
+        breaker.record(0.001, False)
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertTrue(breaker.allow())
+
+
+class TestThrottledExplains(unittest.TestCase):
+    def setUp(self):
+        self.client = MongoClient(connect=False)
+        self.addCleanup(self.client.close)
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(rate=0.001, burst=1)
+        self.assertTrue(limiter.try_acquire())
+        explain = ExplainableCollection(self.client.db.products,
+                                        rate_limiter=limiter)
+        # The limiter is kept by with_options.
+        explain = explain.with_options(verbosity="executionStats")
+        with self.assertRaises(ExplainThrottled):
+            explain.update_one({"x": 1}, {"$set": {"y": 1}})
+        results = explain.explain_many([("find", ({},), {})])
+        self.assertIsInstance(results[0], ExplainThrottled)
+        self.assertEqual(limiter.rejected, 2)
+
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker(max_error_rate=0, min_calls=1)
+        breaker.record(0.001, True)
+        explain = ExplainableCollection(self.client.db.products,
+                                        circuit_breaker=breaker)
+        with self.assertRaises(ExplainThrottled):
+            explain.find({"x": 1}).explain()
+        self.assertEqual(breaker.rejected, 1)
+
+    def test_throttled_index_check(self):
+        limiter = RateLimiter(rate=0.001, burst=1)
+        self.assertTrue(limiter.try_acquire())
+        cache = ExplainCache(index_check_interval=0)
+        explain = ExplainableCollection(
+            self.client.db.products, cache=cache, rate_limiter=limiter,
+            read_preference=ReadPreference.SECONDARY)
+        command = explain._build_explain_command(
+            explain._build_command("find", ({"x": 1},), {}))
+        cache.put(explain._cache_key(command, ReadPreference.SECONDARY),
+                  "cached")
+        # The due listIndexes is throttled instead of sent to the primary,
+        # and the entry of the routed read preference is served.
+        self.assertEqual(explain.find({"x": 2}).explain(), "cached")
+        self.assertEqual(limiter.rejected, 1)
+
+
+class TestAsyncThrottledExplains(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncMongoClient(connect=False)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_circuit_breaker(self):
+        breaker = CircuitBreaker(max_error_rate=0, min_calls=1)
+        breaker.record(0.001, True)
+        explain = AsyncExplainableCollection(self.client.db.products,
+                                             circuit_breaker=breaker)
+        with self.assertRaises(ExplainThrottled):
+            await explain.delete_one({"x": 1})
+        self.assertEqual(breaker.rejected, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
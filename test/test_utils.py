@@ -0,0 +1,95 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from pymongo import MongoClient
+
+from pymongoexplain import ExplainableCollection
+from pymongoexplain.commands import (DeleteCommand, FindCommand,
+                                     UpdateCommand)
+from pymongoexplain.utils import camelcase_key, convert_to_camelcase
+
+
+class TestConvertToCamelcase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = MongoClient(connect=False)
+        cls.collection = cls.client.pymongoexplain_test.test
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+
+    def test_keys(self):
+        self.assertEqual(camelcase_key("max_time_ms"), "maxTimeMS")
+        self.assertEqual(camelcase_key("max_await_time_ms"), "maxAwaitTimeMS")
+        self.assertEqual(camelcase_key("array_filters"), "arrayFilters")
+        self.assertEqual(camelcase_key("some_new_option"), "someNewOption")
+        self.assertEqual(camelcase_key("filter"), "filter")
+        self.assertEqual(camelcase_key("_id"), "_id")
+
+    def test_no_key_is_dropped(self):
+        converted = convert_to_camelcase({"allow_disk_use": True,
+                                          "hint": "a_1", "skip": None})
+        self.assertEqual(converted, {"allowDiskUse": True, "hint": "a_1"})
+
+    def test_driver_only_keys_are_dropped(self):
+        converted = convert_to_camelcase({"session": object(),
+                                          "cursor_type": 0, "limit": 1})
+        self.assertEqual(converted, {"limit": 1})
+
+    def test_max_await_time_ms_is_dropped(self):
+        find = FindCommand(self.collection,
+                           dict(filter={}, max_await_time_ms=100))
+        self.assertNotIn("maxAwaitTimeMS", find.command_document)
+        explain = ExplainableCollection(self.collection)
+        watch = explain._build_command("watch", (),
+                                       {"max_await_time_ms": 100})
+        self.assertNotIn("maxAwaitTimeMS", watch.get_SON())
+
+    def test_recurse_into(self):
+        document = {"updates": [{"q": {"a_b": 1}, "u": {"$set": {"c_d": 1}},
+                                 "array_filters": [{"e_f": 1}],
+                                 "hint": None}]}
+        self.assertEqual(
+            convert_to_camelcase(document, recurse_into=("updates",)),
+            {"updates": [{"q": {"a_b": 1}, "u": {"$set": {"c_d": 1}},
+                          "arrayFilters": [{"e_f": 1}]}]})
+        # Only the named keys are converted.
+        self.assertIs(convert_to_camelcase(document)["updates"],
+                      document["updates"])
+
+    def test_commands(self):
+        find = FindCommand(self.collection,
+                           dict(filter={"a_b": 1}, max_time_ms=10,
+                                no_cursor_timeout=True))
+        self.assertEqual(find.command_document["filter"], {"a_b": 1})
+        self.assertEqual(find.command_document["maxTimeMS"], 10)
+        self.assertTrue(find.command_document["noCursorTimeout"])
+
+        update = UpdateCommand(self.collection, {"a": 1},
+                               {"$set": {"x.$[e]": 1}},
+                               array_filters=[{"e": 1}])
+        statement = update.command_document["updates"][0]
+        self.assertEqual(statement["arrayFilters"], [{"e": 1}])
+        self.assertNotIn("array_filters", statement)
+
+        delete = DeleteCommand(self.collection, {"a": 1}, 0, None,
+                               {"hint": "a_1"})
+        self.assertEqual(delete.command_document["deletes"][0]["hint"], "a_1")
+
+
+if __name__ == '__main__':
+    unittest.main()
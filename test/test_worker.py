@@ -0,0 +1,64 @@
+# Copyright 2026-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+from pymongoexplain.worker import ExplainWorker
+
+
+class TestExplainWorker(unittest.TestCase):
+    def test_runs_all_tasks(self):
+        done = []
+        worker = ExplainWorker(num_threads=4, queue_size=10)
+        for i in range(100):
+            worker.submit(done.append, i)
+        worker.close()
+        self.assertEqual(sorted(done), list(range(100)))
+
+    def test_drop_oldest(self):
+        started = threading.Event()
+        release = threading.Event()
+        done = []
+
+        def block():
+            started.set()
+            release.wait()
+
+        worker = ExplainWorker(num_threads=1, queue_size=2,
+                               policy="drop-oldest")
+        worker.submit(block)
+        started.wait()
+        for i in range(5):
+            worker.submit(done.append, i)
+        release.set()
+        worker.close()
+        self.assertEqual(worker.dropped, 3)
+        self.assertEqual(done, [3, 4])
+
+    def test_task_errors_are_logged(self):
+        done = []
+        worker = ExplainWorker()
+        with self.assertLogs(level="ERROR"):
+            worker.submit(lambda: 1 / 0)
+            worker.submit(done.append, 1)
+            worker.close()
+        self.assertEqual(done, [1])
+
+    def test_invalid_policy(self):
+        self.assertRaises(ValueError, ExplainWorker, policy="drop")
+
+
+if __name__ == '__main__':
+    unittest.main()